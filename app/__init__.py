@@ -1,9 +1,11 @@
+import hmac
 import logging
 import os
 import sys
+import threading
 from logging.handlers import RotatingFileHandler
 
-from flask import Flask
+from flask import Flask, Response, abort, g, request
 from flask.logging import create_logger
 
 from config import (
@@ -16,12 +18,20 @@ from config import (
 from .auth import bp as login_bp
 from .auth.func import has_permission
 from .core.db.database import db
-from .core.extensions import login_manager
+from .core.extensions import (
+    apeks_api_client,
+    apeks_api_metrics,
+    apeks_circuit_breaker,
+    login_manager,
+)
+from .core.repository.apeks_circuit_breaker import CircuitState
+from .core.services.apeks_mirror_sync_service import start_mirror_sync
 from .core.services.db_users_services import (
     get_users_permissions_service,
     get_users_roles_service,
     get_users_service,
 )
+from .core.services.schedule_ical_feed_service import start_ical_feed_refresh
 from .library import bp as library_bp
 from .main import bp as main_bp
 from .plans import bp as plans_bp
@@ -63,9 +73,35 @@ def check_tokens() -> bool:
         )
 
 
+# id процесса, в котором запущены фоновые задачи
+_background_tasks_pid: int | None = None
+_background_tasks_lock = threading.Lock()
+
+
+def start_background_tasks():
+    """
+    Запускает фоновые задачи (синхронизация зеркала АпексВУЗ, обновление
+    календарей подписки) при первом запросе в рабочем процессе сервера.
+    Задачи не запускаются при выполнении команд (flask db upgrade, скрипты
+    tools) и в главном процессе gunicorn --preload (потоки не переносятся
+    в рабочие процессы при fork).
+    """
+    global _background_tasks_pid
+    with _background_tasks_lock:
+        if _background_tasks_pid == os.getpid():
+            return
+        _background_tasks_pid = os.getpid()
+    if ApeksConfig.MIRROR_ENABLED:
+        start_mirror_sync()
+    start_ical_feed_refresh()
+
+
 def register_extensions(app):
     """Регистрирует расширения."""
     login_manager.init_app(app)
+    apeks_api_client.init_app(app)
+    if not app.testing:
+        app.before_request(start_background_tasks)
     create_logger(app)
 
 
@@ -83,9 +119,61 @@ def register_blueprints(app):
     app.register_blueprint(phonebook_bp)
 
 
+def apeks_metrics():
+    """
+    Метрики запросов к API АпексВУЗ в текстовом формате Prometheus.
+    Доступны с токеном METRICS_TOKEN, без токена - только при METRICS_PUBLIC.
+    """
+    token = FlaskConfig.METRICS_TOKEN
+    if not token:
+        if not FlaskConfig.METRICS_PUBLIC:
+            abort(404)
+    elif not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        abort(401)
+    load = apeks_api_client.get_load()
+    gauges = {
+        "apeks_api_in_flight": (
+            "Количество выполняемых запросов",
+            {(): load["in_flight"]},
+        ),
+        "apeks_api_queued": (
+            "Количество запросов, ожидающих выполнения",
+            {(): load["queued"]},
+        ),
+        "apeks_api_rate": (
+            "Допустимая частота запросов к точке доступа (запросов в секунду)",
+            {
+                (("endpoint", endpoint),): rate
+                for endpoint, rate in load["rates"].items()
+            },
+        ),
+        "apeks_api_circuit_state": (
+            "Состояние автоматического выключателя запросов",
+            {
+                (("state", state.value),): int(apeks_circuit_breaker.state == state)
+                for state in CircuitState
+            },
+        ),
+    }
+    return Response(
+        apeks_api_metrics.render(gauges),
+        mimetype="text/plain; version=0.0.4",
+    )
+
+
+def register_metrics(app):
+    """Регистрирует точку доступа к метрикам (/metrics)."""
+    app.add_url_rule("/metrics", "metrics", apeks_metrics)
+
+
 def add_functions_to_templates():
     """Добавляет в шаблоны Jinja2 доступ к функциям."""
-    return dict(has_permission=has_permission)
+    return dict(
+        has_permission=has_permission,
+        apeks_data_as_of=g.get("apeks_data_as_of"),
+    )
 
 
 def check_base_roles_and_permissions_in_database():
@@ -156,6 +244,7 @@ def create_app(config_class=FlaskConfig):
     app.context_processor(add_functions_to_templates)
     check_tokens()
     register_extensions(app)
+    register_metrics(app)
 
     with app.app_context():
         register_blueprints(app)
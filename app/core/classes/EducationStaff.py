@@ -5,6 +5,7 @@ from datetime import date
 from typing import Iterable
 
 from config import ApeksConfig as Apeks
+from .StaffHistoryIndex import StaffHistoryIndex
 
 
 @dataclass
@@ -42,6 +43,8 @@ class EducationStaff:
         staff_history() -> dict
             данные в каком подразделении и когда работал сотрудник.
             если работает в настоящий момент 'end_date' = None.
+        staff_history_index() -> StaffHistoryIndex
+            индекс периодов работы сотрудников в подразделениях.
     """
     # TODO добавить year_start/end, сделать чтобы месяц +/- 6 корректно работали
 
@@ -171,3 +174,10 @@ class EducationStaff:
             "подразделении и когда работал сотрудник"
         )
         return data
+
+    def staff_history_index(self) -> StaffHistoryIndex:
+        """
+        Возвращает индекс периодов работы сотрудников в подразделениях
+        для поиска подразделения сотрудника на дату.
+        """
+        return StaffHistoryIndex(self.staff_history())
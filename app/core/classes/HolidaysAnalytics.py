@@ -0,0 +1,178 @@
+from calendar import monthrange
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+from .ProductionCalendar import ProductionCalendar
+from .StaffHistoryIndex import StaffHistoryIndex
+
+# Месяц начала учебного года
+ACADEMIC_YEAR_START_MONTH = 9
+# Столбцы счетчиков: всего занятий, занятий в выходные, занятых выходных
+TOTAL_LESSONS, HOLIDAYS_LESSONS, BUSY_HOLIDAYS = range(3)
+# id для занятий преподавателей, не работавших на кафедрах
+NO_DEPARTMENT_ID = 0
+# Максимальное количество учебных лет в отчете
+MAX_ACADEMIC_YEARS = 5
+
+
+def academic_year(check_date: date) -> int:
+    """Возвращает учебный год даты (год начала учебного года)."""
+    if check_date.month >= ACADEMIC_YEAR_START_MONTH:
+        return check_date.year
+    return check_date.year - 1
+
+
+def academic_years_months(year_start: int, year_end: int) -> list[tuple[date, date]]:
+    """
+    Возвращает месяцы учебных лет.
+
+    Parameters
+    ----------
+        year_start: int
+            первый учебный год (год начала, число 20xx)
+        year_end: int
+            последний учебный год (год начала, число 20xx)
+
+    Returns
+    -------
+        list[tuple[date, date]]
+            [(первый день месяца, последний день месяца)]
+    """
+    months = []
+    for year in range(year_start, year_end + 1):
+        for index in range(12):
+            month_year = year + (ACADEMIC_YEAR_START_MONTH - 1 + index) // 12
+            month = (ACADEMIC_YEAR_START_MONTH - 1 + index) % 12 + 1
+            months.append(
+                (
+                    date(month_year, month, 1),
+                    date(month_year, month, monthrange(month_year, month)[1]),
+                )
+            )
+    return months
+
+
+@dataclass
+class HolidaysAnalytics:
+    """
+    Занятость преподавателей кафедр в выходные дни за несколько учебных лет.
+
+    Занятия учитываются по частям (например, по месяцам), для каждой пары
+    'кафедра x преподаватель' хранится только массив счетчиков
+    [учебный год, (всего занятий, занятий в выходные, занятых выходных)].
+    Кафедра определяется на дату занятия (если преподаватель работал
+    на нескольких кафедрах - занятие учитывается на каждой).
+
+    Attributes:
+    ----------
+        years: Sequence[int]
+            учебные годы (год начала, число 20xx)
+        production_calendar: ProductionCalendar
+            производственный календарь
+        staff_history_index: StaffHistoryIndex
+            индекс периодов работы сотрудников на кафедрах
+        department_ids: Iterable[int] | None
+            id кафедр, по которым учитываются занятия (None - все занятия,
+            занятия вне кафедр учитываются с id NO_DEPARTMENT_ID)
+
+    Methods:
+    -------
+        add_lessons (staff_lesson_dates: dict) -> None
+            учитывает занятия преподавателей за часть периода
+        department_totals () -> dict
+            возвращает суммарные счетчики кафедр
+    """
+
+    years: Sequence[int]
+    production_calendar: ProductionCalendar
+    staff_history_index: StaffHistoryIndex
+    department_ids: Iterable[int] | None = None
+
+    def __post_init__(self) -> None:
+        self.years = tuple(self.years)
+        self._year_index = {year: index for index, year in enumerate(self.years)}
+        if self.department_ids is not None:
+            self.department_ids = frozenset(self.department_ids)
+        # {(department_id, staff_id): np.ndarray[years, 3]}
+        self.counters = {}
+        # Выходные дни, в которые проводились занятия (по учебным годам)
+        self.busy_holidays = [set() for _ in self.years]
+
+    def _departments(self, staff_id: int, lesson_date: date) -> list[int]:
+        """Кафедры, на которых учитывается занятие преподавателя."""
+        departments = self.staff_history_index.departments(staff_id, lesson_date)
+        if self.department_ids is None:
+            return departments or [NO_DEPARTMENT_ID]
+        return [
+            department_id
+            for department_id in departments
+            if department_id in self.department_ids
+        ]
+
+    def add_lessons(self, staff_lesson_dates: dict) -> None:
+        """
+        Учитывает занятия преподавателей за часть периода. Периоды разных
+        вызовов не должны пересекаться (занятые выходные дни суммируются).
+
+        Parameters
+        ----------
+            staff_lesson_dates: dict
+                {staff_id: [дата каждого занятия]}
+        """
+        for staff_id, lesson_dates in staff_lesson_dates.items():
+            holidays = self.production_calendar.holidays_mask(lesson_dates).tolist()
+            # {(department_id, year_index): [всего, в выходные, {выходные дни}]}
+            staff_counters = {}
+            departments = {}
+            for lesson_date, holiday in zip(lesson_dates, holidays):
+                year_index = self._year_index.get(academic_year(lesson_date))
+                if year_index is None:
+                    continue
+                if lesson_date not in departments:
+                    departments[lesson_date] = self._departments(staff_id, lesson_date)
+                for department_id in departments[lesson_date]:
+                    counter = staff_counters.setdefault(
+                        (department_id, year_index), [0, 0, set()]
+                    )
+                    counter[TOTAL_LESSONS] += 1
+                    if holiday:
+                        counter[HOLIDAYS_LESSONS] += 1
+                        counter[BUSY_HOLIDAYS].add(lesson_date)
+            for (department_id, year_index), counter in staff_counters.items():
+                counters = self.counters.get((department_id, staff_id))
+                if counters is None:
+                    counters = np.zeros((len(self.years), 3), dtype=np.int32)
+                    self.counters[(department_id, staff_id)] = counters
+                counters[year_index] += (
+                    counter[TOTAL_LESSONS],
+                    counter[HOLIDAYS_LESSONS],
+                    len(counter[BUSY_HOLIDAYS]),
+                )
+                self.busy_holidays[year_index].update(counter[BUSY_HOLIDAYS])
+
+    def department_totals(self) -> dict:
+        """
+        Возвращает суммарные счетчики кафедр.
+
+        Returns
+        -------
+            dict
+                {department_id: (np.ndarray[years, 3] - сумма счетчиков
+                преподавателей, np.ndarray[years] - количество преподавателей,
+                занятых в выходные)}
+        """
+        totals = {}
+        for (department_id, _), counters in self.counters.items():
+            total, busy_staff = totals.setdefault(
+                department_id,
+                (
+                    np.zeros((len(self.years), 3), dtype=np.int64),
+                    np.zeros(len(self.years), dtype=np.int64),
+                ),
+            )
+            total += counters
+            busy_staff += counters[:, BUSY_HOLIDAYS] > 0
+        return totals
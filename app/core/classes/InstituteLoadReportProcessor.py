@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+
+from config import ApeksConfig as Apeks
+from .LessonsData import LessonsData
+from .NumpyLoadEngine import NumpyLoadEngine
+
+
+@dataclass
+class InstituteLoadReportProcessor(LessonsData):
+    """
+    Класс для формирования отчета об учебной нагрузке всех кафедр
+    (занятия обрабатываются один раз для всех кафедр).
+
+    Attributes:
+    ----------
+        year: int | str
+            учебный год (число 20xx).
+        month_start: int | str
+            начальный месяц (число 1-12).
+        month_end: int | str
+            конечный месяц (число 1-12).
+        departments: dict
+            список кафедр, словарь в формате {id: {'full':
+            'название кафедры', 'short': 'сокращенное название'}}
+        departments_staff: dict
+            преподаватели, работавшие на кафедрах в указанный период
+            {department_id: {staff_id: 'short_name'}}
+
+    Methods:
+    -------
+        process_load_data() -> None:
+            рассчитывает нагрузку по преподавателям всех кафедр
+        department_total(department_id: int) -> dict:
+            возвращает суммарную нагрузку кафедры
+    """
+
+    year: int | str
+    month_start: int | str
+    month_end: int | str
+    departments: dict
+    departments_staff: dict
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.load_data = {}
+        self.unprocessed = []
+        self.process_load_data()
+        self.file_period = (
+            Apeks.MONTH_DICT[int(self.month_start)]
+            if self.month_start == self.month_end
+            else f"{Apeks.MONTH_DICT[int(self.month_start)]}-"
+            f"{Apeks.MONTH_DICT[int(self.month_end)]}"
+        )
+
+    def process_load_data(self) -> None:
+        """
+        Рассчитывает нагрузку по преподавателям всех кафедр
+        (способ расчета задается настройкой 'ApeksConfig.LOAD_ENGINE').
+        """
+        if Apeks.LOAD_ENGINE == "numpy":
+            self.load_data = NumpyLoadEngine(self).departments_load(
+                self.departments_staff
+            )
+        else:
+            self.load_data = self.departments_load(self.departments_staff)
+        self.unprocessed = self.unprocessed_lessons()
+
+    def department_total(self, department_id: int) -> dict:
+        """
+        Возвращает суммарную нагрузку преподавателей кафедры.
+
+        Parameters
+        ----------
+            department_id: int
+                id кафедры
+
+        Returns
+        -------
+            dict
+                {l_type: {s_type: value}}
+        """
+        total = {
+            l_type: dict.fromkeys(Apeks.LOAD_STUDENT_TYPES, 0)
+            for l_type in Apeks.LOAD_LESSON_TYPES + Apeks.LOAD_CONTROL_TYPES
+        }
+        for staff_load in self.load_data[department_id].values():
+            for l_type, values in staff_load.items():
+                for s_type, value in values.items():
+                    total[l_type][s_type] += value
+        return total
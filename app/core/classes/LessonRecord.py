@@ -0,0 +1,172 @@
+from datetime import date
+from operator import attrgetter
+
+
+def to_int_id(value) -> int | None:
+    """Преобразует id из ответа API Апекс-ВУЗ в число (None - если пусто)."""
+    return int(value) if value else None
+
+
+class LessonRecord:
+    """
+    Компактная запись об учебном занятии.
+
+    Создается один раз при обработке данных API: id преобразуются
+    в числа, дата занятия - в объект date. Атрибуты хранятся в слотах
+    (без словаря экземпляра), поэтому запись на каждого преподавателя
+    занятия занимает меньше памяти, чем копия словаря из ответа API.
+
+    Attributes:
+    ----------
+        id: int
+            id занятия
+        date: date
+            дата занятия
+        lesson_time_id: str
+            id времени занятия (для объединенных занятий типа
+            контроль - перечисление через запятую)
+        group_id: int | None
+            id группы
+        subgroup_id: int | None
+            id подгруппы
+        discipline_id: int | None
+            id дисциплины
+        class_type_id: int | None
+            id вида занятия
+        control_type_id: int | None
+            id формы контроля
+        education_plan_id: int | None
+            id учебного плана
+        education_form_id: int | None
+            id формы обучения
+        education_level_id: int | None
+            id уровня образования
+        staff_id: int | None
+            id преподавателя
+        department_id: int | None
+            id кафедры преподавателя на дату занятия
+        hours: int | float
+            количество академических часов
+
+    Methods:
+    -------
+        from_api (lesson: dict) -> LessonRecord
+            создает запись из данных таблицы 'schedule_day_schedule_lessons'
+        copy (**changes) -> LessonRecord
+            возвращает копию записи с измененными атрибутами
+        as_tuple () -> tuple
+            возвращает значения атрибутов в порядке '__slots__'
+    """
+
+    __slots__ = (
+        "id",
+        "date",
+        "lesson_time_id",
+        "group_id",
+        "subgroup_id",
+        "discipline_id",
+        "class_type_id",
+        "control_type_id",
+        "education_plan_id",
+        "education_form_id",
+        "education_level_id",
+        "staff_id",
+        "department_id",
+        "hours",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        date: date,
+        lesson_time_id: str,
+        group_id: int | None = None,
+        subgroup_id: int | None = None,
+        discipline_id: int | None = None,
+        class_type_id: int | None = None,
+        control_type_id: int | None = None,
+        education_plan_id: int | None = None,
+        education_form_id: int | None = None,
+        education_level_id: int | None = None,
+        staff_id: int | None = None,
+        department_id: int | None = None,
+        hours: int | float = 0,
+    ) -> None:
+        self.id = id
+        self.date = date
+        self.lesson_time_id = lesson_time_id
+        self.group_id = group_id
+        self.subgroup_id = subgroup_id
+        self.discipline_id = discipline_id
+        self.class_type_id = class_type_id
+        self.control_type_id = control_type_id
+        self.education_plan_id = education_plan_id
+        self.education_form_id = education_form_id
+        self.education_level_id = education_level_id
+        self.staff_id = staff_id
+        self.department_id = department_id
+        self.hours = hours
+
+    @classmethod
+    def from_api(cls, lesson: dict) -> "LessonRecord":
+        """
+        Создает запись из данных таблицы 'schedule_day_schedule_lessons'.
+
+        Parameters
+        ----------
+            lesson: dict
+                словарь с данными об учебном занятии в формате JSON
+
+        Returns
+        -------
+            LessonRecord
+                запись о занятии
+        """
+        return cls(
+            int(lesson.get("id")),
+            date.fromisoformat(lesson.get("date")),
+            str(lesson.get("lesson_time_id")),
+            to_int_id(lesson.get("group_id")),
+            to_int_id(lesson.get("subgroup_id")),
+            to_int_id(lesson.get("discipline_id")),
+            to_int_id(lesson.get("class_type_id")),
+            to_int_id(lesson.get("control_type_id")),
+        )
+
+    def as_tuple(self) -> tuple:
+        """Возвращает значения атрибутов в порядке '__slots__'."""
+        return _record_values(self)
+
+    def copy(self, **changes) -> "LessonRecord":
+        """
+        Возвращает копию записи (например, для учета одного занятия
+        нескольким преподавателям).
+
+        Parameters
+        ----------
+            **changes
+                новые значения атрибутов копии
+
+        Returns
+        -------
+            LessonRecord
+                копия записи
+        """
+        record = LessonRecord(*_record_values(self))
+        for name, value in changes.items():
+            setattr(record, name, value)
+        return record
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LessonRecord):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{name}={value!r}" for name, value in zip(self.__slots__, self.as_tuple())
+        )
+        return f"LessonRecord({values})"
+
+
+_record_values = attrgetter(*LessonRecord.__slots__)
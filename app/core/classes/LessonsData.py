@@ -1,12 +1,22 @@
 import logging
 from collections.abc import Iterable
-from copy import copy
 from dataclasses import dataclass
-from datetime import date, timedelta
 
 from config import ApeksConfig as Apeks
+from .LessonRecord import LessonRecord, to_int_id
+from .StaffHistoryIndex import StaffHistoryIndex
 from ..func.app_core import data_processor
 
+# Дисциплина, занятия по которой учитываются как проф. подготовка
+# (временный "костыль" ПП Цифр. грамотность)
+PROF_POD_DISCIPLINE_ID = 549
+
+# Формы контроля, занятия по которым объединяются в 'control_lessons'
+_CONTROL_TYPES = frozenset(
+    Apeks.CONTROL_TYPE_ID.get(c_type)
+    for c_type in ("exam", "zachet", "zachet_mark", "final_att", "kandidat_exam")
+)
+
 
 @dataclass
 class LessonsData:
@@ -33,30 +43,36 @@ class LessonsData:
         plan_education_plans_education_forms: list
             данные из таблицы 'plan_education_plans_education_forms'
             (содержит 'education_form_id' для учебных планов)
-        staff_history_data: dict
+        staff_history_data: dict | StaffHistoryIndex
             словарь с данными в каком подразделении и когда работал
             сотрудник {id: [{'department_id': 'value',
-            'start_date': 'date', 'end_date': 'date'}]
+            'start_date': 'date', 'end_date': 'date'}] или индекс
+            периодов работы, построенный по этим данным
 
     Methods:
     -------
         lessons_staff_processor (lessons_staff: dict) -> dict
             обрабатывает данные таблицы lessons_staff,
             выводит словарь в формате: {lesson_id: [staff_id]}
-        def process_lessons -> list:
+        def process_lessons -> list[LessonRecord]:
             возвращает обработанный список занятий с добавленными
             данными о кафедре, форме обучения, уровне образования
-        def get_control_lessons -> list:
+        def get_control_lessons -> list[LessonRecord]:
             возвращает список занятий типа контроль (зачет, экзамен)
-        def get_lesson_type (lesson: dict) -> str:
+        def get_lesson_type (lesson: LessonRecord) -> str:
             определяет и возвращает тип занятия или контроля.
-        def get_student_type (lesson: dict) -> str:
+        def get_student_type (lesson: LessonRecord) -> str:
             Определяет и возвращает тип обучающегося.
-        def get_control_hours (contr_less: dict) -> int | float:
+        def get_control_hours (contr_less: LessonRecord) -> int | float:
             возвращает количество часов для занятий, относящихся к формам
             контроля в зависимости от часов и коэффициентов образовательной
             организации. Если значение больше максимального, возвращаем
             максимальное (= аудиторное)
+        def departments_load (departments_staff: dict) -> dict:
+            рассчитывает нагрузку преподавателей кафедр за один проход
+            по спискам занятий
+        def unprocessed_lessons -> list:
+            возвращает список занятий, которые не учитываются в нагрузке
         def unknown_lessons -> list:
             возвращает список занятий, для которых не удалось определить
             кафедру, т.к. преподаватель не работает ни на одной кафедре
@@ -71,9 +87,14 @@ class LessonsData:
     load_subgroups: Iterable
     plan_education_plans: Iterable
     plan_education_plans_education_forms: Iterable
-    staff_history_data: dict
+    staff_history_data: dict | StaffHistoryIndex
 
     def __post_init__(self):
+        self.staff_history_index = (
+            self.staff_history_data
+            if isinstance(self.staff_history_data, StaffHistoryIndex)
+            else StaffHistoryIndex(self.staff_history_data)
+        )
         self.lessons_staff_data = self.lessons_staff_processor(
             self.schedule_lessons_staff
         )
@@ -118,123 +139,93 @@ class LessonsData:
         logging.debug("Данные таблицы 'lessons_staff' обработаны")
         return data
 
-    def process_lessons(self) -> list:
+    def process_lessons(self) -> list[LessonRecord]:
         """
         Возвращает обработанный список занятий с добавленными данными
         о кафедре, форме обучения, уровне образования
 
+        Записи ('LessonRecord') создаются один раз для каждого занятия
+        и преподавателя, id и даты преобразуются при создании записи.
+
         Returns
         -------
-            list
+            list[LessonRecord]
                 полный список занятий
         """
         structured_lessons = []
         for lesson in self.schedule_lessons:
-            group_id = lesson.get("group_id")
-            if not group_id:
-                subgroup_id = lesson.get("subgroup_id")
-                if subgroup_id:
-                    group_id = self.subgroups_data[int(subgroup_id)].get("group_id")
-                    lesson["group_id"] = group_id
-            education_plan_id = self.groups_data.get(int(group_id))["education_plan_id"]
-            lesson["education_plan_id"] = education_plan_id
-            lesson["education_form_id"] = self.plans_education_forms_data.get(
-                int(education_plan_id)
-            ).get("education_form_id")
-            lesson["education_level_id"] = self.education_plans_data.get(
-                int(education_plan_id)
-            ).get("education_level_id")
-            lesson_id = lesson.get("id")
-            if lesson_id:
-                if int(lesson_id) in self.lessons_staff_data:
-                    for staff in self.lessons_staff_data.get(int(lesson_id)):
-                        # Копируем для того чтобы одно занятие учитывалось
-                        # разным преподавателям (когда проводят двое, трое и т.д.)
-                        less_copy = copy(lesson)
-                        less_copy["staff_id"] = int(staff)
-                        for dept in self.staff_history_data.get(int(staff)):
-                            lesson_date = date.fromisoformat(lesson.get("date"))
-                            start_date = date.fromisoformat(dept.get("start_date"))
-                            end_date = (
-                                date.fromisoformat(dept.get("end_date"))
-                                if dept.get("end_date")
-                                else date.today() + timedelta(days=365)
-                            )
-                            if start_date <= lesson_date <= end_date:
-                                less_copy["department_id"] = int(
-                                    dept.get("department_id")
-                                )
-                                less_copy["hours"] = 2
-                                structured_lessons.append(less_copy)
+            record = LessonRecord.from_api(lesson)
+            if not record.group_id and record.subgroup_id:
+                record.group_id = int(
+                    self.subgroups_data[record.subgroup_id].get("group_id")
+                )
+            education_plan_id = int(
+                self.groups_data.get(record.group_id)["education_plan_id"]
+            )
+            record.education_plan_id = education_plan_id
+            record.education_form_id = to_int_id(
+                self.plans_education_forms_data.get(education_plan_id).get(
+                    "education_form_id"
+                )
+            )
+            record.education_level_id = to_int_id(
+                self.education_plans_data.get(education_plan_id).get(
+                    "education_level_id"
+                )
+            )
+            for staff_id in self.lessons_staff_data.get(record.id, ()):
+                for department_id in self.staff_history_index.departments(
+                    staff_id, record.date
+                ):
+                    # Копируем для того чтобы одно занятие учитывалось
+                    # разным преподавателям (когда проводят двое, трое и т.д.)
+                    structured_lessons.append(
+                        record.copy(
+                            staff_id=staff_id, department_id=department_id, hours=2
+                        )
+                    )
         return structured_lessons
 
-    def get_control_lessons(self) -> list:
+    def get_control_lessons(self) -> list[LessonRecord]:
         """
-        Возвращает список занятий типа контроль (зачет, экзамен)
+        Возвращает список занятий типа контроль (зачет, экзамен).
+
+        Занятия одного преподавателя по одной дисциплине, группе, форме
+        контроля и дате объединяются в одно: часы суммируются,
+        а 'lesson_time_id' перечисляются через запятую.
 
         Returns
         -------
-            list
+            list[LessonRecord]
                 список занятий типа контроль
         """
-
-        def check_and_process(lesson: dict) -> bool:
-            """
-            Проверяет формируемый список занятий и в случае нахождения
-            аналогичного занятия из группы контроль не добавляет его в
-            список, а увеличивает количество часов.
-
-            Returns
-            -------
-                bool
-                    True - если занятие найдено и обработано
-                    False - если нет
-            """
-            lookup = [
-                "staff_id",
-                "discipline_id",
-                "group_id",
-                "control_type_id",
-                "date",
-            ]
-            counter = 0
-            for c in control_less:
-                if [lesson[val] for val in lookup] == [c[val] for val in lookup]:
-                    c["hours"] += 2
-                    c["lesson_time_id"] = (
-                        c.get("lesson_time_id") + ", " + lesson.get("lesson_time_id")
-                    )
-                    counter += 1
-            if counter != 0:
-                return True
-            else:
-                return False
-
-        control_less = []
+        control_less = {}
         for less in self.structured_lessons:
-            if less.get("control_type_id") in [
-                str(Apeks.CONTROL_TYPE_ID.get(c_type))
-                for c_type in (
-                    "exam",
-                    "zachet",
-                    "zachet_mark",
-                    "final_att",
-                    "kandidat_exam",
+            if less.control_type_id in _CONTROL_TYPES:
+                key = (
+                    less.staff_id,
+                    less.discipline_id,
+                    less.group_id,
+                    less.control_type_id,
+                    less.date,
                 )
-            ]:
-                if not check_and_process(less):
-                    control_less.append(copy(less))
-        return control_less
+                c = control_less.get(key)
+                if c is None:
+                    control_less[key] = less.copy()
+                else:
+                    c.hours += 2
+                    c.lesson_time_id = c.lesson_time_id + ", " + less.lesson_time_id
+        return list(control_less.values())
 
     @staticmethod
-    def get_lesson_type(lesson: dict) -> str:
+    def get_lesson_type(lesson: LessonRecord) -> str:
         """
         Определяет и возвращает тип занятия или контроля.
 
         Parameters
         ----------
-            lesson: dict
-                словарь с данными об аудиторном занятии
+            lesson: LessonRecord
+                запись об аудиторном занятии
 
         Returns
         -------
@@ -242,60 +233,52 @@ class LessonsData:
                 тип занятия
                 (lecture, seminar, pract, group_cons, zachet, exam, final_att)
         """
+        class_type_id = lesson.class_type_id
+        control_type_id = lesson.control_type_id
         # Лекция
-        if lesson.get("class_type_id") == str(Apeks.CLASS_TYPE_ID.get("lecture")):
+        if class_type_id == Apeks.CLASS_TYPE_ID.get("lecture"):
             l_type = "lecture"
         # Семинар
-        elif lesson.get("class_type_id") == str(Apeks.CLASS_TYPE_ID.get("seminar")):
+        elif class_type_id == Apeks.CLASS_TYPE_ID.get("seminar"):
             l_type = "seminar"
         # Практическое занятие (+ вх, вых. контроль)
         elif (
-            lesson.get("class_type_id") == str(Apeks.CLASS_TYPE_ID.get("prakt"))
-            or lesson.get("control_type_id")
-            == str(Apeks.CONTROL_TYPE_ID.get("in_control"))
-            or lesson.get("control_type_id")
-            == str(Apeks.CONTROL_TYPE_ID.get("out_control"))
+            class_type_id == Apeks.CLASS_TYPE_ID.get("prakt")
+            or control_type_id == Apeks.CONTROL_TYPE_ID.get("in_control")
+            or control_type_id == Apeks.CONTROL_TYPE_ID.get("out_control")
         ):
             l_type = "pract"
         # Групповая консультация
-        elif lesson.get("control_type_id") == str(
-            Apeks.CONTROL_TYPE_ID.get("group_cons")
-        ):
+        elif control_type_id == Apeks.CONTROL_TYPE_ID.get("group_cons"):
             l_type = "group_cons"
         # Зачет (+ зачет с оценкой, + итоговая письменная аудиторная к/р)
         elif (
-            lesson.get("control_type_id") == str(Apeks.CONTROL_TYPE_ID.get("zachet"))
-            or lesson.get("control_type_id")
-            == str(Apeks.CONTROL_TYPE_ID.get("zachet_mark"))
-            or lesson.get("control_type_id")
-            == str(Apeks.CONTROL_TYPE_ID.get("itog_kontr"))
+            control_type_id == Apeks.CONTROL_TYPE_ID.get("zachet")
+            or control_type_id == Apeks.CONTROL_TYPE_ID.get("zachet_mark")
+            or control_type_id == Apeks.CONTROL_TYPE_ID.get("itog_kontr")
         ):
             l_type = "zachet"
         # Экзамен (+ кандидатский экзамен)
-        elif lesson.get("control_type_id") == str(
-            Apeks.CONTROL_TYPE_ID.get("exam")
-        ) or lesson.get("control_type_id") == str(
-            Apeks.CONTROL_TYPE_ID.get("kandidat_exam")
-        ):
+        elif control_type_id == Apeks.CONTROL_TYPE_ID.get(
+            "exam"
+        ) or control_type_id == Apeks.CONTROL_TYPE_ID.get("kandidat_exam"):
             l_type = "exam"
         # Итоговая аттестация
-        elif lesson.get("control_type_id") == str(
-            Apeks.CONTROL_TYPE_ID.get("final_att")
-        ):
+        elif control_type_id == Apeks.CONTROL_TYPE_ID.get("final_att"):
             l_type = "final_att"
         else:
             l_type = None
         return l_type
 
     @staticmethod
-    def get_student_type(lesson: dict) -> str:
+    def get_student_type(lesson: LessonRecord) -> str:
         """
         Определяет и возвращает тип обучающегося.
 
         Parameters
         ----------
-            lesson: dict
-                словарь с данными об аудиторном занятии
+            lesson: LessonRecord
+                запись об аудиторном занятии
 
         Returns
         -------
@@ -303,53 +286,49 @@ class LessonsData:
                 тип обучающегося
                 (och, zo_high, zo_mid, adj, prof_pod, dpo)
         """
-
-        # проф подготовка (+ временный "костыль" ПП Цифр. грамотность - id: 549)
+        education_form_id = lesson.education_form_id
+        education_level_id = lesson.education_level_id
+        high_levels = (
+            Apeks.EDUCATION_LEVEL_ID.get("bak"),
+            Apeks.EDUCATION_LEVEL_ID.get("spec"),
+        )
+        # проф подготовка (+ временный "костыль" ПП Цифр. грамотность)
         if (
-            lesson.get("education_form_id")
-            == str(Apeks.EDUCATION_FORM_ID.get("prof_pod"))
-            or lesson.get("discipline_id") == "549"
+            education_form_id == Apeks.EDUCATION_FORM_ID.get("prof_pod")
+            or lesson.discipline_id == PROF_POD_DISCIPLINE_ID
         ):
             s_type = "prof_pod"
         # очно, бакалавр или специалитет
-        elif lesson.get("education_form_id") == str(
-            Apeks.EDUCATION_FORM_ID.get("ochno")
-        ) and (
-            lesson.get("education_level_id") == str(Apeks.EDUCATION_LEVEL_ID.get("bak"))
-            or lesson.get("education_level_id")
-            == str(Apeks.EDUCATION_LEVEL_ID.get("spec"))
+        elif (
+            education_form_id == Apeks.EDUCATION_FORM_ID.get("ochno")
+            and education_level_id in high_levels
         ):
             s_type = "och"
         # заочно, бакалавр или специалитет
-        elif lesson.get("education_form_id") == str(
-            Apeks.EDUCATION_FORM_ID.get("zaochno")
-        ) and (
-            lesson.get("education_level_id") == str(Apeks.EDUCATION_LEVEL_ID.get("bak"))
-            or lesson.get("education_level_id")
-            == str(Apeks.EDUCATION_LEVEL_ID.get("spec"))
+        elif (
+            education_form_id == Apeks.EDUCATION_FORM_ID.get("zaochno")
+            and education_level_id in high_levels
         ):
             s_type = "zo_high"
         # заочно, среднее
-        elif lesson.get("education_form_id") == str(
-            Apeks.EDUCATION_FORM_ID.get("zaochno")
-        ) and lesson.get("education_level_id") == str(
-            Apeks.EDUCATION_LEVEL_ID.get("spo")
-        ):
+        elif education_form_id == Apeks.EDUCATION_FORM_ID.get(
+            "zaochno"
+        ) and education_level_id == Apeks.EDUCATION_LEVEL_ID.get("spo"):
             s_type = "zo_mid"
         # адъюнктура
-        elif lesson.get("education_level_id") in [
-            str(Apeks.EDUCATION_LEVEL_ID.get("adj")),
-            str(Apeks.EDUCATION_LEVEL_ID.get("adj-fgt")),
-        ]:
+        elif education_level_id in (
+            Apeks.EDUCATION_LEVEL_ID.get("adj"),
+            Apeks.EDUCATION_LEVEL_ID.get("adj-fgt"),
+        ):
             s_type = "adj"
         # дополнительное проф образование
-        elif lesson.get("education_form_id") == str(Apeks.EDUCATION_FORM_ID.get("dpo")):
+        elif education_form_id == Apeks.EDUCATION_FORM_ID.get("dpo"):
             s_type = "dpo"
         else:
             s_type = None
         return s_type
 
-    def get_control_hours(self, contr_less: dict) -> int | float:
+    def get_control_hours(self, contr_less: LessonRecord) -> int | float:
         """
         Возвращает количество часов для занятий, относящихся к формам
         контроля в зависимости от часов и коэффициентов образовательной
@@ -358,8 +337,8 @@ class LessonsData:
 
         Parameters
         ----------
-            contr_less: dict
-                словарь с данными о занятии типа контроль
+            contr_less: LessonRecord
+                запись о занятии типа контроль
 
         Returns
         -------
@@ -370,21 +349,21 @@ class LessonsData:
         stud_type = self.get_student_type(contr_less)
         # Подгруппа может быть только если группа делится
         # и нагрузка считается преподавателям отдельно
-        if contr_less.get("subgroup_id"):
-            subgroup_id = contr_less.get("subgroup_id")
+        if contr_less.subgroup_id:
             people_count = int(
-                self.subgroups_data[int(subgroup_id)].get("people_count")
+                self.subgroups_data[contr_less.subgroup_id].get("people_count")
             )
         else:
-            group_id = contr_less.get("group_id")
-            people_count = int(self.groups_data[int(group_id)].get("people_count"))
+            people_count = int(
+                self.groups_data[contr_less.group_id].get("people_count")
+            )
         # Для проф подготовки и ДПО нагрузка считается фактически (не по людям)
         if stud_type == "prof_pod" or stud_type == "dpo":
-            return contr_less.get("hours")
-        elif stud_type == "adj" and contr_less.get("control_type_id") in [
+            return contr_less.hours
+        elif stud_type == "adj" and contr_less.control_type_id in (
             Apeks.CONTROL_TYPE_ID.get("final_att"),
-            Apeks.CONTROL_TYPE_ID.get("kandidat_exam",)
-        ]:
+            Apeks.CONTROL_TYPE_ID.get("kandidat_exam"),
+        ):
             value = people_count * Apeks.ADJ_KF
             return Apeks.ADJ_KF_MAX if value > Apeks.ADJ_KF_MAX else value
         elif cont_type == "zachet":
@@ -397,6 +376,69 @@ class LessonsData:
             value = people_count * Apeks.FINAL_KF
             return Apeks.FINAL_KF_MAX if value > Apeks.FINAL_KF_MAX else value
 
+    def departments_load(self, departments_staff: dict) -> dict:
+        """
+        Рассчитывает нагрузку преподавателей кафедр за один проход
+        по спискам занятий. Занятия преподавателей, не входящих в состав
+        кафедры (например, работающих на не относящихся к ППС должностях),
+        не учитываются.
+
+        Parameters
+        ----------
+            departments_staff: dict
+                преподаватели кафедр {department_id: {staff_id: 'short_name'}}
+
+        Returns
+        -------
+            dict
+                {department_id: {staff_id: {l_type: {s_type: value}}}}
+        """
+        lesson_types = Apeks.LOAD_LESSON_TYPES + Apeks.LOAD_CONTROL_TYPES
+        load_data = {
+            int(department_id): {
+                staff_id: {
+                    l_type: dict.fromkeys(Apeks.LOAD_STUDENT_TYPES, 0)
+                    for l_type in lesson_types
+                }
+                for staff_id in staff_list
+            }
+            for department_id, staff_list in departments_staff.items()
+        }
+        for lesson in self.structured_lessons:
+            staff_load = load_data.get(lesson.department_id, {}).get(lesson.staff_id)
+            if staff_load:
+                l_type = self.get_lesson_type(lesson)
+                s_type = self.get_student_type(lesson)
+                if l_type and s_type:
+                    if l_type in Apeks.LOAD_LESSON_TYPES:
+                        staff_load[l_type][s_type] += 2
+        for control in self.control_lessons:
+            staff_load = load_data.get(control.department_id, {}).get(control.staff_id)
+            if staff_load:
+                l_type = self.get_lesson_type(control)
+                s_type = self.get_student_type(control)
+                if l_type and s_type:
+                    if l_type in Apeks.LOAD_CONTROL_TYPES:
+                        value = self.get_control_hours(control)
+                        staff_load[l_type][s_type] += value
+        return load_data
+
+    def unprocessed_lessons(self) -> list:
+        """
+        Возвращает список занятий (в том числе типа контроль), которые
+        не учитываются в нагрузке, т.к. не удалось определить кафедру.
+        """
+        unprocessed = []
+        for lesson in self.structured_lessons:
+            if not lesson.department_id:
+                logging.warning(f"Необработанное занятие - {lesson}")
+                unprocessed.append(lesson)
+        for control in self.control_lessons:
+            if not control.department_id:
+                logging.warning(f"Необработанное занятие типа контроль - {control}")
+                unprocessed.append(control)
+        return unprocessed
+
     def unknown_lessons(self) -> list:
         """
         Возвращает список занятий, для которых не удалось определить кафедру,
@@ -404,7 +446,7 @@ class LessonsData:
         """
         unknown = []
         for less in self.structured_lessons:
-            if not less.get("department_id"):
+            if not less.department_id:
                 unknown.append(less)
         if unknown:
             logging.info("Список 'unknown_lessons' не пуст")
@@ -412,9 +454,10 @@ class LessonsData:
 
     def department_lessons(self, department_id: int | str) -> list:
         """Возвращает список занятий, относящихся к определенной кафедре"""
+        department_id = int(department_id)
         dept_lessons = []
         for less in self.structured_lessons:
-            if less.get("department_id") == int(department_id):
+            if less.department_id == department_id:
                 dept_lessons.append(less)
         logging.debug(f"Передан список занятий кафедры. id: {department_id}")
         return dept_lessons
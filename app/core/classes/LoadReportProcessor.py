@@ -1,8 +1,8 @@
-import logging
 from dataclasses import dataclass
 
 from config import ApeksConfig as Apeks
 from .LessonsData import LessonsData
+from .NumpyLoadEngine import NumpyLoadEngine
 
 
 @dataclass
@@ -99,38 +99,17 @@ class LoadReportProcessor(LessonsData):
         return staff_load
 
     def process_load_data(self) -> None:
-        """Рассчитывает нагрузку по преподавателям"""
-        lesson_types = Apeks.LOAD_LESSON_TYPES + Apeks.LOAD_CONTROL_TYPES
-        for staff_id in self.staff_list:
-            self.load_data[staff_id] = {}
-            for l_type in lesson_types:
-                self.load_data[staff_id][l_type] = {}
-                for s_type in Apeks.LOAD_STUDENT_TYPES:
-                    self.load_data[staff_id][l_type][s_type] = 0
-        for lesson in self.structured_lessons:
-            department_id = lesson.get("department_id")
-            if department_id:
-                if department_id == int(self.department_id):
-                    staff_id = lesson.get("staff_id")
-                    l_type = self.get_lesson_type(lesson)
-                    s_type = self.get_student_type(lesson)
-                    if staff_id and l_type and s_type:
-                        if l_type in Apeks.LOAD_LESSON_TYPES:
-                            self.add_load(staff_id, l_type, s_type)
-            else:
-                logging.warning(f"Необработанное занятие - {lesson}")
-                self.unprocessed.append(lesson)
-        for control in self.control_lessons:
-            department_id = control.get("department_id")
-            if department_id:
-                if department_id == int(self.department_id):
-                    staff_id = control.get("staff_id")
-                    l_type = self.get_lesson_type(control)
-                    s_type = self.get_student_type(control)
-                    if staff_id and l_type and s_type:
-                        if l_type in Apeks.LOAD_CONTROL_TYPES:
-                            value = self.get_control_hours(control)
-                            self.add_load(staff_id, l_type, s_type, value)
-            else:
-                logging.warning(f"Необработанное занятие типа контроль - {control}")
-                self.unprocessed.append(control)
+        """
+        Рассчитывает нагрузку по преподавателям.
+
+        Способ расчета задается настройкой 'ApeksConfig.LOAD_ENGINE':
+        'python' - последовательная обработка занятий, 'numpy' -
+        векторизованный расчет (NumpyLoadEngine).
+        """
+        departments_staff = {int(self.department_id): self.staff_list}
+        if Apeks.LOAD_ENGINE == "numpy":
+            load_data = NumpyLoadEngine(self).departments_load(departments_staff)
+        else:
+            load_data = self.departments_load(departments_staff)
+        self.load_data = load_data[int(self.department_id)]
+        self.unprocessed = self.unprocessed_lessons()
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+
+from config import ApeksConfig as Apeks
+
+
+@dataclass
+class MonthlyLoadReport:
+    """
+    Отчет об учебной нагрузке кафедры за период, рассчитанный
+    суммированием нагрузки за отдельные месяцы (сохраненной
+    или рассчитанной LoadReportProcessor). Содержит те же атрибуты,
+    что используются при формировании отчета из LoadReportProcessor.
+
+    Attributes:
+    ----------
+        year: int | str
+            учебный год (число 20xx).
+        month_start: int | str
+            начальный месяц (число 1-12).
+        month_end: int | str
+            конечный месяц (число 1-12).
+        department_id: int
+            id кафедры
+        departments: dict
+            список кафедр, словарь в формате {id: {'full':
+            'название кафедры', 'short': 'сокращенное название'}}
+        department_staff: dict
+            словарь преподавателей, работавших в подразделении
+            ('department_id') в указанный период. {id: 'short_name'}
+        monthly_load: list
+            нагрузка за каждый месяц периода
+            [{staff_id: {l_type: {s_type: value}}}]
+    """
+
+    year: int | str
+    month_start: int | str
+    month_end: int | str
+    department_id: int
+    departments: dict
+    department_staff: dict
+    monthly_load: list
+
+    def __post_init__(self) -> None:
+        self.staff_list = self.department_staff
+        lesson_types = Apeks.LOAD_LESSON_TYPES + Apeks.LOAD_CONTROL_TYPES
+        self.load_data = {
+            staff_id: {
+                l_type: dict.fromkeys(Apeks.LOAD_STUDENT_TYPES, 0)
+                for l_type in lesson_types
+            }
+            for staff_id in self.staff_list
+        }
+        for month_load in self.monthly_load:
+            for staff_id, staff_load in month_load.items():
+                if staff_id not in self.load_data:
+                    continue
+                for l_type, values in staff_load.items():
+                    for s_type, value in values.items():
+                        self.load_data[staff_id][l_type][s_type] += value
+        self.file_period = (
+            Apeks.MONTH_DICT[int(self.month_start)]
+            if self.month_start == self.month_end
+            else f"{Apeks.MONTH_DICT[int(self.month_start)]}-"
+            f"{Apeks.MONTH_DICT[int(self.month_end)]}"
+        )
@@ -0,0 +1,360 @@
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+from config import ApeksConfig as Apeks
+from .LessonRecord import LessonRecord
+from .LessonsData import PROF_POD_DISCIPLINE_ID, LessonsData
+
+LESSON_TYPES = Apeks.LOAD_LESSON_TYPES + Apeks.LOAD_CONTROL_TYPES
+STUDENT_TYPES = Apeks.LOAD_STUDENT_TYPES
+
+
+def _type_code(name: str | None, types: tuple) -> int:
+    """Возвращает номер типа занятия (обучающегося), -1 - если не определен."""
+    return types.index(name) if name in types else -1
+
+
+def _probe(**values) -> LessonRecord:
+    """Запись о занятии для заполнения таблиц поиска."""
+    return LessonRecord(0, None, "", **values)
+
+
+def _lookup_table(ids: Iterable[int], func: Callable) -> np.ndarray:
+    """
+    Таблица поиска: элемент с индексом id содержит результат func(id).
+    Нулевой и последний элементы - для пустых id и id, отсутствующих
+    в настройках (ApeksConfig).
+    """
+    ids = set(ids)
+    return np.array(
+        [func(value if value in ids else None) for value in range(max(ids) + 2)],
+        dtype=np.int8,
+    )
+
+
+def _lesson_type_table(field: str, ids: Iterable[int]) -> np.ndarray:
+    """
+    Таблица поиска номеров типов занятий по значению поля 'field'
+    (LessonsData.get_lesson_type).
+    """
+    return _lookup_table(
+        ids,
+        lambda value: _type_code(
+            LessonsData.get_lesson_type(_probe(**{field: value})), LESSON_TYPES
+        ),
+    )
+
+
+def _student_type_table() -> np.ndarray:
+    """
+    Таблица поиска номеров типов обучающихся 'форма обучения x уровень
+    образования' (LessonsData.get_student_type).
+    """
+    forms = set(Apeks.EDUCATION_FORM_ID.values())
+    levels = set(Apeks.EDUCATION_LEVEL_ID.values())
+    return np.array(
+        [
+            [
+                _type_code(
+                    LessonsData.get_student_type(
+                        _probe(
+                            education_form_id=form if form in forms else None,
+                            education_level_id=level if level in levels else None,
+                        )
+                    ),
+                    STUDENT_TYPES,
+                )
+                for level in range(max(levels) + 2)
+            ]
+            for form in range(max(forms) + 2)
+        ],
+        dtype=np.int8,
+    )
+
+
+def _column(lessons: list[LessonRecord], name: str) -> np.ndarray:
+    """Возвращает массив значений атрибута записей о занятиях (пустые - 0)."""
+    return np.fromiter(
+        (getattr(lesson, name) or 0 for lesson in lessons),
+        dtype=np.int64,
+        count=len(lessons),
+    )
+
+
+@dataclass
+class NumpyLoadEngine:
+    """
+    Векторизованный расчет учебной нагрузки с помощью NumPy
+    (ApeksConfig.LOAD_ENGINE = 'numpy').
+
+    Записи о занятиях загружаются в массивы по столбцам один раз,
+    типы занятий и обучающихся определяются по таблицам поиска,
+    построенным по идентификаторам из настроек (ApeksConfig) с помощью
+    методов LessonsData, нагрузка суммируется по группам 'преподаватель x
+    тип занятия x тип обучающегося'. Результат совпадает с расчетом
+    LessonsData.departments_load.
+
+    Attributes:
+    ----------
+        lessons_data: LessonsData
+            обработанные сведения об учебных занятиях
+
+    Methods:
+    -------
+        load_data (department_id: int, staff_list: Iterable) -> dict
+            возвращает нагрузку преподавателей кафедры
+            {staff_id: {l_type: {s_type: value}}}
+        departments_load (departments_staff: dict) -> dict
+            возвращает нагрузку преподавателей нескольких кафедр
+            {department_id: {staff_id: {l_type: {s_type: value}}}}
+    """
+
+    lessons_data: LessonsData
+
+    def __post_init__(self) -> None:
+        self.class_type_table = _lesson_type_table(
+            "class_type_id", Apeks.CLASS_TYPE_ID.values()
+        )
+        self.control_type_table = _lesson_type_table(
+            "control_type_id", Apeks.CONTROL_TYPE_ID.values()
+        )
+        self.student_type_table = _student_type_table()
+        self.lessons = self.load_columns(
+            self.lessons_data.structured_lessons, Apeks.LOAD_LESSON_TYPES
+        )
+        self.controls = self.load_columns(
+            self.lessons_data.control_lessons, Apeks.LOAD_CONTROL_TYPES
+        )
+
+    def lesson_types(
+        self, class_type_id: np.ndarray, control_type_id: np.ndarray
+    ) -> np.ndarray:
+        """
+        Возвращает номера типов занятий (LESSON_TYPES, -1 - не определен).
+        Как и в LessonsData.get_lesson_type, вид занятия проверяется
+        раньше формы контроля.
+        """
+        class_codes = self.class_type_table[
+            np.minimum(class_type_id, len(self.class_type_table) - 1)
+        ]
+        control_codes = self.control_type_table[
+            np.minimum(control_type_id, len(self.control_type_table) - 1)
+        ]
+        return np.where(class_codes >= 0, class_codes, control_codes)
+
+    def student_types(
+        self,
+        education_form_id: np.ndarray,
+        education_level_id: np.ndarray,
+        discipline_id: np.ndarray,
+    ) -> np.ndarray:
+        """Возвращает номера типов обучающихся (STUDENT_TYPES, -1 - не определен)"""
+        rows, columns = self.student_type_table.shape
+        codes = self.student_type_table[
+            np.minimum(education_form_id, rows - 1),
+            np.minimum(education_level_id, columns - 1),
+        ]
+        return np.where(
+            discipline_id == PROF_POD_DISCIPLINE_ID,
+            _type_code("prof_pod", STUDENT_TYPES),
+            codes,
+        )
+
+    def load_columns(self, lessons: list[LessonRecord], load_types: tuple) -> dict:
+        """
+        Загружает записи о занятиях в массивы и определяет типы занятий
+        и обучающихся.
+
+        Parameters
+        ----------
+            lessons: list[LessonRecord]
+                записи о занятиях
+            load_types: tuple
+                типы занятий, учитываемые в нагрузке
+
+        Returns
+        -------
+            dict
+                {'index': номера записей, учитываемых в нагрузке,
+                 'staff_id', 'department_id', 'l_code', 's_code': массивы
+                 значений для этих записей}
+        """
+        l_codes = self.lesson_types(
+            _column(lessons, "class_type_id"), _column(lessons, "control_type_id")
+        )
+        s_codes = self.student_types(
+            _column(lessons, "education_form_id"),
+            _column(lessons, "education_level_id"),
+            _column(lessons, "discipline_id"),
+        )
+        staff_ids = _column(lessons, "staff_id")
+        department_ids = _column(lessons, "department_id")
+        index = np.flatnonzero(
+            (staff_ids != 0)
+            & (department_ids != 0)
+            & np.isin(l_codes, [LESSON_TYPES.index(l_type) for l_type in load_types])
+            & (s_codes >= 0)
+        )
+        return {
+            "index": index,
+            "staff_id": staff_ids[index],
+            "department_id": department_ids[index],
+            "l_code": l_codes[index],
+            "s_code": s_codes[index],
+        }
+
+    def control_hours(self, index: np.ndarray, s_codes: np.ndarray) -> np.ndarray:
+        """
+        Возвращает количество часов для занятий типа контроль
+        (векторизованный аналог LessonsData.get_control_hours).
+
+        Parameters
+        ----------
+            index: np.ndarray
+                номера записей в списке 'control_lessons'
+            s_codes: np.ndarray
+                номера типов обучающихся для этих записей
+
+        Returns
+        -------
+            np.ndarray
+                количество академических часов
+        """
+        controls = [self.lessons_data.control_lessons[i] for i in index.tolist()]
+        people_count = np.fromiter(
+            (
+                int(
+                    self.lessons_data.subgroups_data[control.subgroup_id].get(
+                        "people_count"
+                    )
+                    if control.subgroup_id
+                    else self.lessons_data.groups_data[control.group_id].get(
+                        "people_count"
+                    )
+                )
+                for control in controls
+            ),
+            dtype=np.float64,
+            count=len(controls),
+        )
+        hours = np.fromiter(
+            (control.hours for control in controls),
+            dtype=np.float64,
+            count=len(controls),
+        )
+        control_type_id = _column(controls, "control_type_id")
+        l_codes = self.lesson_types(_column(controls, "class_type_id"), control_type_id)
+        # Для проф подготовки и ДПО нагрузка считается фактически (не по людям)
+        fact = np.isin(
+            s_codes, [STUDENT_TYPES.index("prof_pod"), STUDENT_TYPES.index("dpo")]
+        )
+        adj = (s_codes == STUDENT_TYPES.index("adj")) & np.isin(
+            control_type_id,
+            [
+                Apeks.CONTROL_TYPE_ID.get("final_att"),
+                Apeks.CONTROL_TYPE_ID.get("kandidat_exam"),
+            ],
+        )
+        conditions = [
+            adj,
+            l_codes == LESSON_TYPES.index("zachet"),
+            l_codes == LESSON_TYPES.index("exam"),
+            l_codes == LESSON_TYPES.index("final_att"),
+        ]
+        kf = np.select(
+            conditions, [Apeks.ADJ_KF, Apeks.ZACH_KF, Apeks.EXAM_KF, Apeks.FINAL_KF]
+        )
+        kf_max = np.select(
+            conditions,
+            [
+                Apeks.ADJ_KF_MAX,
+                Apeks.ZACH_KF_MAX,
+                Apeks.EXAM_KF_MAX,
+                Apeks.FINAL_KF_MAX,
+            ],
+        )
+        return np.where(fact, hours, np.minimum(people_count * kf, kf_max))
+
+    def load_data(self, department_id: int | str, staff_list: Iterable[int]) -> dict:
+        """
+        Возвращает нагрузку преподавателей кафедры.
+
+        Parameters
+        ----------
+            department_id: int | str
+                id кафедры
+            staff_list: Iterable[int]
+                id преподавателей кафедры
+
+        Returns
+        -------
+            dict
+                {staff_id: {l_type: {s_type: value}}}
+        """
+        staff_ids = list(staff_list)
+        staff_index = {staff_id: index for index, staff_id in enumerate(staff_ids)}
+        shape = (len(staff_ids), len(LESSON_TYPES), len(STUDENT_TYPES))
+        cubes = []
+        for columns in (self.lessons, self.controls):
+            selected = np.flatnonzero(columns["department_id"] == int(department_id))
+            staff_codes = np.fromiter(
+                (
+                    staff_index.get(staff_id, -1)
+                    for staff_id in columns["staff_id"][selected].tolist()
+                ),
+                dtype=np.int64,
+                count=len(selected),
+            )
+            # Преподаватели, не входящие в состав кафедры, не учитываются
+            selected, staff_codes = (
+                selected[staff_codes >= 0],
+                staff_codes[staff_codes >= 0],
+            )
+            s_codes = columns["s_code"][selected]
+            if columns is self.lessons:
+                # Аудиторные занятия - 2 часа за каждое занятие
+                weights = None
+            else:
+                weights = self.control_hours(columns["index"][selected], s_codes)
+            cube = np.bincount(
+                np.ravel_multi_index(
+                    (staff_codes, columns["l_code"][selected], s_codes), shape
+                ),
+                weights=weights,
+                minlength=int(np.prod(shape)),
+            ).reshape(shape)
+            cubes.append(cube * 2 if weights is None else cube)
+        lessons_cube, control_cube = (cube.tolist() for cube in cubes)
+        load_data = {}
+        for staff_code, staff_id in enumerate(staff_ids):
+            load_data[staff_id] = {}
+            for l_code, l_type in enumerate(LESSON_TYPES):
+                cube = (
+                    lessons_cube if l_type in Apeks.LOAD_LESSON_TYPES else control_cube
+                )
+                load_data[staff_id][l_type] = dict(
+                    zip(STUDENT_TYPES, cube[staff_code][l_code])
+                )
+        return load_data
+
+    def departments_load(self, departments_staff: dict) -> dict:
+        """
+        Возвращает нагрузку преподавателей нескольких кафедр
+        (записи о занятиях загружаются в массивы один раз).
+
+        Parameters
+        ----------
+            departments_staff: dict
+                преподаватели кафедр {department_id: {staff_id: 'short_name'}}
+
+        Returns
+        -------
+            dict
+                {department_id: {staff_id: {l_type: {s_type: value}}}}
+        """
+        return {
+            int(department_id): self.load_data(department_id, staff_list)
+            for department_id, staff_list in departments_staff.items()
+        }
@@ -0,0 +1,129 @@
+from calendar import isleap
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+import numpy as np
+
+
+@dataclass
+class ProductionCalendar:
+    """
+    Производственный календарь: выходные (суббота, воскресенье)
+    и праздничные дни с учетом переносов рабочих дней.
+
+    Для каждого года один раз строится массив признаков нерабочих дней
+    (элемент с индексом N - день года N + 1), проверки выполняются
+    по индексу, подсчет дней за период - по срезам массивов (np.count_nonzero).
+
+    Attributes:
+    ----------
+        holidays: Iterable[date]
+            нерабочие (праздничные) дни
+        working_days: Iterable[date]
+            рабочие выходные дни (перенесенные рабочие дни)
+
+    Methods:
+    -------
+        is_holiday (check_date: date) -> bool
+            проверяет, является ли день нерабочим
+        holidays_mask (dates: Sequence[date]) -> np.ndarray
+            признаки нерабочих дней для списка дат
+        non_working_days (date_start: date, date_end: date) -> list[date]
+            нерабочие дни за период
+        working_days_count (date_start: date, date_end: date) -> int
+            количество рабочих дней за период
+    """
+
+    holidays: Iterable[date]
+    working_days: Iterable[date]
+    _years: dict = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.holidays = frozenset(self.holidays)
+        self.working_days = frozenset(self.working_days)
+
+    def year_mask(self, year: int) -> np.ndarray:
+        """
+        Возвращает признаки нерабочих дней года
+        (массив bool, элемент с индексом N - день года N + 1).
+        """
+        mask = self._years.get(year)
+        if mask is None:
+            days = 366 if isleap(year) else 365
+            # Номер дня недели (0 - понедельник) для каждого дня года
+            weekdays = (np.arange(days) + date(year, 1, 1).weekday()) % 7
+            mask = weekdays >= 5
+            for working_day in self.working_days:
+                if working_day.year == year:
+                    mask[working_day.timetuple().tm_yday - 1] = False
+            for holiday in self.holidays:
+                if holiday.year == year:
+                    mask[holiday.timetuple().tm_yday - 1] = True
+            mask.flags.writeable = False
+            self._years[year] = mask
+        return mask
+
+    def _period_mask(self, date_start: date, date_end: date) -> np.ndarray:
+        """Признаки нерабочих дней за период (включая границы)."""
+        return np.concatenate(
+            [
+                self.year_mask(year)[
+                    (
+                        date_start.timetuple().tm_yday - 1
+                        if year == date_start.year
+                        else 0
+                    ) : (
+                        date_end.timetuple().tm_yday if year == date_end.year else None
+                    )
+                ]
+                for year in range(date_start.year, date_end.year + 1)
+            ]
+        )
+
+    def is_holiday(self, check_date: date) -> bool:
+        """Проверяет, является ли день нерабочим."""
+        return bool(self.year_mask(check_date.year)[check_date.timetuple().tm_yday - 1])
+
+    def holidays_mask(self, dates: Sequence[date]) -> np.ndarray:
+        """
+        Возвращает признаки нерабочих дней для списка дат.
+
+        Parameters
+        ----------
+            dates: Sequence[date]
+                даты
+
+        Returns
+        -------
+            np.ndarray
+                массив bool той же длины, что и 'dates'
+        """
+        if not dates:
+            return np.zeros(0, dtype=bool)
+        ordinals = np.fromiter(
+            (check_date.toordinal() for check_date in dates),
+            dtype=np.int64,
+            count=len(dates),
+        )
+        first = date.fromordinal(int(ordinals.min()))
+        last = date.fromordinal(int(ordinals.max()))
+        first = date(first.year, 1, 1)
+        period = self._period_mask(first, date(last.year, 12, 31))
+        return period[ordinals - first.toordinal()]
+
+    def non_working_days(self, date_start: date, date_end: date) -> list[date]:
+        """Возвращает нерабочие дни за период (включая границы)."""
+        if date_start > date_end:
+            return []
+        return [
+            date_start + timedelta(days=int(offset))
+            for offset in np.flatnonzero(self._period_mask(date_start, date_end))
+        ]
+
+    def working_days_count(self, date_start: date, date_end: date) -> int:
+        """Возвращает количество рабочих дней за период (включая границы)."""
+        if date_start > date_end:
+            return 0
+        period = self._period_mask(date_start, date_end)
+        return int(period.size - np.count_nonzero(period))
@@ -0,0 +1,95 @@
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import accumulate
+
+
+@dataclass
+class StaffHistoryIndex:
+    """
+    Индекс периодов работы сотрудников в подразделениях для быстрого
+    определения, в каком подразделении работал сотрудник в указанную дату.
+
+    Даты периодов преобразуются один раз при создании индекса, периоды
+    каждого сотрудника сортируются по дате начала, поиск выполняется
+    двоичным поиском.
+
+    Attributes:
+    ----------
+        staff_history: dict
+            словарь с данными в каком подразделении и когда работал
+            сотрудник (результат EducationStaff.staff_history())
+            {id: [{'department_id': 'value',
+                   'start_date': 'date',
+                   'end_date': 'date'}]
+
+    Methods:
+    -------
+        departments (staff_id: int, on_date: date) -> list
+            возвращает id подразделений, в которых работал сотрудник
+            в указанную дату.
+        department_id (staff_id: int, on_date: date) -> int | None
+            возвращает id подразделения, в котором работал сотрудник
+            в указанную дату.
+    """
+
+    staff_history: dict
+    _periods: dict = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._periods = {}
+        for staff_id, history in self.staff_history.items():
+            periods = sorted(
+                (
+                    date.fromisoformat(record.get("start_date")),
+                    (
+                        date.fromisoformat(record.get("end_date"))
+                        if record.get("end_date")
+                        else date.max
+                    ),
+                    int(record.get("department_id")),
+                )
+                for record in history
+            )
+            starts, ends, departments = zip(*periods) if periods else ((), (), ())
+            # Наибольшая дата окончания среди периодов, начавшихся не позднее
+            # текущего (для поиска пересекающихся периодов)
+            max_ends = list(accumulate(ends, max))
+            self._periods[int(staff_id)] = (starts, ends, max_ends, departments)
+
+    def departments(self, staff_id: int, on_date: date) -> list[int]:
+        """
+        Возвращает id подразделений, в которых работал сотрудник
+        в указанную дату (несколько - если периоды работы пересекаются).
+
+        Parameters
+        ----------
+            staff_id: int
+                id сотрудника
+            on_date: date
+                дата
+
+        Returns
+        -------
+            list
+                [department_id]
+        """
+        periods = self._periods.get(staff_id)
+        if not periods:
+            return []
+        starts, ends, max_ends, departments = periods
+        index = bisect_right(starts, on_date)
+        result = []
+        while index > 0 and max_ends[index - 1] >= on_date:
+            index -= 1
+            if ends[index] >= on_date and departments[index] not in result:
+                result.append(departments[index])
+        return result[::-1]
+
+    def department_id(self, staff_id: int, on_date: date) -> int | None:
+        """
+        Возвращает id подразделения, в котором работал сотрудник
+        в указанную дату (последнего по дате начала работы).
+        """
+        departments = self.departments(staff_id, on_date)
+        return departments[-1] if departments else None
@@ -0,0 +1,295 @@
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from itertools import product
+from datetime import date
+from typing import Any, Iterable, Iterator
+
+from config import ApeksConfig
+
+SYNC_TABLE = "mirror_sync"
+SYNC_FIELDS = (
+    "synced_at",
+    "full_synced_at",
+    "last_timestamp",
+    "period_start",
+    "period_end",
+)
+IDENTIFIER_REGEX = re.compile(r"^[a-z_][a-z0-9_]*$")
+# Максимальное количество значений фильтра-списка в одном запросе к SQLite
+# (ограничение количества параметров запроса)
+FILTER_CHUNK_SIZE = 500
+
+
+class ApeksMirror:
+    """
+    Локальная копия (зеркало) таблиц базы данных АпексВУЗ в SQLite.
+
+    Для каждой таблицы из конфигурации создается таблица с ключом записи,
+    данными записи в формате JSON и индексируемыми полями. Сведения
+    о синхронизации хранятся в таблице 'mirror_sync'.
+
+    Attributes:
+    ----------
+    path : str
+        путь к файлу базы данных SQLite
+    tables : dict
+        настройки таблиц {table: {'sync': тип синхронизации,
+        'key': поля ключа записи, 'indexes': индексируемые поля}}
+    max_age : int
+        время (секунды) с последней синхронизации, после которого данные
+        таблицы не используются для чтения
+    """
+
+    def __init__(
+        self,
+        path: str = ApeksConfig.MIRROR_DB_PATH,
+        tables: dict[str, dict] = ApeksConfig.MIRROR_TABLES,
+        max_age: int = ApeksConfig.MIRROR_MAX_AGE,
+    ):
+        self.path = path
+        self.tables = tables
+        self.max_age = max_age
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_created = False
+
+    def _connection(self) -> sqlite3.Connection:
+        """Возвращает соединение с базой данных для текущего потока."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        with self._schema_lock:
+            if not self._schema_created:
+                self._create_schema(connection)
+                self._schema_created = True
+        return connection
+
+    def _create_schema(self, connection: sqlite3.Connection) -> None:
+        with connection:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {SYNC_TABLE} ("
+                "table_name TEXT PRIMARY KEY, synced_at REAL, "
+                "full_synced_at REAL, last_timestamp TEXT, "
+                "period_start TEXT, period_end TEXT)"
+            )
+            for table in self.tables:
+                columns = self.indexes(table)
+                for name in (table, *columns):
+                    if not IDENTIFIER_REGEX.match(name):
+                        raise ValueError(f"Недопустимое имя таблицы или поля: {name}")
+                columns_sql = "".join(f", {column} TEXT" for column in columns)
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    f"(mirror_key TEXT PRIMARY KEY, data TEXT NOT NULL{columns_sql})"
+                )
+                for column in columns:
+                    connection.execute(
+                        f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} "
+                        f"ON {table} ({column})"
+                    )
+
+    def indexes(self, table: str) -> tuple[str, ...]:
+        """Возвращает индексируемые поля таблицы."""
+        return tuple(self.tables[table].get("indexes", ()))
+
+    def _row_values(self, table: str, row: dict[str, Any]) -> tuple:
+        key_fields = self.tables[table].get("key", ("id",))
+        key = "-".join(str(row.get(field)) for field in key_fields)
+        indexed = tuple(
+            None if row.get(column) is None else str(row.get(column))
+            for column in self.indexes(table)
+        )
+        return key, json.dumps(row, ensure_ascii=False), *indexed
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Транзакция записи: изменения видны читателям только после завершения."""
+        connection = self._connection()
+        with connection:
+            yield connection
+
+    def upsert(
+        self, connection: sqlite3.Connection, table: str, rows: Iterable[dict]
+    ) -> int:
+        """Добавляет или заменяет записи таблицы. Возвращает их количество."""
+        columns = ("mirror_key", "data", *self.indexes(table))
+        placeholders = ", ".join("?" for _ in columns)
+        cursor = connection.executemany(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({placeholders})",
+            (self._row_values(table, row) for row in rows),
+        )
+        return cursor.rowcount
+
+    def delete(
+        self, connection: sqlite3.Connection, table: str, where: str = "", args=()
+    ) -> None:
+        """Удаляет записи таблицы по условию (все записи - если условие пусто)."""
+        connection.execute(f"DELETE FROM {table} {where}", args)
+
+    def get_sync_info(self, table: str) -> dict[str, Any]:
+        """
+        Возвращает сведения о последней синхронизации таблицы: время
+        синхронизации и полной синхронизации, наибольшее значение поля
+        'timestamp', границы загруженного периода (для занятий).
+        """
+        row = (
+            self._connection()
+            .execute(
+                f"SELECT {', '.join(SYNC_FIELDS)} FROM {SYNC_TABLE} "
+                "WHERE table_name = ?",
+                (table,),
+            )
+            .fetchone()
+        )
+        return dict(zip(SYNC_FIELDS, row or (None,) * len(SYNC_FIELDS)))
+
+    def set_sync_info(
+        self,
+        connection: sqlite3.Connection,
+        table: str,
+        full: bool = False,
+        last_timestamp: str | None = None,
+        period_start: date | None = None,
+        period_end: date | None = None,
+    ) -> None:
+        """
+        Сохраняет сведения о синхронизации таблицы. Не переданные значения
+        остаются прежними.
+        """
+        now = time.time()
+        info = self.get_sync_info(table)
+        connection.execute(
+            f"INSERT OR REPLACE INTO {SYNC_TABLE} "
+            f"(table_name, {', '.join(SYNC_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                table,
+                now,
+                now if full else info["full_synced_at"],
+                last_timestamp or info["last_timestamp"],
+                period_start.isoformat() if period_start else info["period_start"],
+                period_end.isoformat() if period_end else info["period_end"],
+            ),
+        )
+
+    def invalidate(self, table: str) -> None:
+        """
+        Помечает данные таблицы как устаревшие (например, после изменения
+        таблицы через API) до следующей синхронизации.
+        """
+        if table not in self.tables:
+            return
+        with self.transaction() as connection:
+            connection.execute(
+                f"UPDATE {SYNC_TABLE} SET synced_at = NULL WHERE table_name = ?",
+                (table,),
+            )
+        logging.debug(f"Данные таблицы '{table}' в зеркале помечены как устаревшие")
+
+    def is_ready(
+        self,
+        table: str,
+        date_start: date | None = None,
+        date_end: date | None = None,
+    ) -> bool:
+        """
+        Проверяет, что таблица есть в зеркале, полностью загружена
+        и синхронизирована не позднее 'max_age' секунд назад. Если указан
+        период - проверяет, что он входит в загруженный период.
+        """
+        if table not in self.tables:
+            return False
+        try:
+            info = self.get_sync_info(table)
+        except sqlite3.Error as error:
+            logging.error(f"Ошибка чтения зеркала АпексВУЗ: {error}")
+            return False
+        if not (
+            info["full_synced_at"]
+            and info["synced_at"]
+            and time.time() - info["synced_at"] <= self.max_age
+        ):
+            return False
+        if date_start or date_end:
+            return bool(
+                info["period_start"]
+                and info["period_end"]
+                and info["period_start"] <= (date_start or date_end).isoformat()
+                and (date_end or date_start).isoformat() <= info["period_end"]
+            )
+        return True
+
+    def _select(self, table: str, where: list[str], args: list) -> list[dict]:
+        """Выполняет запрос к таблице зеркала и возвращает данные записей."""
+        sql = f"SELECT data FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        rows = self._connection().execute(sql, args).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def get(self, table: str, **filters) -> list[dict[str, Any]]:
+        """
+        Возвращает записи таблицы, соответствующие фильтрам
+        (аналогично ApeksApiDbService.get: значение или список значений).
+        Большие списки значений разделяются на несколько запросов
+        по FILTER_CHUNK_SIZE значений.
+        """
+        columns, chunks = [], []
+        indexes = self.indexes(table)
+        for db_filter, db_value in filters.items():
+            if not IDENTIFIER_REGEX.match(db_filter):
+                raise ValueError(f"Недопустимое имя поля: {db_filter}")
+            values = (
+                [str(db_value)]
+                if isinstance(db_value, (int, str))
+                else list(dict.fromkeys(str(val) for val in db_value))
+            )
+            if not values:
+                return []
+            columns.append(
+                db_filter
+                if db_filter in indexes
+                else f"json_extract(data, '$.{db_filter}')"
+            )
+            chunks.append(
+                [
+                    values[index : index + FILTER_CHUNK_SIZE]
+                    for index in range(0, len(values), FILTER_CHUNK_SIZE)
+                ]
+            )
+        rows = []
+        # Части значений не пересекаются, записи частей не повторяются
+        for values_chunks in product(*chunks):
+            where = [
+                f"{column} IN ({', '.join('?' for _ in values)})"
+                for column, values in zip(columns, values_chunks)
+            ]
+            rows.extend(
+                self._select(
+                    table, where, [val for vals in values_chunks for val in vals]
+                )
+            )
+        return rows
+
+    def get_date_range(
+        self, table: str, date_start: date, date_end: date, field: str = "date"
+    ) -> list[dict[str, Any]]:
+        """Возвращает записи таблицы, дата которых входит в указанный период."""
+        column = (
+            field
+            if field in self.indexes(table)
+            else f"json_extract(data, '$.{field}')"
+        )
+        return self._select(
+            table,
+            [f"{column} BETWEEN ? AND ?"],
+            [date_start.isoformat(), date_end.isoformat()],
+        )
@@ -1,6 +1,6 @@
-from datetime import date
+from datetime import date, datetime
 
-from sqlalchemy import Date, Integer
+from sqlalchemy import Date, DateTime, Float, Integer, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .database import db
@@ -22,3 +22,47 @@ class ProductionCalendarWorkingDays(db.Model):
 
     def __repr__(self):
         return self.date.strftime("%Y-%m-%d")
+
+
+class LoadMonthlyAggregates(db.Model):
+    """
+    Модель для сохраненной нагрузки преподавателей кафедры за месяц
+    по типам занятий и обучающихся (хранятся ненулевые значения).
+    """
+
+    __tablename__ = "load_monthly_aggregates"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    month: Mapped[int] = mapped_column(Integer, nullable=False)
+    department_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    staff_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    lesson_type: Mapped[str] = mapped_column(String(16), nullable=False)
+    student_type: Mapped[str] = mapped_column(String(16), nullable=False)
+    value: Mapped[float] = mapped_column(Float, nullable=False)
+    __table_args__ = (
+        UniqueConstraint(
+            "year",
+            "month",
+            "department_id",
+            "staff_id",
+            "lesson_type",
+            "student_type",
+        ),
+    )
+
+
+class LoadMonthlyAggregatesStatus(db.Model):
+    """Модель для месяцев, нагрузка кафедры за которые сохранена."""
+
+    __tablename__ = "load_monthly_aggregates_status"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    month: Mapped[int] = mapped_column(Integer, nullable=False)
+    department_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    created: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # Параметры расчета нагрузки (load_aggregates_fingerprint)
+    fingerprint: Mapped[str] = mapped_column(String(16), nullable=False, default="")
+    __table_args__ = (UniqueConstraint("year", "month", "department_id"),)
+
+    def __repr__(self):
+        return f"{self.year}-{self.month:02d} {self.department_id}"
@@ -3,6 +3,11 @@ class ApeksApiException(Exception):
     pass
 
 
+class ApeksApiUnavailableException(ApeksApiException):
+    """API Апекс-ВУЗ недоступен, запросы временно приостановлены"""
+    pass
+
+
 class ApeksWrongParameterException(Exception):
     """Передан неверный параметр рабочей программы"""
     pass
@@ -1,6 +1,18 @@
 from flask_login import LoginManager
 
+from .db.apeks_mirror import ApeksMirror
 from .db.auth_models import AnonymousUser
+from .repository.apeks_api_cache import ApeksApiCache, ApeksApiStaleCache
+from .repository.apeks_api_client import ApeksApiClient
+from .repository.apeks_api_metrics import ApeksApiMetrics
+from .repository.apeks_circuit_breaker import ApeksCircuitBreaker
 
 login_manager = LoginManager()
 login_manager.anonymous_user = AnonymousUser
+
+apeks_api_metrics = ApeksApiMetrics()
+apeks_api_client = ApeksApiClient(metrics=apeks_api_metrics)
+apeks_api_cache = ApeksApiCache()
+apeks_api_stale_cache = ApeksApiStaleCache()
+apeks_circuit_breaker = ApeksCircuitBreaker()
+apeks_mirror = ApeksMirror()
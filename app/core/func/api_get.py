@@ -1,15 +1,36 @@
+import asyncio
 import functools
 import logging
-from calendar import monthrange
 from datetime import date
-from json import JSONDecodeError
-
-import httpx
+from typing import Awaitable
 
 from ...core.exceptions import ApeksApiException
+from ...core.extensions import apeks_api_cache
+from ...core.repository.apeks_api_repository import ApeksApiRepository
+from ...core.services.base_apeks_api_service import (
+    materialize_filters,
+    merge_table_data,
+    split_filters,
+)
 from config import ApeksConfig as Apeks
 
-transport = httpx.AsyncHTTPTransport(retries=3)
+apeks_api_repository = ApeksApiRepository()
+
+
+async def api_response(name: str, request: Awaitable) -> dict:
+    """
+    Выполняет запрос репозитория ApeksApiRepository (общий пул соединений,
+    автоматический выключатель, сохраненные ответы, метрики) и возвращает
+    ответ в формате функций модулей api_get, api_post и api_delete:
+    {'status': 1, 'data': данные} или {'status': 0, 'message': ошибка}.
+    """
+    try:
+        data = await request
+    except ApeksApiException as error:
+        logging.error(f"{name}. Ошибка запроса к API Апекс-ВУЗ: {error}")
+        return {"status": 0, "message": str(error)}
+    logging.debug(f"{name}. Запрос успешно выполнен")
+    return {"status": 1, "data": data}
 
 
 def api_get_request_handler(func):
@@ -18,45 +39,13 @@ def api_get_request_handler(func):
     @functools.wraps(func)
     async def wrapper(*args, **kwargs) -> dict:
         endpoint, params = await func(*args, **kwargs)
-        async with httpx.AsyncClient(transport=transport) as client:
-            try:
-                response = await client.get(endpoint, params=params)
-                response.raise_for_status()
-            except httpx.RequestError as exc:
-                logging.error(
-                    f"{func.__name__}. Ошибка при запросе к "
-                    f"API Апекс-ВУЗ: {exc.request.url!r}."
-                )
-            except httpx.HTTPStatusError as exc:
-                logging.error(
-                    f"{func.__name__}. Произошла ошибка "
-                    f"{exc.response.status_code} во время "
-                    f"запроса {exc.request.url!r}."
-                )
-            else:
-                try:
-                    resp_json = response.json()
-                    del params["token"]
-                    if resp_json.get("status") == 1:
-                        logging.debug(
-                            f"{func.__name__}. Запрос успешно выполнен: {params}"
-                        )
-                    else:
-                        logging.debug(
-                            f"{func.__name__}. Произошла ошибка: "
-                            f"{resp_json.get('message')}"
-                        )
-                    return resp_json
-                except JSONDecodeError as error:
-                    logging.error(
-                        f"{func.__name__}. Ошибка конвертации "
-                        f"ответа API Апекс-ВУЗ в JSON: '{error}'"
-                    )
+        return await api_response(
+            func.__name__, apeks_api_repository.get(endpoint, params)
+        )
 
     return wrapper
 
 
-@api_get_request_handler
 async def api_get_db_table(
         table_name: str,
         url: str = Apeks.URL,
@@ -65,6 +54,61 @@ async def api_get_db_table(
 ):
     """
     Запрос к API для получения информации из таблицы базы данных Апекс-ВУЗ.
+    Фильтры с большими списками значений разделяются на несколько
+    параллельных запросов, результаты которых объединяются.
+    Данные редко изменяемых таблиц (ApeksConfig.CACHE_TABLES_TTL)
+    выдаются из общего с ApeksApiDbService кэша.
+
+    Parameters
+    ----------
+        table_name: str
+            имя_таблицы
+        url: str
+            URL сервера
+        token: str
+            токен для API
+        **kwargs:
+            'filter_name=value' для дополнительных фильтров запроса
+    """
+    kwargs = materialize_filters(kwargs)
+    cached_data = apeks_api_cache.get(table_name, kwargs)
+    if cached_data is not None:
+        logging.debug(f"Получены данные из кэша таблицы: {table_name}")
+        return {"status": 1, "data": cached_data}
+    filters_chunks = split_filters(kwargs)
+    if len(filters_chunks) == 1:
+        response = await api_get_db_table_chunk(table_name, url, token, **kwargs)
+        if response.get("status") == 1:
+            apeks_api_cache.set(table_name, kwargs, response.get("data"))
+        return response
+    responses = await asyncio.gather(
+        *(
+            api_get_db_table_chunk(table_name, url, token, **chunk)
+            for chunk in filters_chunks
+        )
+    )
+    for response in responses:
+        if not isinstance(response, dict) or response.get("status") != 1:
+            return response
+    logging.debug(
+        f"Запрос 'api_get_db_table' к таблице {table_name} разделен "
+        f"на {len(filters_chunks)} частей"
+    )
+    data = merge_table_data([response.get("data", []) for response in responses])
+    apeks_api_cache.set(table_name, kwargs, data)
+    return {"status": 1, "data": data}
+
+
+@api_get_request_handler
+async def api_get_db_table_chunk(
+        table_name: str,
+        url: str = Apeks.URL,
+        token: str = Apeks.TOKEN,
+        **kwargs,
+):
+    """
+    Запрос к API для получения информации из таблицы базы данных Апекс-ВУЗ
+    (один запрос, без разделения фильтров).
 
     Parameters
     ----------
@@ -87,7 +131,8 @@ async def api_get_db_table(
                 values = [str(val) for val in db_value]
             params[f"filter[{db_filter}][]"] = values
     logging.debug(
-        f"Переданы параметры для запроса 'api_get_db_table': к таблице {table_name}"
+        "Переданы параметры для запроса 'api_get_db_table_chunk': "
+        f"к таблице {table_name}"
     )
     return endpoint, params
 
@@ -221,56 +266,6 @@ async def check_api_staff_lessons_response(response: dict) -> list:
     return lessons
 
 
-@api_get_request_handler
-async def get_lessons(
-        year: int,
-        month_start: int,
-        month_end: int,
-        day_start: int = 1,
-        day_end: int = None,
-        table_name: str = Apeks.TABLES.get("schedule_day_schedule_lessons"),
-        url: str = Apeks.URL,
-        token: str = Apeks.TOKEN,
-):
-    """
-    Получение списка занятий за указанный период.
-
-    Parameters
-    ----------
-        year: int
-            учебный год (число 20xx).
-        month_start: int
-            начальный месяц (число 1-12).
-        month_end: int
-            конечный месяц (число 1-12).
-        day_start: int
-            начальная дата (число 1-31).
-        day_end: int
-            конечная дата (число 1-31).
-        table_name: str
-            имя_таблицы
-        url: str
-            URL сервера
-        token: str
-            токен для API
-    """
-    if not day_end:
-        day_end = monthrange(year, month_end)[1]
-    endpoint = f"{url}/api/call/system-database/get"
-    params = {
-        "token": token,
-        "table": table_name,
-        "filter": f"date between '{date(year, month_start, day_start).isoformat()}' "
-                  f"and '{date(year, month_end, day_end).isoformat()}'",
-    }
-    logging.debug(
-        "Переданы параметры для запроса 'get_lessons': "
-        f"date between '{date(year, month_start, day_start).isoformat()}' "
-        f"and '{date(year, month_end, day_end).isoformat()}'"
-    )
-    return endpoint, params
-
-
 @api_get_request_handler
 async def get_state_staff_history(
         req_date: date,
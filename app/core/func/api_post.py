@@ -1,10 +1,9 @@
 import functools
 import logging
-from json import JSONDecodeError
-
-import httpx
 
 from ...core.exceptions import ApeksApiException
+from ...core.extensions import apeks_api_cache, apeks_mirror
+from .api_get import api_response, apeks_api_repository
 from config import ApeksConfig as Apeks
 
 
@@ -14,41 +13,14 @@ def api_post_request_handler(func):
     @functools.wraps(func)
     async def wrapper(*args, **kwargs) -> dict:
         endpoint, params, data = await func(*args, **kwargs)
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(endpoint, params=params, data=data)
-                response.raise_for_status()
-            except httpx.RequestError as exc:
-                logging.error(
-                    f"{func.__name__}. Ошибка при запросе к "
-                    f"API Апекс-ВУЗ: {exc.request.url!r}."
-                )
-            except httpx.HTTPStatusError as exc:
-                logging.error(
-                    f"{func.__name__}. Произошла ошибка "
-                    f"{exc.response.status_code} во время "
-                    f"запроса {exc.request.url!r}."
-                )
-            else:
-                try:
-                    resp_json = response.json()
-                    del params["token"]
-                    if resp_json.get("status") == 1:
-                        logging.debug(
-                            f"{func.__name__}. Запрос успешно выполнен, данные "
-                            f"({resp_json.get('data')}) добавлены / обновлены: {data}"
-                        )
-                    else:
-                        logging.debug(
-                            f"{func.__name__}. Произошла ошибка: "
-                            f"{resp_json.get('message')}"
-                        )
-                    return resp_json
-                except JSONDecodeError as error:
-                    logging.error(
-                        f"{func.__name__}. Ошибка конвертации "
-                        f"ответа API Апекс-ВУЗ в JSON: '{error}'"
-                    )
+        table = data.get("table")
+        response = await api_response(
+            func.__name__, apeks_api_repository.post(endpoint, params, data)
+        )
+        apeks_api_cache.invalidate(table)
+        if Apeks.MIRROR_ENABLED:
+            apeks_mirror.invalidate(table)
+        return response
 
     return wrapper
 
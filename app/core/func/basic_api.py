@@ -1,13 +1,12 @@
-import httpx
-
 from config import ApeksConfig as Apeks
+from ..extensions import apeks_api_client
 
 
 def db_request(table_name):
     """DB request function without filter."""
     params = {"token": Apeks.TOKEN, "table": table_name}
-    response = httpx.get(
-        Apeks.URL + "/api/call/system-database/get", params=params
+    response = apeks_api_client.request_sync(
+        "GET", Apeks.URL + "/api/call/system-database/get", params=params
     )
     return response.json()["data"]
 
@@ -19,7 +18,7 @@ def db_filter_req(table_name, sql_field, sql_value):
         "table": table_name,
         "filter[" + sql_field + "]": str(sql_value),
     }
-    response = httpx.get(
-        Apeks.URL + "/api/call/system-database/get", params=params
+    response = apeks_api_client.request_sync(
+        "GET", Apeks.URL + "/api/call/system-database/get", params=params
     )
     return response.json()["data"]
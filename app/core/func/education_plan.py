@@ -3,7 +3,6 @@ import logging
 from config import ApeksConfig as Apeks
 from .api_delete import api_delete_from_db_table
 from .api_get import api_get_db_table, check_api_db_response
-from .api_post import api_add_to_db_table
 from .app_core import data_processor
 
 
@@ -262,90 +261,6 @@ async def get_plan_control_works(
     return control_works
 
 
-async def plan_competency_add(
-    education_plan_id: int | str,
-    code: str,
-    description: str,
-    left_node: int | str,
-    right_node: int | str,
-    level: int | str = 1,
-    table_name: str = Apeks.TABLES.get("plan_competencies"),
-) -> dict:
-    """
-    Добавление компетенции в учебный план.
-
-    Parameters
-    ----------
-        education_plan_id: int | str
-            id учебного плана
-        code: str
-            код компетенции
-        description: str
-            описание компетенции
-        left_node: int | str
-            начальная граница сортировки
-        right_node: int | str
-            конечная граница сортировки
-        level: int | str = 1
-            код уровня компетенции
-        table_name: str
-            имя таблицы в БД
-    """
-
-    response = await api_add_to_db_table(
-        table_name,
-        education_plan_id=education_plan_id,
-        code=code,
-        description=description,
-        level=level,
-        left_node=left_node,
-        right_node=right_node,
-    )
-    if response.get("status") == 1:
-        logging.debug(
-            f"Добавлена компетенция {code} в учебный план: {education_plan_id}."
-        )
-    else:
-        logging.debug(
-            f"Компетенция {code} не добавлена в учебный план: {education_plan_id}."
-        )
-    return response
-
-
-async def discipline_competency_add(
-    curriculum_discipline_id: int | str,
-    competency_id: int | str,
-    table_name: str = Apeks.TABLES.get("plan_curriculum_discipline_competencies"),
-) -> dict:
-    """Добавление компетенции в учебный план.
-
-    Parameters
-    ----------
-        curriculum_discipline_id: int | str,
-            id дисциплины учебного плана
-        competency_id: int | str
-            id компетенции учебного плана
-        table_name: str
-            имя таблицы в БД
-    """
-    response = await api_add_to_db_table(
-        table_name,
-        curriculum_discipline_id=curriculum_discipline_id,
-        competency_id=competency_id,
-    )
-    if response.get("status") == 1:
-        logging.debug(
-            f"Добавлена связь дисциплины ({curriculum_discipline_id}) "
-            f"и компетенции ({competency_id})."
-        )
-    else:
-        logging.debug(
-            f"Не удалось добавить связь дисциплины ({curriculum_discipline_id}) "
-            f"и компетенции ({competency_id})."
-        )
-    return response
-
-
 async def plan_competencies_del(
     education_plan_id: int | str,
     table_name: str = Apeks.TABLES.get("plan_competencies"),
@@ -11,6 +11,8 @@ from .api_get import api_get_db_table, check_api_db_response
 from .api_post import api_add_to_db_table, api_edit_db_table
 from .app_core import data_processor
 from .education_plan import get_plan_control_works
+from ..repository.apeks_api_repository import ApeksApiRepository
+from ..services.base_apeks_api_service import ApeksApiDbService, ApeksBulkResult
 
 
 async def get_work_programs_data(
@@ -373,6 +375,7 @@ async def work_program_view_data(
             }
     """
     programs_info = {}
+    missing_programs = []
     for disc in plan.disc_wp_match:
         programs_info[disc] = {}
         disc_name = plan.discipline_name(disc)
@@ -386,106 +389,16 @@ async def work_program_view_data(
                         plan.work_programs_data[program], parameter
                     )
                 except ApeksParameterNonExistException:
-                    await work_program_add_parameter(program, parameter)
+                    missing_programs.append(program)
                     field_data = ""
                 else:
                     field_data = "" if not field_data else field_data
                 programs_info[disc][disc_name][program] = field_data
+    if missing_programs:
+        await work_programs_add_parameter(missing_programs, parameter)
     return programs_info
 
 
-async def work_program_competency_data_add(
-    fields: dict,
-    table_name: str = Apeks.TABLES.get("mm_work_programs_competencies_data"),
-) -> dict:
-    """
-    Добавление данных о компетенции в рабочую программу.
-
-    :param fields: {"work_program_id": val, "competency_id": val,
-        "field_id": val, "value": val}
-    :param table_name: имя таблицы БД
-    :return: ответ api {status: code, data: val}
-    """
-    response = await api_add_to_db_table(
-        table_name,
-        **fields,
-    )
-    if response.get("status") == 1:
-        logging.debug(
-            "Добавлены данные о компетенции в рабочую программу "
-            f"{fields.get('work_program_id')}."
-        )
-    else:
-        logging.error(
-            f"Не удалось добавить данные о компетенции в рабочую программу "
-            f"{fields.get('work_program_id')}."
-        )
-    return response
-
-
-async def work_program_competency_level_add(
-    fields: dict,
-    table_name: str = Apeks.TABLES.get("mm_competency_levels"),
-) -> dict:
-    """
-    Добавление данных об уровне формирования компетенций в рабочую программу.
-
-    :param fields: {"work_program_id": val, "level": val, "semester_id": val,
-        "control_type_id": val, "knowledge": val, "abilities": val,
-        "ownerships": val, "level1": "", "level2": "", "level3": ""}
-    :param table_name: имя таблицы БД
-    :return: ответ api {status: code, data: value}
-    """
-    response = await api_add_to_db_table(
-        table_name,
-        **fields,
-    )
-    if response.get("status") == 1:
-        logging.debug(
-            "Добавлены данные об уровне формирования компетенций в "
-            f"рабочую программу {fields.get('work_program_id')}."
-        )
-    else:
-        logging.error(
-            "Не удалось добавить данные об уровне формирования компетенций в "
-            f"рабочую программу {fields.get('work_program_id')}."
-        )
-    return response
-
-
-async def work_program_competency_level_edit(
-    work_program_id: int | str,
-    fields: dict,
-    level: int | str = Apeks.BASE_COMP_LEVEL,
-    table_name: str = Apeks.TABLES.get("mm_competency_levels"),
-) -> dict:
-    """
-    Изменение данных об уровне формирования компетенций в рабочей программе.
-
-    :param work_program_id: id рабочей программы
-    :param fields: поля для редактирования {"semester_id": val,
-        "control_type_id": val, "knowledge": val, "abilities": val,
-        "ownerships": val, "level1": "", "level2": "", "level3": ""}
-    :param level: номер уровня сформированности для редактирования
-    :param table_name: имя таблицы БД
-    :return: ответ api {status: code, data: value}
-    """
-    filters = {"work_program_id": work_program_id, "level": level}
-    response = await api_edit_db_table(table_name, filters, fields)
-
-    if response.get("status") == 1:
-        logging.debug(
-            "Изменены сведения об уровне формирования компетенций "
-            f"в рабочей программе {work_program_id}."
-        )
-    else:
-        logging.error(
-            "Не удалось изменить сведения об уровне формирования компетенций "
-            f"в рабочей программе {work_program_id}."
-        )
-    return response
-
-
 def work_program_field_tb_table(parameter: str) -> str:
     """
     Определяет в какой таблице базы данных находится
@@ -618,11 +531,12 @@ async def create_work_program(
     return response
 
 
-async def work_program_add_parameter(
+def work_program_parameter_fields(
     work_program_id: int | str, parameter: str, load_data: str = ""
-) -> dict:
+) -> tuple[str, dict]:
     """
-    Добавления пустого поля (parameter) в рабочую программу.
+    Возвращает таблицу и поля записи для добавления поля (parameter)
+    в рабочую программу.
 
     Parameters
     ----------
@@ -632,6 +546,11 @@ async def work_program_add_parameter(
             id поля для загрузки данных
         load_data: str
             содержимое поля для загрузки. (необязательное)
+
+    Returns
+    -------
+        tuple
+            (имя таблицы, поля записи)
     """
     table_name = work_program_field_tb_table(parameter)
     if table_name == Apeks.TABLES.get("mm_sections"):
@@ -639,24 +558,41 @@ async def work_program_add_parameter(
             "work_program_id": work_program_id,
             Apeks.MM_SECTIONS.get(parameter): load_data,
         }
-        response = await api_add_to_db_table(
-            table_name,
-            **fields,
-        )
     elif table_name == Apeks.TABLES.get("mm_work_programs_data"):
         fields = {
             "work_program_id": work_program_id,
             "field_id": Apeks.MM_WORK_PROGRAMS_DATA.get(parameter),
             "data": "",
         }
-        response = await api_add_to_db_table(
-            table_name,
-            **fields,
-        )
     else:
         message = f"Передан неверный параметр '{parameter}' для загрузки в программу"
         logging.debug(message)
         raise ApeksWrongParameterException(message)
+    return table_name, fields
+
+
+async def work_program_add_parameter(
+    work_program_id: int | str, parameter: str, load_data: str = ""
+) -> dict:
+    """
+    Добавления пустого поля (parameter) в рабочую программу.
+
+    Parameters
+    ----------
+        work_program_id: int | str
+            id рабочей программы
+        parameter: str
+            id поля для загрузки данных
+        load_data: str
+            содержимое поля для загрузки. (необязательное)
+    """
+    table_name, fields = work_program_parameter_fields(
+        work_program_id, parameter, load_data
+    )
+    response = await api_add_to_db_table(
+        table_name,
+        **fields,
+    )
     logging.debug(
         f"В рабочую программу '{work_program_id}' добавлено "
         f"поле '{parameter}' со значением '{load_data}'."
@@ -664,6 +600,37 @@ async def work_program_add_parameter(
     return response
 
 
+async def work_programs_add_parameter(
+    work_program_ids: list[int | str], parameter: str
+) -> ApeksBulkResult:
+    """
+    Добавление пустого поля (parameter) в несколько рабочих программ
+    (запросы выполняются одновременно).
+
+    Parameters
+    ----------
+        work_program_ids: list[int | str]
+            id рабочих программ
+        parameter: str
+            id поля для загрузки данных
+    """
+    table_name, _ = work_program_parameter_fields(None, parameter)
+    service = ApeksApiDbService(
+        table=table_name, repository=ApeksApiRepository(), token=Apeks.TOKEN
+    )
+    result = await service.bulk_create(
+        [
+            work_program_parameter_fields(work_program_id, parameter)[1]
+            for work_program_id in work_program_ids
+        ]
+    )
+    logging.debug(
+        f"В рабочие программы добавлено поле '{parameter}': {result.count}"
+        f"{result.errors_message()}"
+    )
+    return result
+
+
 async def work_programs_dates_update(
     work_program_id: int | str | tuple[int | str] | list[int | str],
     date_methodical: str,
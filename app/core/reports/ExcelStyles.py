@@ -42,6 +42,21 @@ class ExcelStyle(object):
         horizontal="center", vertical="center", wrap_text=True, shrink_to_fit=True
     )
 
+    NumberDecimal = NamedStyle(name="number_decimal")
+    NumberDecimal.font = Font(name="Times New Roman", size=9)
+    NumberDecimal.border = AllBorder
+    NumberDecimal.alignment = Alignment(
+        horizontal="center", vertical="center", wrap_text=True, shrink_to_fit=True
+    )
+    NumberDecimal.number_format = "0.00"
+
+    NumberBold = NamedStyle(name="number_bold")
+    NumberBold.font = Font(name="Times New Roman", size=10, bold=True)
+    NumberBold.border = AllBorder
+    NumberBold.alignment = Alignment(
+        horizontal="center", vertical="center", wrap_text=True, shrink_to_fit=True
+    )
+
     BaseBold = NamedStyle(name="base_bold")
     BaseBold.font = Font(name="Times New Roman", size=11, bold=True)
     BaseBold.border = AllBorder
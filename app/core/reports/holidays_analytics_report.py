@@ -0,0 +1,253 @@
+import asyncio
+import logging
+import os
+from collections.abc import Iterable
+
+from openpyxl.utils import get_column_letter
+from openpyxl.workbook import Workbook
+
+from config import FlaskConfig
+from .ExcelStyles import ExcelStyle
+from .holidays_report import get_all_education_staff, get_staff_lesson_dates
+from ..classes.HolidaysAnalytics import (
+    BUSY_HOLIDAYS,
+    HOLIDAYS_LESSONS,
+    NO_DEPARTMENT_ID,
+    TOTAL_LESSONS,
+    HolidaysAnalytics,
+    academic_years_months,
+)
+from ..classes.ProductionCalendar import ProductionCalendar
+
+
+async def collect_holidays_analytics(
+    analytics: HolidaysAnalytics, year_start: int, year_end: int
+) -> None:
+    """
+    Учитывает занятия учебных лет помесячно. Занятия следующего месяца
+    запрашиваются во время обработки текущего (обработка выполняется
+    в отдельном потоке), в памяти одновременно находятся данные
+    не более чем двух месяцев.
+
+    Parameters
+    ----------
+        analytics: HolidaysAnalytics
+            счетчики занятости в выходные дни
+        year_start: int
+            первый учебный год (год начала, число 20xx)
+        year_end: int
+            последний учебный год (год начала, число 20xx)
+    """
+    months = iter(academic_years_months(year_start, year_end))
+    task = asyncio.ensure_future(get_staff_lesson_dates(*next(months)))
+    try:
+        while task is not None:
+            staff_lesson_dates = await task
+            month = next(months, None)
+            task = (
+                asyncio.ensure_future(get_staff_lesson_dates(*month))
+                if month is not None
+                else None
+            )
+            await asyncio.to_thread(analytics.add_lessons, staff_lesson_dates)
+            del staff_lesson_dates
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+def _share(part: int, total: int) -> float:
+    return part / total if total else 0.0
+
+
+def _write_header(ws, title: str, columns: dict, years: tuple, year_columns: dict):
+    """
+    Заполняет заголовок листа: общие столбцы и группы столбцов
+    для каждого учебного года.
+    """
+    width = len(columns) + len(years) * len(year_columns)
+    ws.cell(1, 1).value = title
+    ws.cell(1, 1).style = ExcelStyle.Header
+    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=width)
+    column = 1
+    for name, column_width in columns.items():
+        ws.cell(2, column).value = name
+        ws.merge_cells(start_row=2, start_column=column, end_row=3, end_column=column)
+        ws.column_dimensions[get_column_letter(column)].width = column_width
+        column += 1
+    for year in years:
+        ws.cell(2, column).value = f"{year}/{year + 1}"
+        ws.merge_cells(
+            start_row=2,
+            start_column=column,
+            end_row=2,
+            end_column=column + len(year_columns) - 1,
+        )
+        for name, column_width in year_columns.items():
+            ws.cell(3, column).value = name
+            ws.column_dimensions[get_column_letter(column)].width = column_width
+            column += 1
+    for row in (2, 3):
+        for column in range(1, width + 1):
+            ws.cell(row, column).style = ExcelStyle.HeaderSmall
+            ws.cell(row, column).fill = ExcelStyle.GreyFill
+
+
+def _write_row(ws, row: int, values: list, formats: dict) -> None:
+    """Заполняет строку таблицы (formats - {номер столбца: формат числа})."""
+    for column, value in enumerate(values, 1):
+        cell = ws.cell(row, column)
+        cell.value = value
+        if isinstance(value, str):
+            cell.style = ExcelStyle.Base_No_Wrap
+        else:
+            cell.style = ExcelStyle.Number
+            if column in formats:
+                cell.number_format = formats[column]
+
+
+async def generate_holidays_analytics_report(
+    year_start: int,
+    year_end: int,
+    production_calendar: ProductionCalendar,
+    department_ids: Iterable[int] | None = None,
+) -> str:
+    """
+    Формирует отчет о занятости в выходные дни за несколько учебных лет
+    с сравнением по годам в формате xlsx (листы: 'Преподаватели',
+    'Кафедры', 'Выходные дни').
+
+    Parameters
+    ----------
+        year_start: int
+            первый учебный год (год начала, число 20xx)
+        year_end: int
+            последний учебный год (год начала, число 20xx)
+        production_calendar: ProductionCalendar
+            производственный календарь
+        department_ids: Iterable[int] | None
+            id кафедр (None - все преподаватели)
+
+    Returns
+    -------
+        str
+            название файла
+    """
+    all_staff = await get_all_education_staff(year_start, 1, 12)
+    departments = dict(all_staff.departments)
+    departments[NO_DEPARTMENT_ID] = {"full": "Без кафедры", "short": "-"}
+    analytics = HolidaysAnalytics(
+        years=range(year_start, year_end + 1),
+        production_calendar=production_calendar,
+        staff_history_index=all_staff.staff_history_index(),
+        department_ids=department_ids,
+    )
+    await collect_holidays_analytics(analytics, year_start, year_end)
+    years = analytics.years
+    period = f"{year_start}/{year_start + 1}-{year_end}/{year_end + 1}"
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Преподаватели"
+    staff_year_columns = {
+        "Всего занятий": 9,
+        "Занятий в выходные": 10,
+        "% от общего числа занятий": 10,
+        "Занято выходных": 10,
+    }
+    columns = {"Имя": 40, "Кафедра": 15}
+    if len(years) > 1:
+        columns["Изменение занятых выходных"] = 12
+    _write_header(
+        ws,
+        f"Сведения о занятости в выходные дни за {period} учебные годы",
+        columns,
+        years,
+        staff_year_columns,
+    )
+    formats = {
+        len(columns) + index * len(staff_year_columns) + 3: "0.00%"
+        for index in range(len(years))
+    }
+    row = 4
+    for (department_id, staff_id), counters in sorted(
+        analytics.counters.items(),
+        key=lambda item: (
+            departments[item[0][0]].get("short"),
+            -int(item[1][-1, BUSY_HOLIDAYS]),
+        ),
+    ):
+        staff = all_staff.state_staff.get(staff_id) or {}
+        values = [
+            staff.get("full", str(staff_id)),
+            departments[department_id].get("short"),
+        ]
+        if len(years) > 1:
+            values.append(int(counters[-1, BUSY_HOLIDAYS] - counters[0, BUSY_HOLIDAYS]))
+        for total, holidays, busy in counters.tolist():
+            values.extend([total, holidays, _share(holidays, total), busy])
+        _write_row(ws, row, values, formats)
+        row += 1
+
+    ws = wb.create_sheet("Кафедры")
+    department_year_columns = {
+        "Всего занятий": 9,
+        "Занятий в выходные": 10,
+        "% от общего числа занятий": 10,
+        "Преподавателей, занятых в выходные": 13,
+    }
+    _write_header(
+        ws,
+        f"Занятость кафедр в выходные дни за {period} учебные годы",
+        {"Кафедра": 40},
+        years,
+        department_year_columns,
+    )
+    formats = {
+        1 + index * len(department_year_columns) + 3: "0.00%"
+        for index in range(len(years))
+    }
+    row = 4
+    totals = analytics.department_totals()
+    for department_id in sorted(totals, key=lambda key: departments[key].get("full")):
+        total, busy_staff = totals[department_id]
+        values = [departments[department_id].get("full")]
+        for year_total, year_busy_staff in zip(total.tolist(), busy_staff.tolist()):
+            values.extend(
+                [
+                    year_total[TOTAL_LESSONS],
+                    year_total[HOLIDAYS_LESSONS],
+                    _share(year_total[HOLIDAYS_LESSONS], year_total[TOTAL_LESSONS]),
+                    year_busy_staff,
+                ]
+            )
+        _write_row(ws, row, values, formats)
+        row += 1
+
+    ws = wb.create_sheet("Выходные дни")
+    _write_header(
+        ws,
+        f"Выходные дни за {period} учебные годы",
+        {},
+        years,
+        {"Всего выходных": 12, "Выходных с занятиями": 12},
+    )
+    values = []
+    for year, busy_holidays in zip(years, analytics.busy_holidays):
+        year_months = academic_years_months(year, year)
+        values.extend(
+            [
+                len(
+                    production_calendar.non_working_days(
+                        year_months[0][0], year_months[-1][1]
+                    )
+                ),
+                len(busy_holidays),
+            ]
+        )
+    _write_row(ws, 4, values, {})
+
+    filename = f"holidays_analytics_{year_start}-{year_end}.xlsx"
+    wb.save(os.path.join(FlaskConfig.EXPORT_FILE_DIR, filename))
+    logging.debug(f"Сформирован файл - анализ занятости в выходные: {filename}")
+    return filename
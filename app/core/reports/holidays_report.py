@@ -1,4 +1,5 @@
 import os
+from calendar import monthrange
 from datetime import date
 
 from openpyxl.utils import get_column_letter
@@ -6,48 +7,24 @@ from openpyxl.workbook import Workbook
 
 from config import ApeksConfig as Apeks, FlaskConfig
 from ..classes.EducationStaff import EducationStaff
-from ..func.api_get import api_get_db_table, check_api_db_response, get_lessons
+from ..classes.ProductionCalendar import ProductionCalendar
+from ..func.api_get import api_get_db_table, check_api_db_response
 from ..func.organization import get_departments
 from ..func.staff import get_state_staff
 from ..reports.ExcelStyles import ExcelStyle
-from ..services.apeks_db_state_departments_service import get_db_apeks_state_departments_service
-
-
-def is_holiday(
-    check_date: date, working_sat: list[date], non_working: list[date]
-) -> bool:
-    return (
-        check_date.isoweekday() in [6, 7]
-        and check_date not in working_sat
-        or check_date in non_working
-    )
-
-
-async def generate_holidays_report(
-    year: int,
-    month_start: int,
-    month_end: int,
-    working_sat: list[date],
-    non_working: list[date],
-) -> str:
-    """Формирует отчет о занятости в выходные в формате xlsx."""
-
-    schedule_lessons_staff = await check_api_db_response(
-        await api_get_db_table(
-            Apeks.TABLES.get("schedule_day_schedule_lessons_staff"),
-        )
-    )
-
-    lessons_staff = {}
-
-    for lesson in schedule_lessons_staff:
-        lesson_id = lesson.get("lesson_id")
-        staff = lessons_staff.setdefault(lesson_id, [])
-        staff.append(lesson.get("staff_id"))
-
-    departments_service = get_db_apeks_state_departments_service()
-
-    all_staff = EducationStaff(
+from ..services.apeks_db_schedule_day_schedule_lessons_service import (
+    get_db_apeks_schedule_day_schedule_lessons_service,
+)
+from ..services.apeks_db_schedule_day_schedule_lessons_staff_service import (
+    get_db_apeks_schedule_day_schedule_lessons_staff_service,
+)
+
+
+async def get_all_education_staff(
+    year: int, month_start: int, month_end: int
+) -> EducationStaff:
+    """Возвращает сведения о преподавательском составе всех кафедр."""
+    return EducationStaff(
         year,
         month_start,
         month_end,
@@ -61,33 +38,84 @@ async def generate_holidays_report(
         departments=await get_departments(department_filter="kafedra"),
     )
 
-    schedule_lessons = await check_api_db_response(
-        await get_lessons(year, month_start, month_end)
+
+async def get_staff_lesson_dates(date_start: date, date_end: date) -> dict:
+    """
+    Возвращает даты занятий преподавателей за период.
+
+    Сначала запрашиваются занятия за период, затем сведения о преподавателях
+    только этих занятий (запрос по списку 'lesson_id' разделяется на части,
+    которые выполняются одновременно).
+
+    Parameters
+    ----------
+        date_start: date
+            начальная дата
+        date_end: date
+            конечная дата
+
+    Returns
+    -------
+        dict
+            {staff_id: [дата каждого занятия]}
+    """
+    lessons_service = get_db_apeks_schedule_day_schedule_lessons_service()
+    lessons_staff_service = get_db_apeks_schedule_day_schedule_lessons_staff_service()
+
+    # Для занятий хранятся только даты (одинаковые даты - один объект)
+    dates = {}
+    lesson_dates = {}
+    async for lesson in lessons_service.iter_lessons(date_start, date_end):
+        lesson_date = lesson.get("date")
+        if lesson_date not in dates:
+            dates[lesson_date] = date.fromisoformat(lesson_date)
+        lesson_dates[int(lesson.get("id"))] = dates[lesson_date]
+
+    staff_lesson_dates = {}
+    if lesson_dates:
+        for lesson_staff in await lessons_staff_service.get(
+            lesson_id=sorted(lesson_dates)
+        ):
+            lesson_date = lesson_dates.get(int(lesson_staff.get("lesson_id")))
+            if lesson_date is not None and lesson_staff.get("staff_id"):
+                staff_lesson_dates.setdefault(
+                    int(lesson_staff.get("staff_id")), []
+                ).append(lesson_date)
+    return staff_lesson_dates
+
+
+async def generate_holidays_report(
+    year: int,
+    month_start: int,
+    month_end: int,
+    production_calendar: ProductionCalendar,
+) -> str:
+    """Формирует отчет о занятости в выходные в формате xlsx."""
+
+    staff_lesson_dates = await get_staff_lesson_dates(
+        date(year, month_start, 1),
+        date(year, month_end, monthrange(year, month_end)[1]),
     )
 
+    all_staff = await get_all_education_staff(year, month_start, month_end)
+
     staff_busy_holidays = {}
     total_holidays = set()
 
-    for lesson in schedule_lessons:
-        lesson_date = date.fromisoformat(lesson.get("date"))
-        lesson_id = lesson.get("id")
-        lesson_staff = lessons_staff.get(lesson_id)
-        if lesson_staff:
-            for staff_id in lesson_staff:
-                staff_data = staff_busy_holidays.setdefault(
-                    int(staff_id),
-                    {
-                        "name": all_staff.state_staff.get(int(staff_id)).get("full"),
-                        "busy_holidays": set(),
-                        "total_lessons": 0,
-                        "holidays_lessons": 0,
-                    },
-                )
-                staff_data["total_lessons"] += 1
-                if is_holiday(lesson_date, working_sat, non_working):
-                    total_holidays.add(lesson_date)
-                    staff_data["holidays_lessons"] += 1
-                    staff_data["busy_holidays"].add(lesson_date)
+    for staff_id, lesson_dates in staff_lesson_dates.items():
+        staff_data = {
+            "name": all_staff.state_staff.get(staff_id).get("full"),
+            "total_lessons": len(lesson_dates),
+        }
+        holidays_mask = production_calendar.holidays_mask(lesson_dates)
+        staff_data["holidays_lessons"] = int(holidays_mask.sum())
+        staff_data["busy_holidays"] = {
+            lesson_date
+            for lesson_date, holiday in zip(lesson_dates, holidays_mask.tolist())
+            if holiday
+        }
+        total_holidays.update(staff_data["busy_holidays"])
+        staff_busy_holidays[staff_id] = staff_data
 
     wb = Workbook()
     ws = wb.active
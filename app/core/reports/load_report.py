@@ -1,22 +1,270 @@
 import logging
 import os
+from copy import copy
+from functools import cache
 
-from openpyxl import load_workbook
-from openpyxl.styles import Font
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.dimensions import ColumnDimension
 
 from config import FlaskConfig
 from .ExcelStyles import ExcelStyle
-from ...core.classes import LoadReportProcessor
+from ..classes.InstituteLoadReportProcessor import InstituteLoadReportProcessor
+from ..classes.LoadReportProcessor import LoadReportProcessor
+from ..classes.MonthlyLoadReport import MonthlyLoadReport
 
+# Строки шапки шаблона 'load_report_temp.xlsx'
+LOAD_REPORT_HEADER_ROWS = 7
+# Количество столбцов отчета (последний - сумма по строке)
+LOAD_REPORT_COLUMNS = 72
+# Первый столбец значений каждого типа занятий
+LOAD_REPORT_TYPE_COLUMNS = {
+    "lecture": 2,
+    "seminar": 8,
+    "pract": 14,
+    "group_cons": 24,
+    "zachet": 29,
+    "exam": 35,
+    "final_att": 59,
+}
 
-def generate_load_report(load: LoadReportProcessor) -> str:
+
+@cache
+def load_report_template() -> dict:
+    """
+    Считывает оформление отчета о нагрузке из шаблона
+    'load_report_temp.xlsx' (один раз за время работы приложения).
+    Оформление ячеек шапки преобразуется в именованные стили
+    'load_header_N' (по одному на каждый вариант оформления).
+
+    Returns
+    -------
+        dict
+            {'header': строки шапки [(значение, название стиля)],
+            'styles': именованные стили шапки, 'merged_cells': объединенные
+            ячейки, 'column_dimensions', 'row_dimensions', 'sheet': лист
+            шаблона (параметры печати и просмотра)}
+    """
+    wb = load_workbook(
+        os.path.join(FlaskConfig.TEMPLATE_FILE_DIR, "load_report_temp.xlsx")
+    )
+    ws = wb.active
+    styles = {}
+    header = []
+    for row in ws.iter_rows(
+        max_row=LOAD_REPORT_HEADER_ROWS, max_col=LOAD_REPORT_COLUMNS
+    ):
+        header_row = []
+        for cell in row:
+            key = (
+                copy(cell.font),
+                copy(cell.border),
+                copy(cell.fill),
+                copy(cell.alignment),
+                cell.number_format,
+            )
+            if key not in styles:
+                style = NamedStyle(name=f"load_header_{len(styles)}")
+                (
+                    style.font,
+                    style.border,
+                    style.fill,
+                    style.alignment,
+                    style.number_format,
+                ) = key
+                styles[key] = style
+            header_row.append((cell.value, styles[key].name))
+        header.append(header_row)
+    return {
+        "header": header,
+        "styles": list(styles.values()),
+        "merged_cells": [str(cell_range) for cell_range in ws.merged_cells.ranges],
+        "column_dimensions": [
+            (key, dim.min, dim.max, dim.width)
+            for key, dim in ws.column_dimensions.items()
+        ],
+        "row_dimensions": [
+            (row, dim.height)
+            for row, dim in ws.row_dimensions.items()
+            if row <= LOAD_REPORT_HEADER_ROWS
+        ],
+        "sheet": ws,
+    }
+
+
+class LoadReportWriter:
+    """
+    Потоковое формирование отчета о нагрузке в формате xlsx
+    (книга в режиме 'write_only', строки записываются по одной
+    с заранее зарегистрированными именованными стилями, оформление
+    шапки повторяет шаблон 'load_report_temp.xlsx').
+
+    Methods:
+    -------
+        add_sheet (title: str, header: str, subtitle: str,
+                   load_rows: list[tuple[str, dict]],
+                   name_header: str | None = None) -> None
+            добавляет лист отчета
+        save (filename: str) -> None
+            сохраняет книгу
+    """
+
+    def __init__(self) -> None:
+        self.template = load_report_template()
+        self.wb = Workbook(write_only=True)
+        for style in (
+            ExcelStyle.Base,
+            ExcelStyle.BaseBold,
+            ExcelStyle.Number,
+            ExcelStyle.NumberDecimal,
+            ExcelStyle.NumberBold,
+            *self.template["styles"],
+        ):
+            self.wb.add_named_style(style)
+        self.style_arrays = {}
+
+    def _setup_sheet(self, ws) -> None:
+        """Переносит размеры, объединения и параметры печати из шаблона."""
+        template = self.template["sheet"]
+        for key, min_col, max_col, width in self.template["column_dimensions"]:
+            ws.column_dimensions[key] = ColumnDimension(
+                ws, index=key, width=width, min=min_col, max=max_col
+            )
+        for row, height in self.template["row_dimensions"]:
+            ws.row_dimensions[row].height = height
+        for cell_range in self.template["merged_cells"]:
+            ws.merged_cells.add(cell_range)
+        ws.sheet_format = copy(template.sheet_format)
+        ws.sheet_properties.pageSetUpPr = copy(template.sheet_properties.pageSetUpPr)
+        ws.page_setup = copy(template.page_setup)
+        ws.page_margins = copy(template.page_margins)
+        ws.print_options = copy(template.print_options)
+        ws.sheet_view.zoomScale = template.sheet_view.zoomScale
+        ws.sheet_view.zoomScaleNormal = template.sheet_view.zoomScaleNormal
+
+    def _styled_cell(self, ws, value, style: str) -> WriteOnlyCell:
+        """
+        Ячейка с именованным стилем (оформление стиля определяется один
+        раз и копируется в ячейки, как в openpyxl при копировании листов).
+        """
+        cell = WriteOnlyCell(ws, value)
+        if style not in self.style_arrays:
+            cell.style = style
+            self.style_arrays[style] = cell._style
+        cell._style = copy(self.style_arrays[style])
+        return cell
+
+    @staticmethod
+    def _row_values(row_load: dict) -> list:
+        """Значения строки отчета (без первого и последнего столбцов)."""
+        values = [None] * (LOAD_REPORT_COLUMNS - 2)
+        for l_type, type_values in row_load.items():
+            column = LOAD_REPORT_TYPE_COLUMNS.get(l_type)
+            if column is None:
+                continue
+            if l_type == "group_cons":
+                # В отчете нет столбца ДПО для групповых консультаций
+                type_values = {k: v for k, v in type_values.items() if k != "dpo"}
+            for index, value in enumerate(type_values.values(), column - 2):
+                values[index] = value or None
+        return values
+
+    def add_sheet(
+        self,
+        title: str,
+        header: str,
+        subtitle: str,
+        load_rows: list[tuple[str, dict]],
+        name_header: str | None = None,
+    ) -> None:
+        """
+        Добавляет лист отчета о нагрузке.
+
+        Parameters
+        ----------
+            title: str
+                название листа
+            header: str
+                заголовок
+            subtitle: str
+                подзаголовок
+            load_rows: list[tuple[str, dict]]
+                нагрузка по строкам отчета [('название строки',
+                {l_type: {s_type: value}})] (названия могут повторяться,
+                например, у однофамильцев с одинаковыми инициалами)
+            name_header: str | None
+                заголовок первого столбца (по умолчанию - из шаблона)
+        """
+        ws = self.wb.create_sheet(title)
+        self._setup_sheet(ws)
+        header_values = {1: {1: header}, 2: {1: subtitle}}
+        if name_header is not None:
+            header_values[5] = {1: name_header}
+        for row_number, row in enumerate(self.template["header"], 1):
+            values = header_values.get(row_number, {})
+            ws.append(
+                [
+                    self._styled_cell(ws, values.get(column, value), style)
+                    for column, (value, style) in enumerate(row, 1)
+                ]
+            )
+
+        row = LOAD_REPORT_HEADER_ROWS + 1
+        for name, row_load in load_rows:
+            cells = [self._styled_cell(ws, name, ExcelStyle.Base.name)]
+            for value in self._row_values(row_load):
+                cells.append(
+                    self._styled_cell(
+                        ws,
+                        value,
+                        (
+                            ExcelStyle.NumberDecimal.name
+                            if value and value % 1 > 0
+                            else ExcelStyle.Number.name
+                        ),
+                    )
+                )
+            cells.append(
+                self._styled_cell(ws, f"=SUM(B{row}:BS{row})", ExcelStyle.Number.name)
+            )
+            ws.append(cells)
+            row += 1
+
+        # Total
+        cells = [self._styled_cell(ws, "Итого", ExcelStyle.BaseBold.name)]
+        for column in range(2, LOAD_REPORT_COLUMNS + 1):
+            ltr = get_column_letter(column)
+            cells.append(
+                self._styled_cell(
+                    ws,
+                    f'=IF(SUM({ltr}8:{ltr}{row - 1})>0,SUM({ltr}8:{ltr}{row - 1}),"")',
+                    ExcelStyle.NumberBold.name,
+                )
+            )
+        ws.append(cells)
+
+    def save(self, filename: str) -> None:
+        """
+        Сохраняет книгу в каталог экспорта.
+
+        Parameters
+        ----------
+            filename: str
+                название файла
+        """
+        self.wb.save(os.path.join(FlaskConfig.EXPORT_FILE_DIR, filename))
+
+
+def generate_load_report(load: LoadReportProcessor | MonthlyLoadReport) -> str:
     """
     Формирует отчет о нагрузке кафедры в формате xlsx.
 
     Parameters
     ----------
         load
-            экземпляр класса "LoadReportProcessor"
+            экземпляр класса "LoadReportProcessor" или "MonthlyLoadReport"
 
     Returns
     -------
@@ -24,69 +272,69 @@ def generate_load_report(load: LoadReportProcessor) -> str:
             название файла
     """
 
-    wb = load_workbook(
-        os.path.join(FlaskConfig.TEMPLATE_FILE_DIR, "load_report_temp.xlsx")
+    writer = LoadReportWriter()
+    department = load.departments.get(load.department_id)
+    writer.add_sheet(
+        f"{load.year}-{load.file_period} {department.get('short')}",
+        "Кафедра " + department.get("full"),
+        f"отчет о нагрузке за {load.file_period} {load.year}",
+        [
+            (load.staff_list[staff_id], staff_load)
+            for staff_id, staff_load in load.load_data.items()
+        ],
     )
-    ws = wb.active
-    ws.title = (
-        f"{load.year}-{load.file_period} "
-        f"{load.departments.get(load.department_id).get('short')}"
-    )
-    ws.cell(1, 1).value = "Кафедра " + load.departments.get(load.department_id).get(
-        "full"
+
+    filename = f"{department.get('short')} {load.file_period} {load.year}.xlsx"
+    writer.save(filename)
+    logging.debug(f"Сформирован файл - отчет о нагрузке: {filename}")
+    return filename
+
+
+def generate_institute_load_report(load: InstituteLoadReportProcessor) -> str:
+    """
+    Формирует отчет о нагрузке всех кафедр в формате xlsx: сводный лист
+    с нагрузкой кафедр и лист с нагрузкой преподавателей каждой кафедры.
+
+    Parameters
+    ----------
+        load
+            экземпляр класса "InstituteLoadReportProcessor"
+
+    Returns
+    -------
+        str
+            название файла
+    """
+
+    writer = LoadReportWriter()
+    subtitle = f"отчет о нагрузке за {load.file_period} {load.year}"
+    writer.add_sheet(
+        "Сводный",
+        "Учебная нагрузка кафедр",
+        subtitle,
+        [
+            (
+                load.departments.get(department_id).get("short"),
+                load.department_total(department_id),
+            )
+            for department_id in load.load_data
+        ],
+        name_header="Кафедра",
     )
-    ws.cell(2, 1).value = f"отчет о нагрузке за {load.file_period} {load.year}"
-    row = 8
-    for staff_id in load.load_data:
-        # Style apply
-        for i in range(2, 73):
-            ws.cell(row, i).style = ExcelStyle.Number
-        # Prepod Name
-        ws.cell(row, 1).value = load.staff_list[staff_id]
-        ws.cell(row, 1).style = ExcelStyle.Base
-        for l_type in load.load_data[staff_id]:
-            if l_type == "lecture":
-                column = 2
-            elif l_type == "seminar":
-                column = 8
-            elif l_type == "pract":
-                column = 14
-            elif l_type == "group_cons":
-                column = 24
-                if load.load_data[staff_id][l_type]["dpo"]:
-                    del load.load_data[staff_id][l_type]["dpo"]
-            elif l_type == "zachet":
-                column = 29
-            elif l_type == "exam":
-                column = 35
-            elif l_type == "final_att":
-                column = 59
-            else:
-                column = 73
-            for key, val in load.load_data[staff_id][l_type].items():
-                val = "" if val == 0 else val
-                ws.cell(row, column).value = val
-                if val and val % 1 > 0:
-                    ws.cell(row, column).number_format = "0.00"
-                column += 1
-        ws.cell(row, 72).value = f"=SUM(B{str(row)}:BS{str(row)})"
-        row += 1
-    # Total
-    ws.cell(row, 1).value = "Итого"
-    ws.cell(row, 1).style = ExcelStyle.BaseBold
-    for col in range(2, 73):
-        ltr = ws.cell(row, col).column_letter
-        ws.cell(row, col).value = (
-            f"=IF(SUM({ltr}8:{ltr}{str(row - 1)})>0,"
-            f'SUM({ltr}8:{ltr}{str(row - 1)}),"")'
+    for department_id, department_load in load.load_data.items():
+        department = load.departments.get(department_id)
+        # Название листа xlsx - не более 31 символа
+        writer.add_sheet(
+            department.get("short")[:31],
+            "Кафедра " + department.get("full"),
+            subtitle,
+            [
+                (load.departments_staff[department_id][staff_id], staff_load)
+                for staff_id, staff_load in department_load.items()
+            ],
         )
-        ws.cell(row, col).style = ExcelStyle.Number
-        ws.cell(row, col).font = Font(name="Times New Roman", size=10, bold=True)
 
-    filename = (
-        f"{load.departments.get(load.department_id).get('short')} "
-        f"{load.file_period} {load.year}.xlsx"
-    )
-    wb.save(os.path.join(FlaskConfig.EXPORT_FILE_DIR, filename))
-    logging.debug(f"Сформирован файл - отчет о нагрузке: {filename}")
+    filename = f"Кафедры {load.file_period} {load.year}.xlsx"
+    writer.save(filename)
+    logging.debug(f"Сформирован файл - отчет о нагрузке кафедр: {filename}")
     return filename
@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime, timedelta, tzinfo
+from typing import Iterable
 
 import pytz
 from icalendar import Alarm, Calendar, Event, Timezone, TimezoneStandard
@@ -8,30 +9,25 @@ from ...core.classes.ScheduleLessonsStaff import ScheduleLessonsStaff
 from config import ApeksConfig as Apeks, FlaskConfig
 
 
-def generate_schedule_ical(
-    schedule: ScheduleLessonsStaff, staff_name: str, timezone: tzinfo = Apeks.TIMEZONE
-) -> str:
+def schedule_ical_calendar(
+    schedules: Iterable[ScheduleLessonsStaff], timezone: tzinfo = Apeks.TIMEZONE
+) -> Calendar:
     """
-    Формирует файл для экспорта занятий преподавателя в формате iCal.
+    Формирует календарь iCal с занятиями преподавателя.
 
     Parameters
     ----------
-        schedule
-            экземпляр класса ScheduleLessonsStaff
-        staff_name:str
-            имя преподавателя
+        schedules
+            экземпляры класса ScheduleLessonsStaff (например, за несколько
+            месяцев)
         timezone
             устанавливается timezone для календаря
 
     Returns
     -------
-        string
-            строка с названием файла или 'no data' если список 'lessons_data' пуст
+        Calendar
+            календарь (без событий, если занятий нет)
     """
-
-    if not schedule.lessons_data:
-        return "no data"
-
     cal = Calendar()
     cal.add("calscale", "GREGORIAN")
     cal.add("version", "2.0")
@@ -45,6 +41,13 @@ def generate_schedule_ical(
     cal_timezone.add_component(tz_standard)
     cal.add_component(cal_timezone)
 
+    for schedule in schedules:
+        _add_schedule_events(cal, schedule)
+    return cal
+
+
+def _add_schedule_events(cal: Calendar, schedule: ScheduleLessonsStaff) -> None:
+    """Добавляет в календарь события занятий преподавателя."""
     for l_index in range(sum(1 for _ in schedule.lessons_data)):
         event = Event()
         event.add("dtstart", schedule.time_start(l_index).astimezone(pytz.utc))
@@ -86,6 +89,33 @@ def generate_schedule_ical(
         event.add_component(alarm)
         cal.add_component(event)
 
+
+def generate_schedule_ical(
+    schedule: ScheduleLessonsStaff, staff_name: str, timezone: tzinfo = Apeks.TIMEZONE
+) -> str:
+    """
+    Формирует файл для экспорта занятий преподавателя в формате iCal.
+
+    Parameters
+    ----------
+        schedule
+            экземпляр класса ScheduleLessonsStaff
+        staff_name:str
+            имя преподавателя
+        timezone
+            устанавливается timezone для календаря
+
+    Returns
+    -------
+        string
+            строка с названием файла или 'no data' если список 'lessons_data' пуст
+    """
+
+    if not schedule.lessons_data:
+        return "no data"
+
+    cal = schedule_ical_calendar([schedule], timezone)
+
     month_name = Apeks.MONTH_DICT.get(int(schedule.month))
     filename = f"{staff_name} - {month_name} {schedule.year}.ics"
 
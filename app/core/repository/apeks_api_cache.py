@@ -0,0 +1,192 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+
+from config import ApeksConfig
+
+
+class ApeksApiCache:
+    """
+    Кэш ответов API АпексВУЗ для редко изменяемых таблиц.
+
+    Время хранения записей задается отдельно для каждой таблицы, таблицы
+    без указанного времени не кэшируются. При превышении максимального
+    количества записей удаляются давно не использованные (LRU).
+
+    Attributes:
+    ----------
+    ttl : dict
+        время хранения записей по таблицам {table: seconds}
+    maxsize : int
+        максимальное количество записей в кэше
+    """
+
+    def __init__(
+        self,
+        ttl: dict[str, float] = ApeksConfig.CACHE_TABLES_TTL,
+        maxsize: int = ApeksConfig.CACHE_MAXSIZE,
+    ):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict[tuple, tuple[float, list]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(table: str, filters: dict) -> tuple:
+        """
+        Формирует ключ записи из названия таблицы и фильтров запроса.
+        Порядок фильтров и значений в списках не учитывается.
+        """
+        normalized = []
+        for db_filter, db_value in filters.items():
+            if isinstance(db_value, (int, str)):
+                values = str(db_value)
+            else:
+                values = tuple(sorted(str(val) for val in db_value))
+            normalized.append((db_filter, values))
+        return table, tuple(sorted(normalized))
+
+    def is_cached(self, table: str) -> bool:
+        """Проверяет, кэшируется ли таблица."""
+        return bool(self.ttl.get(table))
+
+    def get(self, table: str, filters: dict) -> list[dict[str, Any]] | None:
+        """
+        Возвращает копию сохраненных данных или None, если данных нет
+        или истекло время их хранения.
+        """
+        key = self.make_key(table, filters)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, data = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        # Копируем строки, так как потребители изменяют полученные словари
+        return [dict(row) if isinstance(row, dict) else row for row in data]
+
+    def set(self, table: str, filters: dict, data: list[dict[str, Any]]) -> None:
+        """Сохраняет данные таблицы, если таблица кэшируется."""
+        if not self.is_cached(table) or not isinstance(data, list):
+            return
+        key = self.make_key(table, filters)
+        stored = [dict(row) if isinstance(row, dict) else row for row in data]
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl[table], stored)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, table: str) -> None:
+        """Удаляет все сохраненные записи таблицы."""
+        if not self.is_cached(table):
+            return
+        with self._lock:
+            for key in [key for key in self._data if key[0] == table]:
+                del self._data[key]
+        logging.debug(f"Кэш таблицы '{table}' очищен")
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        with self._lock:
+            self._data.clear()
+
+
+class ApeksApiStaleCache:
+    """
+    Последние успешные ответы API АпексВУЗ на GET запросы к таблицам
+    'tables', выдаваемые при недоступности API вместе со временем
+    их получения.
+
+    Ответы хранятся в формате JSON (неизменяемые байтовые строки, данные
+    копируются только при выдаче). Общий размер ответов ограничен
+    'max_bytes', при превышении удаляются давно не использованные (LRU).
+
+    Attributes:
+    ----------
+    tables : frozenset
+        таблицы, ответы для которых сохраняются
+    max_bytes : int
+        максимальный общий размер сохраненных ответов (байт)
+    refresh_interval : float
+        интервал (секунды) фонового обновления выдаваемого ответа
+    size : int
+        текущий общий размер сохраненных ответов (байт)
+    """
+
+    def __init__(
+        self,
+        tables: frozenset[str] = ApeksConfig.STALE_TABLES,
+        max_bytes: int = ApeksConfig.STALE_MAX_BYTES,
+        refresh_interval: float = ApeksConfig.STALE_REFRESH_INTERVAL,
+    ):
+        self.tables = tables
+        self.max_bytes = max_bytes
+        self.refresh_interval = refresh_interval
+        self.size = 0
+        self._data: OrderedDict[tuple, tuple[datetime, bytes]] = OrderedDict()
+        self._refresh_at: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def is_stored(self, table: str | None) -> bool:
+        """Проверяет, сохраняются ли ответы для таблицы."""
+        return table in self.tables
+
+    def get(self, key: tuple) -> tuple[datetime, Any] | None:
+        """Возвращает время получения и копию ответа или None."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+        saved_at, content = entry
+        return saved_at, json.loads(content)
+
+    def set(self, key: tuple, table: str | None, data: Any) -> None:
+        """Сохраняет ответ, если таблица сохраняется и ответ не превышает 'max_bytes'."""
+        if not self.is_stored(table):
+            return
+        content = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous[1])
+            self._data[key] = (datetime.now(), content)
+            self.size += len(content)
+            while self.size > self.max_bytes:
+                evicted_key, (_, evicted) = self._data.popitem(last=False)
+                self._refresh_at.pop(evicted_key, None)
+                self.size -= len(evicted)
+
+    def claim_refresh(self, key: tuple) -> bool:
+        """
+        Проверяет, пора ли обновить выдаваемый ответ в фоне. Обновление
+        выполняется не чаще одного раза в 'refresh_interval' секунд
+        для каждого ответа, первое - через 'refresh_interval' секунд
+        после первой выдачи ответа.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._data:
+                return False
+            refresh_at = self._refresh_at.get(key)
+            if refresh_at is not None and now < refresh_at:
+                return False
+            self._refresh_at[key] = now + self.refresh_interval
+            return refresh_at is not None
+
+    def clear(self) -> None:
+        """Очищает сохраненные ответы."""
+        with self._lock:
+            self._data.clear()
+            self._refresh_at.clear()
+            self.size = 0
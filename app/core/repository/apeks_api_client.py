@@ -0,0 +1,344 @@
+import asyncio
+import atexit
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from importlib.util import find_spec
+from types import SimpleNamespace
+from typing import AsyncIterator
+
+import httpx
+from flask import Flask
+
+from config import ApeksConfig
+from .apeks_api_metrics import ApeksApiMetrics
+from .apeks_rate_limiter import ApeksRateLimiter
+
+
+class ApeksApiClient:
+    """
+    Долгоживущий пул HTTP соединений для запросов к API АпексВУЗ.
+
+    Flask выполняет каждую асинхронную view функцию в новом цикле событий,
+    а соединения httpx.AsyncClient привязаны к циклу, в котором они были
+    открыты. Поэтому клиент работает в отдельном потоке с собственным циклом
+    событий, а запросы из любых циклов передаются в него. Так соединения
+    (TCP/TLS) переиспользуются между всеми запросами рабочего процесса.
+
+    Attributes:
+    ----------
+    limits : httpx.Limits
+        ограничения пула соединений (всего, keep-alive, время жизни)
+    timeout : httpx.Timeout
+        таймаут запросов
+    retries : int
+        количество повторных попыток установки соединения
+    http2 : bool
+        использовать HTTP/2 (если установлен пакет 'h2' и его
+        поддерживает сервер)
+    max_concurrency : int
+        максимальное количество одновременно выполняемых запросов
+    in_flight : int
+        количество выполняемых в данный момент запросов
+    queued : int
+        количество запросов, ожидающих выполнения
+    metrics : ApeksApiMetrics | None
+        метрики запросов (учет повторных попыток установки соединения)
+    """
+
+    def __init__(
+        self,
+        max_connections: int = ApeksConfig.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = ApeksConfig.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = ApeksConfig.HTTP_KEEPALIVE_EXPIRY,
+        timeout: float = ApeksConfig.HTTP_TIMEOUT,
+        retries: int = ApeksConfig.HTTP_RETRIES,
+        http2: bool = ApeksConfig.HTTP2,
+        max_concurrency: int = ApeksConfig.HTTP_MAX_CONCURRENCY,
+        metrics: ApeksApiMetrics | None = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout)
+        self.retries = retries
+        self.http2 = http2 and find_spec("h2") is not None
+        if http2 and not self.http2:
+            logging.warning(
+                "Пакет 'h2' не установлен, запросы к API АпексВУЗ "
+                "будут выполняться по протоколу HTTP/1.1"
+            )
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.queued = 0
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+        self._semaphore: asyncio.Semaphore | None = None
+        self._limiters: dict[str, ApeksRateLimiter] = {}
+        self.metrics = metrics
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Регистрирует клиент в приложении Flask.
+
+        Пул открывается при первом запросе в рабочем процессе (после fork
+        gunicorn) и закрывается при завершении процесса.
+        """
+        app.extensions["apeks_api_client"] = self
+        atexit.register(self.close)
+
+    @property
+    def is_open(self) -> bool:
+        """Открыт ли пул соединений в текущем процессе."""
+        return self._client is not None and self._pid == os.getpid()
+
+    def open(self) -> None:
+        """Запускает цикл событий клиента и открывает пул соединений."""
+        with self._lock:
+            if self.is_open:
+                return
+            transport = httpx.AsyncHTTPTransport(
+                retries=self.retries,
+                limits=self.limits,
+                http2=self.http2,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._in_flight = {}
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name="apeks-api-client", daemon=True
+            )
+            self._thread.start()
+            self._client = httpx.AsyncClient(
+                transport=transport, timeout=self.timeout, http2=self.http2
+            )
+            self._pid = os.getpid()
+            logging.debug(
+                f"Открыт пул соединений к API АпексВУЗ: {self.limits}, "
+                f"http2={self.http2}"
+            )
+
+    def close(self) -> None:
+        """Закрывает пул соединений и останавливает цикл событий клиента."""
+        with self._lock:
+            if not self.is_open:
+                return
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._client = self._loop = self._thread = self._pid = None
+            logging.debug("Пул соединений к API АпексВУЗ закрыт")
+
+    def _submit(self, method: str, url: str, **kwargs) -> Future:
+        """Передает запрос в цикл событий клиента."""
+        if not self.is_open:
+            self.open()
+        return asyncio.run_coroutine_threadsafe(
+            self._send(method, url, **kwargs), self._loop
+        )
+
+    @staticmethod
+    def request_key(method: str, url: str, params: dict | None) -> tuple:
+        """
+        Формирует ключ запроса из метода, адреса и параметров запроса.
+        Порядок параметров и значений в списках фильтров не учитывается.
+        """
+        normalized = []
+        for param, value in (params or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                value = tuple(sorted(str(val) for val in value))
+            else:
+                value = str(value)
+            normalized.append((param, value))
+        return method, str(url), tuple(sorted(normalized))
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Выполняет запрос в цикле событий клиента.
+
+        Одинаковые GET запросы, выполняемые одновременно, объединяются:
+        к API отправляется один запрос, ответ которого получают все
+        ожидающие его вызовы.
+        """
+        if method != "GET" or "data" in kwargs:
+            return await self._limited_request(method, url, **kwargs)
+        key = self.request_key(method, url, kwargs.get("params"))
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._limited_request(method, url, **kwargs))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            logging.debug(f"Запрос к API АпексВУЗ объединен с выполняемым: {url}")
+        # Отмена одного из ожидающих вызовов не должна прерывать общий запрос
+        return await asyncio.shield(task)
+
+    @asynccontextmanager
+    async def _request_slot(self, url: str) -> AsyncIterator[SimpleNamespace]:
+        """
+        Ожидает возможности выполнить запрос с учетом ограничения количества
+        одновременных запросов и частоты запросов к точке доступа.
+        Код ответа сохраняется в поле 'status_code' полученного объекта.
+        """
+        limiter = self._limiters.setdefault(httpx.URL(url).path, ApeksRateLimiter())
+        self.queued += 1
+        try:
+            await limiter.acquire()
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+        started = time.monotonic()
+        slot = SimpleNamespace(status_code=None)
+        try:
+            yield slot
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+            limiter.feedback(time.monotonic() - started, slot.status_code)
+
+    def _trace_retries(self, url: str, kwargs: dict) -> None:
+        """
+        Добавляет в параметры запроса обработчик событий httpcore для учета
+        повторных попыток установки соединения в метриках.
+        """
+        if self.metrics is None:
+            return
+        endpoint = httpx.URL(url).path
+        table = (kwargs.get("params") or {}).get("table") or ""
+
+        async def trace(event: str, info: dict) -> None:
+            if event == "connection.retry.started":
+                self.metrics.observe_retry(endpoint, table)
+
+        kwargs["extensions"] = {**kwargs.get("extensions", {}), "trace": trace}
+
+    async def _limited_request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Выполняет запрос с учетом ограничений нагрузки на API."""
+        self._trace_retries(url, kwargs)
+        async with self._request_slot(url) as slot:
+            response = await self._client.request(method, url, **kwargs)
+            slot.status_code = response.status_code
+            return response
+
+    async def _stream_to_queue(
+        self,
+        queue: asyncio.Queue,
+        queue_loop: asyncio.AbstractEventLoop,
+        method: str,
+        url: str,
+        **kwargs,
+    ) -> None:
+        """
+        Передает тело ответа по частям в очередь цикла событий получателя.
+        Ожидание места в очереди ограничивает объем данных в памяти.
+        В конце в очередь передается None или возникшее исключение.
+        """
+
+        async def put(item) -> None:
+            await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(queue.put(item), queue_loop)
+            )
+
+        self._trace_retries(url, kwargs)
+        try:
+            async with self._request_slot(url) as slot:
+                async with self._client.stream(method, url, **kwargs) as response:
+                    slot.status_code = response.status_code
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes():
+                        await put(chunk)
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            await put(error)
+        else:
+            await put(None)
+
+    def get_load(self) -> dict:
+        """
+        Возвращает текущую загрузку клиента: количество выполняемых
+        и ожидающих запросов, текущую частоту запросов по точкам доступа.
+        """
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "rates": {
+                endpoint: limiter.rate for endpoint, limiter in self._limiters.items()
+            },
+        }
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Выполняет HTTP запрос через общий пул соединений.
+
+        Parameters
+        ----------
+            method: str
+                HTTP метод
+            url: str
+                адрес запроса
+            **kwargs
+                параметры httpx.AsyncClient.request (params, data и т.д.)
+        """
+        return await asyncio.wrap_future(self._submit(method, url, **kwargs))
+
+    def request_nowait(self, method: str, url: str, **kwargs) -> Future:
+        """
+        Передает HTTP запрос в общий пул соединений без ожидания ответа
+        (например, для фонового обновления данных).
+        """
+        return self._submit(method, url, **kwargs)
+
+    def request_sync(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Выполняет HTTP запрос через общий пул соединений из синхронного кода."""
+        return self._submit(method, url, **kwargs).result()
+
+    async def stream(
+        self, method: str, url: str, queue_size: int = 16, **kwargs
+    ) -> AsyncIterator[bytes]:
+        """
+        Выполняет HTTP запрос через общий пул соединений и возвращает тело
+        ответа по частям по мере получения.
+
+        Parameters
+        ----------
+            method: str
+                HTTP метод
+            url: str
+                адрес запроса
+            queue_size: int
+                количество полученных, но не обработанных частей ответа,
+                при достижении которого чтение ответа приостанавливается
+            **kwargs
+                параметры httpx.AsyncClient.stream (params, data и т.д.)
+        """
+        if not self.is_open:
+            self.open()
+        queue = asyncio.Queue(maxsize=queue_size)
+        producer = asyncio.run_coroutine_threadsafe(
+            self._stream_to_queue(
+                queue, asyncio.get_running_loop(), method, url, **kwargs
+            ),
+            self._loop,
+        )
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            producer.cancel()
@@ -0,0 +1,158 @@
+import threading
+from bisect import bisect_left
+
+from config import ApeksConfig
+
+
+class ApeksApiMetrics:
+    """
+    Метрики запросов к API АпексВУЗ в разрезе точек доступа и таблиц:
+    время выполнения (гистограмма), размер ответов, количество полученных
+    записей, повторных попыток соединения и результатов запросов.
+
+    Метрики хранятся в памяти рабочего процесса и выводятся в текстовом
+    формате Prometheus.
+
+    Attributes:
+    ----------
+    buckets : tuple
+        границы интервалов гистограммы времени выполнения (секунды)
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = ApeksConfig.METRICS_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._latency: dict[tuple, list] = {}
+        self._requests: dict[tuple, int] = {}
+        self._bytes: dict[tuple, int] = {}
+        self._rows: dict[tuple, int] = {}
+        self._retries: dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def observe_request(
+        self,
+        method: str,
+        endpoint: str,
+        table: str,
+        status: str,
+        latency: float,
+        size: int = 0,
+        rows: int = 0,
+    ) -> None:
+        """
+        Учитывает выполненный запрос.
+
+        Parameters
+        ----------
+            method: str
+                HTTP метод
+            endpoint: str
+                точка доступа (путь адреса запроса)
+            table: str
+                таблица базы данных АпексВУЗ (пустая строка - если нет)
+            status: str
+                результат запроса: 'ok', 'error' (ошибка ответа API),
+                'unavailable' (API недоступен), 'rejected' (запрос отклонен
+                автоматическим выключателем)
+            latency: float
+                время выполнения запроса (секунды)
+            size: int
+                размер ответа (байты)
+            rows: int
+                количество полученных записей
+        """
+        labels = (method, endpoint, table)
+        with self._lock:
+            key = (*labels, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if status == "rejected":
+                return
+            histogram = self._latency.setdefault(
+                labels, [[0] * len(self.buckets), 0.0, 0]
+            )
+            index = bisect_left(self.buckets, latency)
+            if index < len(self.buckets):
+                histogram[0][index] += 1
+            histogram[1] += latency
+            histogram[2] += 1
+            self._bytes[labels] = self._bytes.get(labels, 0) + size
+            self._rows[labels] = self._rows.get(labels, 0) + rows
+
+    def observe_retry(self, endpoint: str, table: str) -> None:
+        """Учитывает повторную попытку установки соединения."""
+        with self._lock:
+            key = (endpoint, table)
+            self._retries[key] = self._retries.get(key, 0) + 1
+
+    @staticmethod
+    def _labels(names: tuple[str, ...], values: tuple) -> str:
+        pairs = []
+        for name, value in zip(names, values):
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            pairs.append(f'{name}="{value}"')
+        return "{" + ",".join(pairs) + "}"
+
+    def render(self, gauges: dict[str, tuple[str, dict[tuple, float]]] = None) -> str:
+        """
+        Возвращает метрики в текстовом формате Prometheus.
+
+        Parameters
+        ----------
+            gauges: dict
+                дополнительные показатели {название: (описание,
+                {((метка, значение), ...): значение})}
+        """
+        names = ("method", "endpoint", "table")
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP apeks_api_requests_total Количество запросов к API АпексВУЗ",
+                "# TYPE apeks_api_requests_total counter",
+            ]
+            for key, value in sorted(self._requests.items()):
+                labels = self._labels((*names, "status"), key)
+                lines.append(f"apeks_api_requests_total{labels} {value}")
+            lines += [
+                "# HELP apeks_api_request_duration_seconds Время выполнения запросов",
+                "# TYPE apeks_api_request_duration_seconds histogram",
+            ]
+            for key, (counts, total, count) in sorted(self._latency.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = self._labels((*names, "le"), (*key, bound))
+                    lines.append(
+                        f"apeks_api_request_duration_seconds_bucket{labels} "
+                        f"{cumulative}"
+                    )
+                labels = self._labels((*names, "le"), (*key, "+Inf"))
+                lines.append(
+                    f"apeks_api_request_duration_seconds_bucket{labels} {count}"
+                )
+                labels = self._labels(names, key)
+                lines.append(f"apeks_api_request_duration_seconds_sum{labels} {total}")
+                lines.append(
+                    f"apeks_api_request_duration_seconds_count{labels} {count}"
+                )
+            for metric, description, values in (
+                ("apeks_api_response_bytes_total", "Размер ответов", self._bytes),
+                ("apeks_api_rows_total", "Количество полученных записей", self._rows),
+            ):
+                lines += [
+                    f"# HELP {metric} {description}",
+                    f"# TYPE {metric} counter",
+                ]
+                for key, value in sorted(values.items()):
+                    lines.append(f"{metric}{self._labels(names, key)} {value}")
+            lines += [
+                "# HELP apeks_api_retries_total Повторные попытки установки соединения",
+                "# TYPE apeks_api_retries_total counter",
+            ]
+            for key, value in sorted(self._retries.items()):
+                labels = self._labels(("endpoint", "table"), key)
+                lines.append(f"apeks_api_retries_total{labels} {value}")
+        for metric, (description, values) in (gauges or {}).items():
+            lines += [f"# HELP {metric} {description}", f"# TYPE {metric} gauge"]
+            for label_pairs, value in values.items():
+                labels = self._labels(*zip(*label_pairs)) if label_pairs else ""
+                lines.append(f"{metric}{labels} {value}")
+        return "\n".join(lines) + "\n"
@@ -1,15 +1,29 @@
 import functools
 import logging
+import time
+from concurrent.futures import Future
+from datetime import datetime
 from enum import Enum
 from json import JSONDecodeError
+from typing import AsyncIterator
 
 import httpx
+from flask import g, has_app_context
 
 from config import ApeksConfig
 from .abstract_repository import AbstractApiRepository
-from ..exceptions import ApeksApiException
-
-transport = httpx.AsyncHTTPTransport(retries=3)
+from .apeks_api_cache import ApeksApiStaleCache
+from .apeks_api_client import ApeksApiClient
+from .apeks_api_metrics import ApeksApiMetrics
+from .apeks_circuit_breaker import ApeksCircuitBreaker
+from .apeks_json_stream import ApeksJsonStreamParser
+from ..exceptions import ApeksApiException, ApeksApiUnavailableException
+from ..extensions import (
+    apeks_api_client,
+    apeks_api_metrics,
+    apeks_api_stale_cache,
+    apeks_circuit_breaker,
+)
 
 
 class ApeksApiEndpoints(str, Enum):
@@ -23,8 +37,93 @@ class ApeksApiEndpoints(str, Enum):
     DB_DEL_ENDPOINT = ApeksConfig.DB_DEL_ENDPOINT
 
 
+def mark_stale_data(saved_at: datetime) -> None:
+    """
+    Сохраняет в контексте приложения Flask время получения самых старых
+    из выданных сохраненных данных (для отображения на странице).
+    """
+    if has_app_context():
+        data_as_of = g.get("apeks_data_as_of")
+        g.apeks_data_as_of = min(data_as_of, saved_at) if data_as_of else saved_at
+
+
 class ApeksApiRepository(AbstractApiRepository):
-    """Класс для запросов к API АпексВУЗ."""
+    """
+    Класс для запросов к API АпексВУЗ.
+
+    При недоступности API (ошибки соединения, таймауты, ответы 5xx)
+    запросы отклоняются автоматическим выключателем без ожидания,
+    а GET запросы получают последний сохраненный ответ (если он есть)
+    с отметкой о времени его получения. Сохраненный ответ обновляется
+    в фоне пробным запросом.
+
+    Attributes:
+    ----------
+    client : ApeksApiClient
+        общий пул HTTP соединений к API АпексВУЗ
+    breaker : ApeksCircuitBreaker
+        автоматический выключатель запросов
+    stale_cache : ApeksApiStaleCache
+        последние успешные ответы на GET запросы
+    metrics : ApeksApiMetrics
+        метрики запросов к API АпексВУЗ
+    """
+
+    def __init__(
+        self,
+        client: ApeksApiClient = apeks_api_client,
+        breaker: ApeksCircuitBreaker = apeks_circuit_breaker,
+        stale_cache: ApeksApiStaleCache = apeks_api_stale_cache,
+        metrics: ApeksApiMetrics = apeks_api_metrics,
+    ):
+        self.client = client
+        self.breaker = breaker
+        self.stale_cache = stale_cache
+        self.metrics = metrics
+
+    @staticmethod
+    def _metrics_labels(
+        method_name: str,
+        endpoint: ApeksApiEndpoints,
+        params: dict = None,
+        data: dict = None,
+    ) -> tuple[str, str, str]:
+        """Возвращает метки метрик запроса: HTTP метод, точку доступа, таблицу."""
+        table = (params or {}).get("table") or (data or {}).get("table") or ""
+        return method_name.strip("_").upper(), httpx.URL(endpoint).path, table
+
+    def check_response(self, response: httpx.Response, params: dict, message: str):
+        """
+        Проверяет ответ API, учитывает его в автоматическом выключателе
+        и возвращает данные ответа ('data').
+        """
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        response.raise_for_status()
+        if "Forbidden (#403)" in response.text:
+            message += f"Ошибка авторизации API АпексВУЗ"
+            logging.error(message)
+            raise ApeksApiException(message)
+        response = response.json()
+        if "token" in params:
+            del params["token"]
+        if "status" not in response:
+            message += (
+                f"Отсутствует статус ответа API: '{response}'. Параметры: {params}"
+            )
+            logging.error(message)
+            raise ApeksApiException(message)
+        elif response["status"] != 1:
+            message += f"Неверный статус ответа API: '{response}'. Параметры: {params}"
+            logging.error(message)
+            raise ApeksApiException(message)
+        elif "data" not in response:
+            message = "В ответе API Апекс-ВУЗ отсутствуют данные ('data')"
+            logging.error(message)
+            raise ApeksApiException(message)
+        return response.get("data")
 
     @staticmethod
     def request_handler(method):
@@ -34,63 +133,182 @@ class ApeksApiRepository(AbstractApiRepository):
         async def wrapper(*args, **kwargs) -> dict:
             self, *_ = args
             message = f"{self.__class__.__name__}.{method.__name__} - "
+            labels = self._metrics_labels(method.__name__, *args[1:], **kwargs)
+            started = time.monotonic()
+            if not self.breaker.allow_request():
+                message += "API Апекс-ВУЗ недоступен, запрос отклонен"
+                logging.warning(message)
+                self.metrics.observe_request(*labels, "rejected", 0)
+                raise ApeksApiUnavailableException(message)
+            response = None
+            status = "error"
             try:
                 response = await method(*args, **kwargs)
-                response.raise_for_status()
-                if "Forbidden (#403)" in response.text:
-                    message += f"Ошибка авторизации API АпексВУЗ"
-                    logging.error(message)
-                    raise ApeksApiException(message)
-                response = response.json()
-                params = kwargs.get("params", {})
-                if "token" in params:
-                    del params["token"]
-                if "status" not in response:
-                    message += (
-                        f"Отсутствует статус ответа API: '{response}'. "
-                        f"Параметры: {params}"
-                    )
-                    logging.error(message)
-                    raise ApeksApiException(message)
-                elif response["status"] != 1:
-                    message += (
-                        f"Неверный статус ответа API: '{response}'. "
-                        f"Параметры: {params}"
-                    )
-                    logging.error(message)
-                    raise ApeksApiException(message)
-                elif "data" not in response:
-                    message = "В ответе API Апекс-ВУЗ отсутствуют данные ('data')"
-                    logging.error(message)
-                    raise ApeksApiException(message)
-                return response.get("data")
+                data = self.check_response(
+                    response, kwargs.get("params", {}), message
+                )
+                status = "ok"
+                return data
             except httpx.HTTPError as error:
+                if not isinstance(error, httpx.HTTPStatusError):
+                    self.breaker.record_failure()
                 message += (
                     f"Произошла ошибка при запросе к API Апекс-ВУЗ: "
                     f"{error.__class__.__name__} - '{error}'"
                 )
                 logging.error(message + f" {error.request.url!r}")
+                if response is None or response.status_code >= 500:
+                    status = "unavailable"
+                    raise ApeksApiUnavailableException(message)
                 raise ApeksApiException(message)
             except JSONDecodeError as error:
                 message += f"Ошибка конвертации ответа API Апекс-ВУЗ в JSON: '{error}'"
                 logging.error(message)
                 raise ApeksApiException(message)
+            finally:
+                self.metrics.observe_request(
+                    *labels,
+                    status,
+                    time.monotonic() - started,
+                    size=len(response.content) if response is not None else 0,
+                    rows=len(data) if status == "ok" and isinstance(data, list) else 0,
+                )
 
         return wrapper
 
-    @request_handler
     async def get(self, endpoint: ApeksApiEndpoints, params: dict):
-        async with httpx.AsyncClient(transport=transport) as client:
-            response = await client.get(endpoint, params=params)
-        return response
+        """
+        Выполняет GET запрос. При недоступности API возвращает последний
+        сохраненный ответ на такой же запрос, если он есть.
+        """
+        key = self.client.request_key("GET", endpoint, params)
+        try:
+            data = await self._get(endpoint, params)
+        except ApeksApiUnavailableException:
+            stale = self.stale_cache.get(key)
+            if stale is None:
+                raise
+            saved_at, data = stale
+            mark_stale_data(saved_at)
+            logging.warning(
+                "API Апекс-ВУЗ недоступен, выданы сохраненные данные "
+                f"по состоянию на {saved_at.isoformat(timespec='seconds')}"
+            )
+            self._refresh_stale(key, endpoint, params)
+            return data
+        self.stale_cache.set(key, params.get("table"), data)
+        return data
+
+    @request_handler
+    async def _get(self, endpoint: ApeksApiEndpoints, params: dict):
+        return await self.client.request("GET", endpoint, params=params)
+
+    def _refresh_stale(
+        self, key: tuple, endpoint: ApeksApiEndpoints, params: dict
+    ) -> None:
+        """
+        Обновляет выдаваемый сохраненный ответ в фоне не чаще одного раза
+        в 'stale_cache.refresh_interval' секунд, независимо от пробных
+        запросов автоматического выключателя. Неудачное обновление
+        не учитывается выключателем, чтобы не откладывать пробный запрос.
+        """
+        if not self.stale_cache.claim_refresh(key):
+            return
+        message = f"{self.__class__.__name__}._refresh_stale - "
+
+        def store_response(future: Future) -> None:
+            try:
+                response = future.result()
+                if response.status_code >= 500:
+                    response.raise_for_status()
+                data = self.check_response(response, dict(params), message)
+            except Exception as error:
+                logging.debug(message + f"данные не обновлены: {error}")
+            else:
+                self.stale_cache.set(key, params.get("table"), data)
+                logging.debug(message + "сохраненные данные обновлены")
+
+        self.client.request_nowait("GET", endpoint, params=params).add_done_callback(
+            store_response
+        )
 
     @request_handler
     async def post(
         self, endpoint: ApeksApiEndpoints, params: dict, data: dict
     ) -> httpx.Response:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(endpoint, params=params, data=data)
-        return response
+        return await self.client.request("POST", endpoint, params=params, data=data)
+
+    async def stream(
+        self, endpoint: ApeksApiEndpoints, params: dict
+    ) -> AsyncIterator[dict]:
+        """
+        Выполняет GET запрос и возвращает элементы списка 'data' по мере
+        получения и разбора ответа, не загружая весь ответ в память.
+        """
+        message = f"{self.__class__.__name__}.stream - "
+        log_params = {key: val for key, val in params.items() if key != "token"}
+        parser = ApeksJsonStreamParser()
+        labels = self._metrics_labels("GET", endpoint, params)
+        started = time.monotonic()
+        if not self.breaker.allow_request():
+            message += "API Апекс-ВУЗ недоступен, запрос отклонен"
+            logging.warning(message)
+            self.metrics.observe_request(*labels, "rejected", 0)
+            raise ApeksApiUnavailableException(message)
+        size = 0
+        status = "error"
+        try:
+            async for chunk in self.client.stream("GET", endpoint, params=params):
+                size += len(chunk)
+                for row in parser.feed(chunk):
+                    yield row
+                if parser.fields.get("status", 1) != 1:
+                    break
+            else:
+                for row in parser.feed(b"", final=True):
+                    yield row
+        except httpx.HTTPError as error:
+            message += (
+                f"Произошла ошибка при запросе к API Апекс-ВУЗ: "
+                f"{error.__class__.__name__} - '{error}'"
+            )
+            logging.error(message + f" {error.request.url!r}")
+            if (
+                isinstance(error, httpx.HTTPStatusError)
+                and error.response.status_code < 500
+            ):
+                self.breaker.record_success()
+                raise ApeksApiException(message)
+            self.breaker.record_failure()
+            status = "unavailable"
+            raise ApeksApiUnavailableException(message)
+        except JSONDecodeError as error:
+            message += f"Ошибка конвертации ответа API Апекс-ВУЗ в JSON: '{error}'"
+            logging.error(message)
+            raise ApeksApiException(message)
+        else:
+            self.breaker.record_success()
+            if parser.fields.get("status") == 1:
+                status = "ok"
+        finally:
+            self.metrics.observe_request(
+                *labels,
+                status,
+                time.monotonic() - started,
+                size=size,
+                rows=parser.rows_count,
+            )
+        if status != "ok":
+            message += (
+                f"Неверный статус ответа API: '{parser.fields}'. "
+                f"Параметры: {log_params}"
+            )
+            logging.error(message)
+            raise ApeksApiException(message)
+        logging.debug(
+            f"Выполнен потоковый GET запрос: {log_params}. "
+            f"Получено записей - {parser.rows_count}"
+        )
 
     async def put(self, endpoint: ApeksApiEndpoints, params: dict, data: dict):
         raise ApeksApiException("API АпексВУЗ не поддерживает метод PUT")
@@ -100,6 +318,4 @@ class ApeksApiRepository(AbstractApiRepository):
 
     @request_handler
     async def delete(self, endpoint: ApeksApiEndpoints, params: dict) -> httpx.Response:
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(endpoint, params=params)
-        return response
+        return await self.client.request("DELETE", endpoint, params=params)
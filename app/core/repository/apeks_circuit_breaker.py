@@ -0,0 +1,90 @@
+import logging
+import threading
+import time
+from enum import Enum
+
+from config import ApeksConfig
+
+
+class CircuitState(str, Enum):
+    """Состояния автоматического выключателя."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class ApeksCircuitBreaker:
+    """
+    Автоматический выключатель (circuit breaker) запросов к API АпексВУЗ.
+
+    После 'failure_threshold' ошибок подряд (недоступность сервера, таймаут,
+    ответ 5xx) выключатель размыкается, и запросы отклоняются сразу,
+    без ожидания таймаутов и повторных попыток. Через 'reset_timeout'
+    секунд разрешается один пробный запрос: при его успехе выключатель
+    замыкается, при ошибке - снова размыкается.
+
+    Attributes:
+    ----------
+    failure_threshold : int
+        количество ошибок подряд, после которого выключатель размыкается
+    reset_timeout : float
+        время (секунды) до пробного запроса после размыкания
+    state : CircuitState
+        текущее состояние выключателя
+    failures : int
+        количество ошибок подряд
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = ApeksConfig.CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = ApeksConfig.CIRCUIT_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Проверяет, можно ли выполнить запрос. В разомкнутом состоянии после
+        истечения 'reset_timeout' разрешает один пробный запрос.
+        """
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            # Повторный пробный запрос разрешается, если предыдущий
+            # не завершился за 'reset_timeout' секунд
+            now = time.monotonic()
+            if now - self._opened_at >= self.reset_timeout:
+                self.state = CircuitState.HALF_OPEN
+                self._opened_at = now
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Учитывает успешный запрос."""
+        with self._lock:
+            if self.state != CircuitState.CLOSED:
+                logging.info("Доступ к API АпексВУЗ восстановлен")
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Учитывает ошибку запроса."""
+        with self._lock:
+            self.failures += 1
+            if (
+                self.state == CircuitState.HALF_OPEN
+                or self.failures >= self.failure_threshold
+            ):
+                if self.state != CircuitState.OPEN:
+                    logging.error(
+                        "API АпексВУЗ недоступен, запросы приостановлены на "
+                        f"{self.reset_timeout} сек. (ошибок подряд: {self.failures})"
+                    )
+                self.state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
@@ -0,0 +1,162 @@
+import codecs
+import json
+from json import JSONDecodeError
+from typing import Any
+
+
+class ApeksJsonStreamParser:
+    """
+    Инкрементальный разбор ответа API АпексВУЗ вида
+    {"status": 1, "data": [{...}, {...}]}.
+
+    Части ответа передаются в метод 'feed' по мере получения, который
+    возвращает полностью полученные элементы списка 'data'. В памяти
+    хранится только необработанный остаток ответа. Остальные поля верхнего
+    уровня ('status', 'message' и т.д.) сохраняются в атрибуте 'fields'.
+
+    Attributes:
+    ----------
+    fields : dict
+        поля ответа верхнего уровня, кроме списка 'data'
+    rows_count : int
+        количество разобранных элементов списка 'data'
+    """
+
+    def __init__(self, data_key: str = "data"):
+        self.data_key = data_key
+        self.fields: dict[str, Any] = {}
+        self.rows_count = 0
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._key = None
+        self._final = False
+
+    @property
+    def finished(self) -> bool:
+        """Разобран ли ответ полностью."""
+        return self._state == "end"
+
+    def feed(self, chunk: bytes, final: bool = False) -> list[dict[str, Any]]:
+        """
+        Добавляет часть ответа и возвращает новые элементы списка 'data'.
+
+        Parameters
+        ----------
+            chunk: bytes
+                очередная часть ответа
+            final: bool
+                True - если это последняя часть ответа
+
+        Raises
+        ------
+            JSONDecodeError
+                если ответ не является корректным JSON
+        """
+        self._buffer = self._buffer[self._pos :] + self._text_decoder.decode(
+            chunk, final
+        )
+        self._pos = 0
+        self._final = final
+        rows = []
+        while self._step(rows):
+            pass
+        if final and not self.finished:
+            raise JSONDecodeError("Неожиданный конец ответа", self._buffer, self._pos)
+        return rows
+
+    def _skip_whitespace(self) -> str | None:
+        while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+            self._pos += 1
+        return self._buffer[self._pos] if self._pos < len(self._buffer) else None
+
+    def _decode_value(self) -> tuple[bool, Any]:
+        """
+        Пытается разобрать значение с текущей позиции. Значение считается
+        полученным, если за ним в буфере есть символы (иначе число в конце
+        буфера может оказаться неполным) или ответ получен полностью.
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except JSONDecodeError:
+            if self._final:
+                raise
+            return False, None
+        if end >= len(self._buffer) and not self._final:
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _unexpected(self, char: str) -> JSONDecodeError:
+        return JSONDecodeError(f"Неожиданный символ '{char}'", self._buffer, self._pos)
+
+    def _step(self, rows: list) -> bool:
+        """Выполняет один шаг разбора. Возвращает False, если нужны данные."""
+        char = self._skip_whitespace()
+        if char is None or self._state == "end":
+            return False
+        if self._state == "start":
+            if char != "{":
+                raise self._unexpected(char)
+            self._pos += 1
+            self._state = "key"
+        elif self._state == "key":
+            if char == "}":
+                self._pos += 1
+                self._state = "end"
+                return True
+            if char != '"':
+                raise self._unexpected(char)
+            decoded, self._key = self._decode_value()
+            if not decoded:
+                return False
+            self._state = "colon"
+        elif self._state == "colon":
+            if char != ":":
+                raise self._unexpected(char)
+            self._pos += 1
+            self._state = "data" if self._key == self.data_key else "value"
+        elif self._state == "value":
+            decoded, value = self._decode_value()
+            if not decoded:
+                return False
+            self.fields[self._key] = value
+            self._state = "after_value"
+        elif self._state == "data":
+            if char == "[":
+                self._pos += 1
+                self._state = "first_row"
+            else:
+                self._state = "value"
+        elif self._state == "first_row":
+            if char == "]":
+                self._pos += 1
+                self._state = "after_value"
+            else:
+                self._state = "row"
+        elif self._state == "row":
+            decoded, row = self._decode_value()
+            if not decoded:
+                return False
+            rows.append(row)
+            self.rows_count += 1
+            self._state = "after_row"
+        elif self._state == "after_row":
+            if char == ",":
+                self._state = "row"
+            elif char == "]":
+                self._state = "after_value"
+            else:
+                raise self._unexpected(char)
+            self._pos += 1
+        elif self._state == "after_value":
+            if char == ",":
+                self._state = "key"
+            elif char == "}":
+                self._state = "end"
+            else:
+                raise self._unexpected(char)
+            self._pos += 1
+        return True
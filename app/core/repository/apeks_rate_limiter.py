@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import time
+
+from config import ApeksConfig
+
+
+class ApeksRateLimiter:
+    """
+    Адаптивный ограничитель частоты запросов к точке доступа API АпексВУЗ
+    (алгоритм token bucket).
+
+    При ошибках сервера (5xx), ошибках соединения или росте времени ответа
+    выше порогового скорость уменьшается вдвое (но не ниже минимальной),
+    при успешных быстрых ответах постепенно восстанавливается до заданной.
+    Используется только в цикле событий ApeksApiClient.
+
+    Attributes:
+    ----------
+    max_rate : float
+        максимальное количество запросов в секунду
+    rate : float
+        текущее количество запросов в секунду
+    burst : int
+        максимальное количество запросов, выполняемых без ожидания
+    min_rate : float
+        минимальное количество запросов в секунду
+    latency_threshold : float
+        время ответа (секунды), при превышении которого скорость снижается
+    """
+
+    def __init__(
+        self,
+        rate: float = ApeksConfig.RATE_LIMIT,
+        burst: int = ApeksConfig.RATE_LIMIT_BURST,
+        min_rate: float = ApeksConfig.RATE_LIMIT_MIN,
+        latency_threshold: float = ApeksConfig.RATE_LIMIT_LATENCY,
+    ):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.latency_threshold = latency_threshold
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Ожидает разрешения на выполнение запроса."""
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def feedback(self, latency: float, status_code: int | None) -> None:
+        """
+        Изменяет скорость по результату запроса.
+
+        Parameters
+        ----------
+            latency: float
+                время выполнения запроса (секунды)
+            status_code: int | None
+                код ответа сервера (None - ошибка соединения)
+        """
+        if (
+            status_code is None
+            or status_code >= 500
+            or latency > self.latency_threshold
+        ):
+            rate = max(self.min_rate, self.rate / 2)
+            if rate != self.rate:
+                logging.warning(
+                    "Снижена частота запросов к API АпексВУЗ: "
+                    f"{rate:.2f} запр./сек. (код ответа: {status_code}, "
+                    f"время ответа: {latency:.2f} сек.)"
+                )
+            self.rate = rate
+        elif self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+
+from config import ApeksConfig
+from .base_apeks_api_service import ApeksApiDbService
+from ..repository.apeks_api_repository import ApeksApiRepository
+
+
+@dataclass
+class ApeksDbMmCompetencyLevelsService(ApeksApiDbService):
+    """
+    Класс для CRUD операций модели MmCompetencyLevels.
+
+    Используемые поля модели: 'work_program_id', 'level',
+    'semester_id', 'control_type_id', 'knowledge', 'abilities', 'ownerships',
+    'level1', 'level2', 'level3'.
+    """
+
+
+def get_apeks_db_mm_competency_levels_service(
+    table: str = ApeksConfig.TABLES.get("mm_competency_levels"),
+    repository: ApeksApiRepository = ApeksApiRepository(),
+    token: str = ApeksConfig.TOKEN,
+) -> ApeksDbMmCompetencyLevelsService:
+    """Возвращает CRUD сервис для таблицы mm_competency_levels."""
+    return ApeksDbMmCompetencyLevelsService(
+        table=table, repository=repository, token=token
+    )
@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+
+from config import ApeksConfig
+from .base_apeks_api_service import ApeksApiDbService
+from ..repository.apeks_api_repository import ApeksApiRepository
+
+
+@dataclass
+class ApeksDbMmWorkProgramsCompetenciesDataService(ApeksApiDbService):
+    """
+    Класс для CRUD операций модели MmWorkProgramsCompetenciesData.
+
+    Используемые поля модели: 'work_program_id',
+    'competency_id', 'field_id', 'value'.
+    """
+
+
+def get_apeks_db_mm_work_programs_competencies_data_service(
+    table: str = ApeksConfig.TABLES.get("mm_work_programs_competencies_data"),
+    repository: ApeksApiRepository = ApeksApiRepository(),
+    token: str = ApeksConfig.TOKEN,
+) -> ApeksDbMmWorkProgramsCompetenciesDataService:
+    """Возвращает CRUD сервис для таблицы mm_work_programs_competencies_data."""
+    return ApeksDbMmWorkProgramsCompetenciesDataService(
+        table=table, repository=repository, token=token
+    )
@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+
+from config import ApeksConfig
+from .base_apeks_api_service import ApeksApiDbService
+from ..repository.apeks_api_repository import ApeksApiRepository
+
+
+@dataclass
+class ApeksDbPlanCompetenciesService(ApeksApiDbService):
+    """
+    Класс для CRUD операций модели PlanCompetencies.
+
+    Используемые поля модели: 'education_plan_id', 'code',
+    'description', 'level', 'left_node', 'right_node'.
+    """
+
+
+def get_apeks_db_plan_competencies_service(
+    table: str = ApeksConfig.TABLES.get("plan_competencies"),
+    repository: ApeksApiRepository = ApeksApiRepository(),
+    token: str = ApeksConfig.TOKEN,
+) -> ApeksDbPlanCompetenciesService:
+    """Возвращает CRUD сервис для таблицы plan_competencies."""
+    return ApeksDbPlanCompetenciesService(
+        table=table, repository=repository, token=token
+    )
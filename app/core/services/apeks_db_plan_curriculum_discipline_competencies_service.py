@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+
+from config import ApeksConfig
+from .base_apeks_api_service import ApeksApiDbService
+from ..repository.apeks_api_repository import ApeksApiRepository
+
+
+@dataclass
+class ApeksDbPlanCurriculumDisciplineCompetenciesService(ApeksApiDbService):
+    """
+    Класс для CRUD операций модели PlanCurriculumDisciplineCompetencies.
+
+    Используемые поля модели: 'curriculum_discipline_id',
+    'competency_id'.
+    """
+
+
+def get_apeks_db_plan_curriculum_discipline_competencies_service(
+    table: str = ApeksConfig.TABLES.get("plan_curriculum_discipline_competencies"),
+    repository: ApeksApiRepository = ApeksApiRepository(),
+    token: str = ApeksConfig.TOKEN,
+) -> ApeksDbPlanCurriculumDisciplineCompetenciesService:
+    """Возвращает CRUD сервис для таблицы plan_curriculum_discipline_competencies."""
+    return ApeksDbPlanCurriculumDisciplineCompetenciesService(
+        table=table, repository=repository, token=token
+    )
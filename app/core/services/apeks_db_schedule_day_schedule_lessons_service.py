@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from calendar import monthrange
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, timedelta
+from itertools import islice
+from typing import Any, AsyncIterator
+
+from config import ApeksConfig
+from .base_apeks_api_service import ApeksApiDbService
+from ..repository.apeks_api_repository import ApeksApiEndpoints, ApeksApiRepository
+
+
+def date_windows(
+    date_start: date, date_end: date, window: str = ApeksConfig.LESSONS_WINDOW
+) -> list[tuple[date, date]]:
+    """
+    Разделяет период на части (окна) для запроса занятий.
+
+    Parameters
+    ----------
+        date_start: date
+            начальная дата
+        date_end: date
+            конечная дата
+        window: str
+            размер окна: 'month' - календарный месяц, 'week' - неделя
+            (понедельник - воскресенье), 'period' - весь период
+
+    Returns
+    -------
+        list[tuple[date, date]]
+            [(начальная дата, конечная дата)] в порядке возрастания дат
+    """
+    if window not in ("month", "week", "period"):
+        raise ValueError(f"Неизвестный размер окна запроса занятий: '{window}'")
+    windows = []
+    start = date_start
+    while start <= date_end:
+        if window == "month":
+            end = start.replace(day=monthrange(start.year, start.month)[1])
+        elif window == "week":
+            end = start + timedelta(days=6 - start.weekday())
+        else:
+            end = date_end
+        end = min(end, date_end)
+        windows.append((start, end))
+        start = end + timedelta(days=1)
+    return windows
+
+
+@dataclass
+class ApeksDbScheduleDayScheduleLessonsService(ApeksApiDbService):
+    """
+    Класс для CRUD операций модели ScheduleDayScheduleLessons.
+
+    Используемые поля модели: 'id', 'date', 'lesson_time_id', 'group_id',
+    'subgroup_id', 'discipline_id', 'class_type_id', 'control_type_id'.
+
+    Занятия за период запрашиваются частями (окнами) размера 'window',
+    до 'window_concurrency' частей запрашиваются одновременно.
+    """
+
+    window: str = ApeksConfig.LESSONS_WINDOW
+    window_concurrency: int = ApeksConfig.LESSONS_WINDOW_CONCURRENCY
+
+    def _period_params(self, date_start: date, date_end: date) -> dict:
+        return {
+            "token": self.token,
+            "table": self.table,
+            "filter": (
+                f"date between '{date_start.isoformat()}' "
+                f"and '{date_end.isoformat()}'"
+            ),
+        }
+
+    def is_period_mirrored(self, date_start: date, date_end: date) -> bool:
+        """Проверяет, можно ли читать занятия за период из зеркала."""
+        return self.use_mirror and self.mirror.is_ready(
+            self.table, date_start, date_end
+        )
+
+    async def get_lessons(self, date_start: date, date_end: date) -> list:
+        """Возвращает список занятий за указанный период."""
+        return [lesson async for lesson in self.iter_lessons(date_start, date_end)]
+
+    async def _stream_window(
+        self, date_start: date, date_end: date, lessons: asyncio.Queue
+    ) -> None:
+        """
+        Запрашивает занятия за часть периода и передает их в очередь
+        по мере получения и разбора ответа API.
+        """
+        endpoint = ApeksApiEndpoints.DB_GET_ENDPOINT
+        params = self._period_params(date_start, date_end)
+        logging.debug(f"Переданы параметры для запроса занятий: {params['filter']}")
+        async for lesson in self.repository.stream(endpoint, params):
+            lessons.put_nowait(lesson)
+
+    async def iter_lessons(
+        self, date_start: date, date_end: date
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Возвращает занятия за указанный период по мере получения
+        и разбора ответа API.
+
+        Период разделяется на части (ApeksConfig.LESSONS_WINDOW), которые
+        запрашиваются одновременно (не более 'window_concurrency' частей,
+        следующая часть запрашивается по мере выдачи предыдущих). Части
+        выдаются в порядке дат: занятия текущей части выдаются по мере
+        получения, в памяти хранятся только занятия частей, полученные
+        раньше текущей. Внутри части занятия выдаются в порядке ответа API.
+        """
+        if self.is_period_mirrored(date_start, date_end):
+            # Зеркало возвращает записи без сортировки
+            for lesson in sorted(
+                self.mirror.get_date_range(self.table, date_start, date_end),
+                key=lambda lesson: lesson.get("date"),
+            ):
+                yield lesson
+            return
+        windows = iter(date_windows(date_start, date_end, self.window))
+        pending = deque()
+
+        def start_window(window_start: date, window_end: date) -> None:
+            lessons = asyncio.Queue()
+            task = asyncio.ensure_future(
+                self._stream_window(window_start, window_end, lessons)
+            )
+            # None - признак окончания части (после всех ее занятий)
+            task.add_done_callback(lambda _: lessons.put_nowait(None))
+            pending.append((lessons, task))
+
+        try:
+            for window in islice(windows, self.window_concurrency):
+                start_window(*window)
+            while pending:
+                lessons, task = pending[0]
+                while (lesson := await lessons.get()) is not None:
+                    yield lesson
+                pending.popleft()
+                task.result()
+                next_window = next(windows, None)
+                if next_window is not None:
+                    start_window(*next_window)
+        finally:
+            # Запросы не выданных частей отменяются при досрочном завершении
+            for _, task in pending:
+                task.cancel()
+
+
+def get_db_apeks_schedule_day_schedule_lessons_service(
+    table: str = ApeksConfig.SCHEDULE_DAY_SCHEDULE_LESSONS_TABLE,
+    repository: ApeksApiRepository = ApeksApiRepository(),
+    token: str = ApeksConfig.TOKEN,
+) -> ApeksDbScheduleDayScheduleLessonsService:
+    """Возвращает CRUD сервис для таблицы schedule_day_schedule_lessons."""
+    return ApeksDbScheduleDayScheduleLessonsService(
+        table=table, repository=repository, token=token
+    )
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+
+from config import ApeksConfig
+from .base_apeks_api_service import ApeksApiDbService
+from ..repository.apeks_api_repository import ApeksApiRepository
+
+
+@dataclass
+class ApeksDbScheduleDayScheduleLessonsStaffService(ApeksApiDbService):
+    """
+    Класс для CRUD операций модели ScheduleDayScheduleLessonsStaff.
+
+    Используемые поля модели: 'lesson_id', 'staff_id'.
+    """
+
+
+def get_db_apeks_schedule_day_schedule_lessons_staff_service(
+    table: str = ApeksConfig.SCHEDULE_DAY_SCHEDULE_LESSONS_STAFF_TABLE,
+    repository: ApeksApiRepository = ApeksApiRepository(),
+    token: str = ApeksConfig.TOKEN,
+) -> ApeksDbScheduleDayScheduleLessonsStaffService:
+    """Возвращает CRUD сервис для таблицы schedule_day_schedule_lessons_staff."""
+    return ApeksDbScheduleDayScheduleLessonsStaffService(
+        table=table, repository=repository, token=token
+    )
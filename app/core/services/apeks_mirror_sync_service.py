@@ -0,0 +1,267 @@
+import asyncio
+import fcntl
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from config import ApeksConfig
+from .base_apeks_api_service import split_filters
+from ..db.apeks_mirror import ApeksMirror
+from ..extensions import apeks_mirror
+from ..repository.apeks_api_repository import ApeksApiEndpoints, ApeksApiRepository
+
+
+@dataclass
+class ApeksMirrorSyncService:
+    """
+    Синхронизация локальной копии (зеркала) таблиц АпексВУЗ.
+
+    Способ синхронизации каждой таблицы задается в ApeksConfig.MIRROR_TABLES.
+    При полной синхронизации таблицы загружаются заново (занятия - за весь
+    период хранения), при инкрементальной загружаются только записи,
+    измененные после последней синхронизации (по полю 'timestamp'),
+    или занятия за недавний период. Удаленные в АпексВУЗ записи таблиц
+    с синхронизацией по 'timestamp' удаляются из зеркала при полной
+    синхронизации.
+
+    Attributes
+    ----------
+    mirror : ApeksMirror
+        локальная копия таблиц АпексВУЗ
+    repository : ApeksApiRepository
+        репозиторий для запросов к API АпексВУЗ
+    token : str
+        токен доступа к API АпексВУЗ
+    full_sync_interval : int
+        интервал полной синхронизации (секунды)
+    """
+
+    mirror: ApeksMirror
+    repository: ApeksApiRepository
+    token: str
+    full_sync_interval: int = ApeksConfig.MIRROR_FULL_SYNC_INTERVAL
+    lessons_days_back: int = ApeksConfig.MIRROR_LESSONS_DAYS_BACK
+    lessons_days_forward: int = ApeksConfig.MIRROR_LESSONS_DAYS_FORWARD
+    lessons_recent_days: int = ApeksConfig.MIRROR_LESSONS_RECENT_DAYS
+
+    async def _fetch(
+        self, table: str, db_filter: str | None = None, **filters
+    ) -> list[dict[str, Any]]:
+        """
+        Загружает записи таблицы по фильтру-выражению и (или) фильтрам
+        вида {поле: список значений} с потоковым разбором ответа.
+        """
+        endpoint = ApeksApiEndpoints.DB_GET_ENDPOINT
+        rows = []
+        for chunk in split_filters(filters):
+            params = {"token": self.token, "table": table}
+            if db_filter:
+                params["filter"] = db_filter
+            for field, values in chunk.items():
+                params[f"filter[{field}][]"] = [str(val) for val in values]
+            async for row in self.repository.stream(endpoint, params):
+                rows.append(row)
+        return rows
+
+    def _is_full_sync_due(self, table: str) -> bool:
+        full_synced_at = self.mirror.get_sync_info(table)["full_synced_at"]
+        return (
+            not full_synced_at
+            or time.time() - full_synced_at >= self.full_sync_interval
+        )
+
+    async def _sync_full(self, table: str, full: bool) -> int:
+        rows = await self._fetch(table)
+        with self.mirror.transaction() as connection:
+            self.mirror.delete(connection, table)
+            self.mirror.upsert(connection, table, rows)
+            self.mirror.set_sync_info(connection, table, full=True)
+        return len(rows)
+
+    async def _sync_timestamp(self, table: str, full: bool) -> int:
+        last_timestamp = self.mirror.get_sync_info(table)["last_timestamp"]
+        if full or not last_timestamp:
+            rows = await self._fetch(table)
+        else:
+            # Записи с последним сохраненным 'timestamp' загружаются повторно
+            # (изменения, сделанные в ту же секунду), повторы заменяются
+            # в зеркале по ключу записи
+            rows = await self._fetch(table, f"timestamp >= '{last_timestamp}'")
+        timestamps = [row["timestamp"] for row in rows if row.get("timestamp")]
+        with self.mirror.transaction() as connection:
+            if full or not last_timestamp:
+                self.mirror.delete(connection, table)
+            self.mirror.upsert(connection, table, rows)
+            self.mirror.set_sync_info(
+                connection,
+                table,
+                full=full or not last_timestamp,
+                last_timestamp=max(timestamps, default=None),
+            )
+        return len(rows)
+
+    def _lessons_period(self, full: bool) -> tuple[date, date]:
+        today = date.today()
+        days_back = self.lessons_days_back if full else self.lessons_recent_days
+        return (
+            today - timedelta(days=days_back),
+            today + timedelta(days=self.lessons_days_forward),
+        )
+
+    async def _sync_date(self, table: str, full: bool) -> int:
+        date_start, date_end = self._lessons_period(full)
+        rows = await self._fetch(
+            table,
+            f"date between '{date_start.isoformat()}' and '{date_end.isoformat()}'",
+        )
+        with self.mirror.transaction() as connection:
+            if full:
+                self.mirror.delete(connection, table)
+            else:
+                self.mirror.delete(
+                    connection,
+                    table,
+                    "WHERE date BETWEEN ? AND ?",
+                    (date_start.isoformat(), date_end.isoformat()),
+                )
+            self.mirror.upsert(connection, table, rows)
+            self.mirror.set_sync_info(
+                connection,
+                table,
+                full=full,
+                period_start=date_start if full else None,
+                period_end=date_end,
+            )
+        return len(rows)
+
+    async def _sync_lessons(self, table: str, full: bool) -> int:
+        lessons_table = ApeksConfig.SCHEDULE_DAY_SCHEDULE_LESSONS_TABLE
+        date_start, date_end = self._lessons_period(full)
+        lesson_ids = [
+            lesson["id"]
+            for lesson in self.mirror.get_date_range(
+                lessons_table, date_start, date_end
+            )
+        ]
+        rows = await self._fetch(table, lesson_id=lesson_ids) if lesson_ids else []
+        with self.mirror.transaction() as connection:
+            if full:
+                self.mirror.delete(connection, table)
+            else:
+                self.mirror.delete(
+                    connection,
+                    table,
+                    # Записи удаленных занятий и занятий обновленного периода
+                    f"WHERE lesson_id NOT IN (SELECT mirror_key FROM {lessons_table})"
+                    f" OR lesson_id IN (SELECT mirror_key FROM {lessons_table} "
+                    "WHERE date BETWEEN ? AND ?)",
+                    (date_start.isoformat(), date_end.isoformat()),
+                )
+            self.mirror.upsert(connection, table, rows)
+            self.mirror.set_sync_info(connection, table, full=full)
+        return len(rows)
+
+    async def sync_table(self, table: str, full: bool | None = None) -> int:
+        """
+        Синхронизирует таблицу зеркала.
+
+        Parameters
+        ----------
+            table: str
+                название таблицы
+            full: bool | None
+                True - полная синхронизация, False - инкрементальная,
+                None - полная, если прошло 'full_sync_interval' секунд
+                с последней полной синхронизации
+
+        Returns
+        -------
+            int
+                количество загруженных записей
+        """
+        sync_type = self.mirror.tables[table].get("sync", "full")
+        if full is None:
+            full = self._is_full_sync_due(table)
+        handlers = {
+            "full": self._sync_full,
+            "timestamp": self._sync_timestamp,
+            "date": self._sync_date,
+            "lessons": self._sync_lessons,
+        }
+        started = time.monotonic()
+        rows_count = await handlers[sync_type](table, full)
+        logging.info(
+            f"Синхронизирована таблица зеркала АпексВУЗ '{table}' "
+            f"({'полная' if full or sync_type == 'full' else 'инкрементальная'}): "
+            f"{rows_count} записей за {time.monotonic() - started:.2f} сек."
+        )
+        return rows_count
+
+    async def sync(self, full: bool | None = None) -> dict[str, int]:
+        """
+        Синхронизирует все таблицы зеркала в порядке их перечисления
+        в настройках. Ошибка синхронизации таблицы не прерывает
+        синхронизацию остальных таблиц.
+
+        Returns
+        -------
+            dict
+                {table: количество загруженных записей или None при ошибке}
+        """
+        result = {}
+        for table in self.mirror.tables:
+            try:
+                result[table] = await self.sync_table(table, full)
+            except Exception as error:
+                logging.error(
+                    f"Ошибка синхронизации таблицы зеркала АпексВУЗ '{table}': "
+                    f"{error}"
+                )
+                result[table] = None
+        return result
+
+
+def get_apeks_mirror_sync_service(
+    mirror: ApeksMirror = apeks_mirror,
+    repository: ApeksApiRepository = ApeksApiRepository(),
+    token: str = ApeksConfig.TOKEN,
+) -> ApeksMirrorSyncService:
+    """Возвращает сервис синхронизации зеркала таблиц АпексВУЗ."""
+    return ApeksMirrorSyncService(mirror=mirror, repository=repository, token=token)
+
+
+def start_mirror_sync(
+    interval: int = ApeksConfig.MIRROR_SYNC_INTERVAL,
+    lock_path: str = f"{ApeksConfig.MIRROR_DB_PATH}.lock",
+) -> threading.Thread | None:
+    """
+    Запускает фоновую синхронизацию зеркала таблиц АпексВУЗ с интервалом
+    'interval' секунд. Синхронизацию выполняет только один процесс
+    (остальные рабочие процессы сервера получают отказ блокировки файла).
+    """
+    lock_file = open(lock_path, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        logging.debug("Синхронизация зеркала АпексВУЗ выполняется другим процессом")
+        return None
+
+    def sync_loop():
+        service = get_apeks_mirror_sync_service()
+        while True:
+            try:
+                asyncio.run(service.sync())
+            except Exception as error:
+                logging.error(f"Ошибка синхронизации зеркала АпексВУЗ: {error}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=sync_loop, name="apeks-mirror-sync", daemon=True)
+    # Файл блокировки остается открытым, пока работает процесс
+    thread.lock_file = lock_file
+    thread.start()
+    logging.info("Запущена фоновая синхронизация зеркала АпексВУЗ")
+    return thread
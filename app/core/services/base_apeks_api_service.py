@@ -1,9 +1,18 @@
+from __future__ import annotations
+
+import asyncio
+import functools
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from itertools import product
 from types import NoneType
-from typing import Any
+from typing import Any, AsyncIterator, Awaitable, Callable, Collection
 
+from config import ApeksConfig
 from ..exceptions import ApeksApiException
+from ..db.apeks_mirror import ApeksMirror
+from ..extensions import apeks_api_cache, apeks_mirror
+from ..repository.apeks_api_cache import ApeksApiCache
 from ..repository.abstract_repository import AbstractApiRepository, AbstractDBRepository
 from ..repository.apeks_api_repository import ApeksApiEndpoints, ApeksApiRepository
 
@@ -56,6 +65,34 @@ class ApeksApiBaseService(AbstractApiRepository):
         )
 
 
+@dataclass
+class ApeksBulkResult:
+    """
+    Результат групповой операции с таблицей базы данных АпексВУЗ.
+
+    Attributes
+    ----------
+    count : int
+        количество созданных, измененных или удаленных записей
+    requests : int
+        количество выполненных запросов к API
+    results : list
+        ответы API для каждого элемента переданного списка
+        (None - если запрос завершился ошибкой)
+    errors : dict
+        ошибки по номерам элементов переданного списка {index: message}
+    """
+
+    count: int = 0
+    requests: int = 0
+    results: list = field(default_factory=list)
+    errors: dict[int, str] = field(default_factory=dict)
+
+    def errors_message(self) -> str:
+        """Возвращает сообщение о количестве ошибок (если они есть)."""
+        return f". Ошибок - {len(self.errors)}" if self.errors else ""
+
+
 @dataclass
 class ApeksApiDbService(AbstractDBRepository):
     """
@@ -69,28 +106,106 @@ class ApeksApiDbService(AbstractDBRepository):
         репозиторий для запросов к API АпексВУЗ
     token : str
         токен доступа к API АпексВУЗ
+    cache : ApeksApiCache
+        кэш ответов API для редко изменяемых таблиц
+    mirror : ApeksMirror
+        локальная копия (зеркало) таблиц АпексВУЗ
+    use_mirror : bool
+        читать данные из зеркала, если таблица в нем синхронизирована
+    bulk_concurrency : int
+        количество одновременно выполняемых запросов групповых операций
     """
 
     table: str
     repository: ApeksApiRepository
     token: str
+    cache: ApeksApiCache = apeks_api_cache
+    mirror: ApeksMirror = apeks_mirror
+    use_mirror: bool = ApeksConfig.MIRROR_ENABLED
+    bulk_concurrency: int = ApeksConfig.BULK_CONCURRENCY
 
     async def list(self):
         """Возвращает все объекты из таблицы базы данных АпексВУЗ."""
         return await self.get()
 
+    def is_mirrored(self) -> bool:
+        """Проверяет, можно ли читать данные таблицы из зеркала."""
+        return self.use_mirror and self.mirror.is_ready(self.table)
+
     async def get(self, **filters) -> list:
         """Возвращает список объектов из таблицы базы данных АпексВУЗ."""
+        filters = materialize_filters(filters)
+        if self.is_mirrored():
+            logging.debug(
+                f"Получены данные из зеркала таблицы: {self.table}. "
+                f"Фильтры - {filters}"
+            )
+            return self.mirror.get(self.table, **filters)
+        cached_data = self.cache.get(self.table, filters)
+        if cached_data is not None:
+            logging.debug(
+                f"Получены данные из кэша таблицы: {self.table}. Фильтры - {filters}"
+            )
+            return cached_data
+        filters_chunks = split_filters(filters)
+        if len(filters_chunks) == 1:
+            response_data = await self._get(**filters)
+        else:
+            response_data = merge_table_data(
+                await asyncio.gather(*(self._get(**chunk) for chunk in filters_chunks))
+            )
+            logging.debug(
+                f"Запрос к таблице {self.table} разделен на "
+                f"{len(filters_chunks)} частей"
+            )
+        self.cache.set(self.table, filters, response_data)
+        return response_data
+
+    async def iter_get(self, **filters) -> AsyncIterator[dict[str, Any]]:
+        """
+        Возвращает объекты из таблицы базы данных АпексВУЗ по мере получения
+        и разбора ответа API, не загружая весь ответ в память.
+        """
+        filters = materialize_filters(filters)
+        if self.is_mirrored():
+            stored_data = self.mirror.get(self.table, **filters)
+        else:
+            stored_data = self.cache.get(self.table, filters)
+        if stored_data is not None:
+            for row in stored_data:
+                yield row
+            return
         endpoint = ApeksApiEndpoints.DB_GET_ENDPOINT.value
+        filters_chunks = split_filters(filters)
+        processed_ids = set()
+        for chunk in filters_chunks:
+            async for row in self.repository.stream(endpoint, self._params(chunk)):
+                row_id = row.get("id")
+                if len(filters_chunks) > 1 and row_id is not None:
+                    if row_id in processed_ids:
+                        continue
+                    processed_ids.add(row_id)
+                yield row
+        logging.debug(
+            f"Выполнен потоковый GET запрос к таблице: {self.table}. "
+            f"Фильтры - {filters}"
+        )
+
+    def _params(self, filters: dict) -> dict:
+        """Формирует параметры GET запроса к таблице базы данных АпексВУЗ."""
         params = {"token": self.token, "table": self.table}
-        if filters:
-            for db_filter, db_value in filters.items():
-                if isinstance(db_value, (int, str)):
-                    values = str(db_value)
-                else:
-                    values = [str(val) for val in db_value]
-                params[f"filter[{db_filter}][]"] = values
-        response_data = await self.repository.get(endpoint, params)
+        for db_filter, db_value in filters.items():
+            if isinstance(db_value, (int, str)):
+                values = str(db_value)
+            else:
+                values = [str(val) for val in db_value]
+            params[f"filter[{db_filter}][]"] = values
+        return params
+
+    async def _get(self, **filters) -> list:
+        """Выполняет GET запрос к таблице базы данных АпексВУЗ."""
+        endpoint = ApeksApiEndpoints.DB_GET_ENDPOINT.value
+        response_data = await self.repository.get(endpoint, self._params(filters))
         logging.debug(
             f"Выполнен GET запрос к таблице: {self.table}. Фильтры - {filters}"
         )
@@ -104,6 +219,9 @@ class ApeksApiDbService(AbstractDBRepository):
         for db_field, db_value in fields.items():
             data[f"fields[{db_field}]"] = str(db_value)
         response_data = await self.repository.post(endpoint, params, data)
+        self.cache.invalidate(self.table)
+        if self.use_mirror:
+            self.mirror.invalidate(self.table)
         logging.debug(
             f"Выполнен POST (CREATE) к таблице {self.table}. " f"Поля - {fields}"
         )
@@ -130,6 +248,9 @@ class ApeksApiDbService(AbstractDBRepository):
         for db_field, db_value in fields.items():
             data[f"fields[{db_field}]"] = str(db_value)
         response_data = await self.repository.post(endpoint, params, data)
+        self.cache.invalidate(self.table)
+        if self.use_mirror:
+            self.mirror.invalidate(self.table)
         logging.debug(
             f"Выполнен POST (EDIT) запрос к таблице '{self.table}'. "
             f"Поля - {fields}. Фильтры - {filters}"
@@ -147,11 +268,253 @@ class ApeksApiDbService(AbstractDBRepository):
                 logging.error(message)
                 raise ApeksApiException(message)
         response_data = await self.repository.delete(endpoint, params)
+        self.cache.invalidate(self.table)
+        if self.use_mirror:
+            self.mirror.invalidate(self.table)
         logging.debug(
             f"Выполнен DELETE запрос к таблице '{self.table}'. " f"Фильтры - {filters}"
         )
         return response_data
 
+    async def _run_bulk(
+        self,
+        operations: list[tuple[list[int], Callable[[], Awaitable]]],
+        items_count: int,
+        count_items: bool = False,
+    ) -> ApeksBulkResult:
+        """
+        Выполняет операции с ограничением количества одновременных запросов.
+
+        Parameters
+        ----------
+            operations: list
+                [(номера элементов, охватываемых операцией, операция)]
+            items_count: int
+                количество элементов
+            count_items: bool
+                True - считать количество успешно обработанных элементов,
+                False - суммировать количество записей из ответов API
+        """
+        result = ApeksBulkResult(results=[None] * items_count)
+        semaphore = asyncio.Semaphore(self.bulk_concurrency)
+
+        async def run(indexes: list[int], operation: Callable[[], Awaitable]):
+            async with semaphore:
+                try:
+                    response_data = await operation()
+                except ApeksApiException as error:
+                    for index in indexes:
+                        result.errors[index] = str(error)
+                    return
+            result.requests += 1
+            if count_items:
+                result.count += len(indexes)
+            elif str(response_data).isdecimal():
+                result.count += int(response_data)
+            for index in indexes:
+                result.results[index] = response_data
+
+        await asyncio.gather(
+            *(run(indexes, operation) for indexes, operation in operations)
+        )
+        logging.debug(
+            f"Выполнена групповая операция с таблицей '{self.table}'. "
+            f"Элементов - {items_count}, запросов - {result.requests}, "
+            f"записей - {result.count}, ошибок - {len(result.errors)}"
+        )
+        return result
+
+    async def bulk_create(self, items: list[dict]) -> ApeksBulkResult:
+        """
+        Создает объекты в таблице базы данных АпексВУЗ (один запрос
+        на объект, запросы выполняются одновременно).
+
+        Parameters
+        ----------
+            items: list
+                список полей создаваемых объектов
+
+        Returns
+        -------
+            ApeksBulkResult
+                количество созданных объектов, ответы API и ошибки
+        """
+        operations = [
+            ([index], functools.partial(self.create, **fields))
+            for index, fields in enumerate(items)
+        ]
+        return await self._run_bulk(operations, len(items), count_items=True)
+
+    async def bulk_update(self, items: list[tuple[dict, dict]]) -> ApeksBulkResult:
+        """
+        Изменяет объекты в таблице базы данных АпексВУЗ. Изменения
+        с одинаковыми полями, фильтры которых отличаются значением одного
+        поля, объединяются в один запрос с фильтром по списку значений.
+
+        Parameters
+        ----------
+            items: list
+                список изменений [(фильтры, поля)]
+
+        Returns
+        -------
+            ApeksBulkResult
+                количество измененных объектов, ответы API и ошибки
+        """
+        fields_groups = {}
+        for index, (filters, fields) in enumerate(items):
+            fields_key = tuple(sorted((key, str(val)) for key, val in fields.items()))
+            fields_groups.setdefault(fields_key, []).append((index, filters))
+        operations = []
+        for fields_key, indexed_filters in fields_groups.items():
+            fields = items[indexed_filters[0][0]][1]
+            for indexes, filters in group_filters(indexed_filters):
+                operations.append(
+                    (indexes, functools.partial(self.update, filters, fields))
+                )
+        return await self._run_bulk(operations, len(items))
+
+    async def bulk_delete(self, items: list[dict]) -> ApeksBulkResult:
+        """
+        Удаляет объекты в таблице базы данных АпексВУЗ. Фильтры,
+        отличающиеся значением одного поля, объединяются в один запрос
+        с фильтром по списку значений.
+
+        Parameters
+        ----------
+            items: list
+                список фильтров удаляемых объектов
+
+        Returns
+        -------
+            ApeksBulkResult
+                количество удаленных объектов, ответы API и ошибки
+        """
+        operations = []
+        for indexes, filters in group_filters(list(enumerate(items))):
+            for chunk in split_filters(filters):
+                operations.append((indexes, functools.partial(self.delete, **chunk)))
+        return await self._run_bulk(operations, len(items))
+
+
+def materialize_filters(filters: dict) -> dict:
+    """
+    Преобразует значения фильтров, заданные итераторами (генераторами),
+    в списки, чтобы их можно было использовать несколько раз.
+    """
+    return {
+        db_filter: (
+            db_value
+            if isinstance(db_value, (int, str, Collection))
+            else list(db_value)
+        )
+        for db_filter, db_value in filters.items()
+    }
+
+
+def split_filters(
+    filters: dict, chunk_size: int = ApeksConfig.FILTER_CHUNK_SIZE
+) -> list[dict]:
+    """
+    Разделяет фильтры запроса с большими списками значений на несколько
+    наборов фильтров, чтобы длина адреса запроса не превышала ограничения
+    сервера.
+
+    Parameters
+    ----------
+        filters: dict
+            фильтры запроса {поле: значение или список значений}
+        chunk_size: int
+            максимальное количество значений фильтра в одном запросе
+
+    Returns
+    -------
+        list
+            список наборов фильтров, объединение результатов которых
+            равно результату исходного запроса
+    """
+    variants = []
+    for db_filter, db_value in materialize_filters(filters).items():
+        if isinstance(db_value, (int, str)) or len(db_value) <= chunk_size:
+            variants.append([(db_filter, db_value)])
+        else:
+            values = list(dict.fromkeys(str(val) for val in db_value))
+            variants.append(
+                [
+                    (db_filter, values[index : index + chunk_size])
+                    for index in range(0, len(values), chunk_size)
+                ]
+            )
+    return [dict(chunk) for chunk in product(*variants)]
+
+
+def group_filters(
+    indexed_filters: list[tuple[int, dict]],
+) -> list[tuple[list[int], dict]]:
+    """
+    Объединяет фильтры с одинаковым набором полей, отличающиеся значением
+    одного поля, в фильтр со списком значений этого поля. Объединенный
+    фильтр отбирает те же записи, что и исходные фильтры вместе.
+
+    Parameters
+    ----------
+        indexed_filters: list
+            [(номер элемента, фильтры {поле: значение})]
+
+    Returns
+    -------
+        list
+            [(номера элементов, объединенные фильтры)]
+    """
+    grouped = []
+    keys_groups = {}
+    for index, filters in indexed_filters:
+        # Фильтры со списками и пустыми значениями не объединяются
+        if all(isinstance(val, (int, str)) and val != "" for val in filters.values()):
+            keys_groups.setdefault(tuple(sorted(filters)), []).append((index, filters))
+        else:
+            grouped.append(([index], filters))
+    for keys, group in keys_groups.items():
+        if len(group) == 1 or not keys:
+            grouped.extend(([index], filters) for index, filters in group)
+            continue
+        # Объединяем по полю с наибольшим количеством различных значений
+        merge_key = max(
+            keys, key=lambda key: len({str(item[key]) for _, item in group})
+        )
+        subgroups = {}
+        for index, filters in group:
+            rest = tuple(str(filters[key]) for key in keys if key != merge_key)
+            subgroups.setdefault(rest, []).append((index, filters))
+        for subgroup in subgroups.values():
+            if len(subgroup) == 1:
+                grouped.append(([subgroup[0][0]], subgroup[0][1]))
+                continue
+            merged = dict(subgroup[0][1])
+            merged[merge_key] = list(
+                dict.fromkeys(str(filters[merge_key]) for _, filters in subgroup)
+            )
+            grouped.append(([index for index, _ in subgroup], merged))
+    return grouped
+
+
+def merge_table_data(chunks_data: list[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    """
+    Объединяет данные, полученные по частям, удаляя повторяющиеся по 'id'
+    записи.
+    """
+    merged = []
+    processed_ids = set()
+    for chunk_data in chunks_data:
+        for row in chunk_data:
+            row_id = row.get("id") if isinstance(row, dict) else None
+            if row_id is not None:
+                if row_id in processed_ids:
+                    continue
+                processed_ids.add(row_id)
+            merged.append(row)
+    return merged
+
 
 # При рефакторинге со старой функции убрать преобразование в int
 def data_processor(
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from flask_sqlalchemy.session import Session
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import scoped_session
+
+from config import ApeksConfig as Apeks
+from ..db.database import get_db_session
+from ..db.reports_models import LoadMonthlyAggregates, LoadMonthlyAggregatesStatus
+from ..repository.sqlalchemy_repository import DbRepository
+
+# Версия правил расчета нагрузки (увеличивается при изменении расчета,
+# сохраненная нагрузка, рассчитанная по прежним правилам, пересчитывается)
+LOAD_RULES_VERSION = 2
+
+
+def load_aggregates_fingerprint() -> str:
+    """
+    Отпечаток параметров расчета нагрузки (версия правил, коэффициенты
+    форм контроля, способ расчета, типы занятий и обучающихся).
+    Сохраненная нагрузка, рассчитанная с другими параметрами,
+    не используется.
+    """
+    params = {
+        name: value
+        for name, value in vars(Apeks).items()
+        if name.endswith(("_KF", "_KF_MAX"))
+    }
+    params.update(
+        rules=LOAD_RULES_VERSION,
+        engine=Apeks.LOAD_ENGINE,
+        lesson_types=Apeks.LOAD_LESSON_TYPES,
+        control_types=Apeks.LOAD_CONTROL_TYPES,
+        student_types=Apeks.LOAD_STUDENT_TYPES,
+        exclude=sorted(Apeks.EXCLUDE_LIST),
+    )
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+
+@dataclass
+class LoadMonthlyAggregatesService(DbRepository[LoadMonthlyAggregates]):
+    """
+    Класс для хранения нагрузки преподавателей кафедр за месяц
+    (модель LoadMonthlyAggregates).
+    """
+
+    fingerprint: str = field(default_factory=load_aggregates_fingerprint)
+
+    def get_month_load(self, year: int, month: int, department_id: int) -> dict | None:
+        """
+        Возвращает сохраненную нагрузку преподавателей кафедры за месяц.
+
+        Parameters
+        ----------
+            year: int
+                год (число 20xx)
+            month: int
+                месяц (число 1-12)
+            department_id: int
+                id кафедры
+
+        Returns
+        -------
+            dict | None
+                {staff_id: {l_type: {s_type: value}}} (только ненулевые
+                значения) или None, если нагрузка за месяц не сохранена
+                или рассчитана с другими параметрами (fingerprint).
+        """
+        status = self.db_session.execute(
+            select(LoadMonthlyAggregatesStatus.fingerprint).filter_by(
+                year=year, month=month, department_id=department_id
+            )
+        ).first()
+        if status is None or status.fingerprint != self.fingerprint:
+            return None
+        load_data = {}
+        for row in self.list(year=year, month=month, department_id=department_id):
+            staff_load = load_data.setdefault(row.staff_id, {})
+            value = int(row.value) if row.value.is_integer() else row.value
+            staff_load.setdefault(row.lesson_type, {})[row.student_type] = value
+        return load_data
+
+    def save_month_load(
+        self, year: int, month: int, department_id: int, load_data: dict
+    ) -> None:
+        """
+        Сохраняет нагрузку преподавателей кафедры за месяц
+        (ранее сохраненные значения заменяются). Если нагрузка за месяц
+        одновременно сохранена другим запросом, сохраненные им значения
+        не изменяются.
+
+        Parameters
+        ----------
+            year: int
+                год (число 20xx)
+            month: int
+                месяц (число 1-12)
+            department_id: int
+                id кафедры
+            load_data: dict
+                {staff_id: {l_type: {s_type: value}}}
+        """
+        period = dict(year=year, month=month, department_id=department_id)
+        rows = [
+            dict(
+                period,
+                staff_id=staff_id,
+                lesson_type=l_type,
+                student_type=s_type,
+                value=value,
+            )
+            for staff_id, staff_load in load_data.items()
+            for l_type, values in staff_load.items()
+            for s_type, value in values.items()
+            if value
+        ]
+        try:
+            self.db_session.execute(delete(self.model).filter_by(**period))
+            self.db_session.execute(
+                delete(LoadMonthlyAggregatesStatus).filter_by(**period)
+            )
+            if rows:
+                self.db_session.execute(insert(self.model), rows)
+            self.db_session.add(
+                LoadMonthlyAggregatesStatus(
+                    **period, created=datetime.now(), fingerprint=self.fingerprint
+                )
+            )
+            self.db_session.commit()
+        except IntegrityError:
+            self.db_session.rollback()
+            logging.info(
+                f"Нагрузка кафедры {department_id} за {month:02d}.{year} "
+                "уже сохранена другим запросом"
+            )
+
+    def purge(
+        self,
+        year: int | None = None,
+        month: int | None = None,
+        department_id: int | None = None,
+    ) -> int:
+        """
+        Удаляет сохраненную нагрузку (при следующем запросе отчета
+        нагрузка будет рассчитана заново), например, после исправления
+        расписания закрытого месяца.
+
+        Parameters
+        ----------
+            year: int | None
+                год (по умолчанию - все)
+            month: int | None
+                месяц (по умолчанию - все)
+            department_id: int | None
+                id кафедры (по умолчанию - все)
+
+        Returns
+        -------
+            int
+                количество удаленных месяцев
+        """
+        period = {
+            key: value
+            for key, value in dict(
+                year=year, month=month, department_id=department_id
+            ).items()
+            if value is not None
+        }
+        self.db_session.execute(delete(self.model).filter_by(**period))
+        result = self.db_session.execute(
+            delete(LoadMonthlyAggregatesStatus).filter_by(**period)
+        )
+        self.db_session.commit()
+        logging.info(f"Удалена сохраненная нагрузка за {result.rowcount} мес.")
+        return result.rowcount
+
+
+def get_load_monthly_aggregates_service(
+    model: type[LoadMonthlyAggregates] = LoadMonthlyAggregates,
+    db_session: scoped_session[Session] = get_db_session(),
+) -> LoadMonthlyAggregatesService:
+    return LoadMonthlyAggregatesService(model, db_session)
@@ -1,6 +1,12 @@
+import logging
+import threading
+import time
+
 from flask_sqlalchemy.session import Session
 from sqlalchemy.orm import scoped_session
 
+from config import FlaskConfig
+from ..classes.ProductionCalendar import ProductionCalendar
 from ..db.database import get_db_session
 from ..db.reports_models import (
     ProductionCalendarHolidays,
@@ -31,3 +37,72 @@ def get_productions_calendar_working_days_service(
     db_session: scoped_session[Session] = get_db_session(),
 ) -> ProductionCalendarWorkingDaysCRUDService:
     return ProductionCalendarWorkingDaysCRUDService(model, db_session)
+
+
+class ProductionCalendarService:
+    """
+    Производственный календарь (экземпляр класса "ProductionCalendar"),
+    построенный по записям моделей ProductionCalendarHolidays
+    и ProductionCalendarWorkingDays.
+
+    Календарь строится один раз и хранится до изменения записей
+    (метод invalidate вызывается представлениями добавления, изменения
+    и удаления записей) или истечения времени хранения 'ttl' (изменения,
+    сделанные другими процессами приложения).
+
+    Attributes:
+    ----------
+        holidays_service: ProductionCalendarHolidaysCRUDService
+            сервис записей нерабочих дней
+        working_days_service: ProductionCalendarWorkingDaysCRUDService
+            сервис записей рабочих выходных дней
+        ttl: float
+            время хранения календаря (секунды)
+
+    Methods:
+    -------
+        get_calendar () -> ProductionCalendar
+            возвращает производственный календарь
+        invalidate () -> None
+            сбрасывает сохраненный календарь
+    """
+
+    def __init__(
+        self,
+        holidays_service: ProductionCalendarHolidaysCRUDService,
+        working_days_service: ProductionCalendarWorkingDaysCRUDService,
+        ttl: float = FlaskConfig.PRODUCTION_CALENDAR_CACHE_TTL,
+    ):
+        self.holidays_service = holidays_service
+        self.working_days_service = working_days_service
+        self.ttl = ttl
+        self._calendar: ProductionCalendar | None = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def get_calendar(self) -> ProductionCalendar:
+        """Возвращает производственный календарь."""
+        with self._lock:
+            if self._calendar is None or time.monotonic() >= self._expires:
+                self._calendar = ProductionCalendar(
+                    holidays=[obj.date for obj in self.holidays_service.list()],
+                    working_days=[obj.date for obj in self.working_days_service.list()],
+                )
+                self._expires = time.monotonic() + self.ttl
+                logging.debug("Загружены данные производственного календаря")
+            return self._calendar
+
+    def invalidate(self) -> None:
+        """Сбрасывает сохраненный календарь."""
+        with self._lock:
+            self._calendar = None
+
+
+production_calendar_service = ProductionCalendarService(
+    get_productions_calendar_holidays_service(),
+    get_productions_calendar_working_days_service(),
+)
+
+
+def get_production_calendar_service() -> ProductionCalendarService:
+    return production_calendar_service
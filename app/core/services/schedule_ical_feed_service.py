@@ -0,0 +1,355 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import date
+
+from config import ApeksConfig as Apeks, FlaskConfig
+from ..classes.ScheduleLessonsStaff import ScheduleLessonsStaff
+from ..func.api_get import (
+    api_get_db_table,
+    api_get_staff_lessons,
+    check_api_db_response,
+    check_api_staff_lessons_response,
+)
+from ..func.app_core import data_processor
+from ..func.education_plan import get_plan_disciplines
+from ..func.staff import get_state_staff
+from ..reports.schedule_ical import schedule_ical_calendar
+
+
+def feed_months(months: int, today: date | None = None) -> list[tuple[int, int]]:
+    """
+    Возвращает месяцы календаря подписки: текущий и следующие.
+
+    Parameters
+    ----------
+        months: int
+            количество месяцев
+        today: date | None
+            текущая дата (по умолчанию - date.today())
+
+    Returns
+    -------
+        list[tuple[int, int]]
+            [(год, месяц)]
+    """
+    today = today or date.today()
+    return [
+        (
+            today.year + (today.month - 1 + index) // 12,
+            (today.month - 1 + index) % 12 + 1,
+        )
+        for index in range(months)
+    ]
+
+
+@dataclass
+class IcalFeed:
+    """
+    Сохраненный календарь подписки преподавателя.
+
+    Attributes:
+    ----------
+        content: bytes
+            календарь в формате iCal
+        etag: str
+            идентификатор версии (хэш данных занятий)
+        updated: float
+            время последнего обновления (time.monotonic)
+        last_access: float
+            время последнего запроса календаря (time.monotonic)
+    """
+
+    content: bytes
+    etag: str
+    updated: float
+    last_access: float
+
+
+class ScheduleIcalFeedService:
+    """
+    Календари подписки на расписание преподавателей (iCal), хранящиеся
+    в памяти рабочего процесса.
+
+    Календарь формируется при первом запросе, далее обновляется в фоне
+    (start_ical_feed_refresh) каждые 'refresh_interval' секунд, поэтому
+    запросы календарных клиентов не обращаются к API Апекс-ВУЗ. Если фоновое
+    обновление не запущено, календарь обновляется при запросе после
+    истечения двух интервалов обновления. Версия календаря (ETag)
+    меняется только при изменении данных занятий и одинакова во всех
+    рабочих процессах. Одновременные запросы календаря, который нужно
+    сформировать или обновить, выполняют одно обновление.
+
+    Календари формируются только для сотрудников из справочника
+    'state_staff', количество хранимых календарей ограничено 'max_feeds'
+    (при превышении удаляются давно не запрашиваемые). Календари, которые
+    не запрашивались 'idle_ttl' секунд, удаляются.
+
+    Attributes:
+    ----------
+        months: int
+            количество месяцев календаря (текущий и следующие)
+        refresh_interval: float
+            интервал обновления календарей (секунды)
+        idle_ttl: float
+            время хранения календаря без запросов (секунды)
+        max_feeds: int
+            максимальное количество хранимых календарей
+
+    Methods:
+    -------
+        get_feed (staff_id: int) -> IcalFeed | None
+            возвращает календарь преподавателя (при ошибке обновления
+            - прежнюю версию, None - если сотрудник не найден)
+        refresh (staff_id: int, reference: tuple | None = None) -> IcalFeed
+            обновляет календарь преподавателя
+        refresh_all () -> None
+            обновляет все запрашиваемые календари
+    """
+
+    def __init__(
+        self,
+        months: int = FlaskConfig.SCHEDULE_ICAL_FEED_MONTHS,
+        refresh_interval: float = FlaskConfig.SCHEDULE_ICAL_FEED_REFRESH_INTERVAL,
+        idle_ttl: float = FlaskConfig.SCHEDULE_ICAL_FEED_IDLE_TTL,
+        max_feeds: int = FlaskConfig.SCHEDULE_ICAL_FEED_MAX_FEEDS,
+    ):
+        self.months = months
+        self.refresh_interval = refresh_interval
+        self.idle_ttl = idle_ttl
+        self.max_feeds = max_feeds
+        self._feeds: dict[int, IcalFeed] = {}
+        self._pending: dict[int, Future] = {}
+        self._staff_ids: frozenset[int] = frozenset()
+        self._staff_ids_updated: float | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    async def get_reference_data() -> tuple[dict, dict]:
+        """Возвращает справочники дисциплин и подгрупп для календарей."""
+
+        async def get_load_subgroups() -> dict:
+            return data_processor(
+                await check_api_db_response(
+                    await api_get_db_table(Apeks.TABLES.get("load_subgroups"))
+                )
+            )
+
+        return await asyncio.gather(get_plan_disciplines(), get_load_subgroups())
+
+    async def _get_schedules(
+        self, staff_id: int, reference: tuple[dict, dict]
+    ) -> list[ScheduleLessonsStaff]:
+        """Запрашивает занятия преподавателя за месяцы календаря."""
+        disciplines, load_subgroups = reference
+        months = feed_months(self.months)
+        responses = await asyncio.gather(
+            *(api_get_staff_lessons(staff_id, month, year) for year, month in months)
+        )
+        return [
+            ScheduleLessonsStaff(
+                staff_id,
+                month,
+                year,
+                lessons_data=await check_api_staff_lessons_response(response),
+                disciplines=disciplines,
+                load_subgroups_data=load_subgroups,
+            )
+            for (year, month), response in zip(months, responses)
+        ]
+
+    @staticmethod
+    def _etag(schedules: list[ScheduleLessonsStaff]) -> str:
+        """Хэш данных занятий (не зависит от времени формирования календаря)."""
+        data = [
+            (schedule.year, schedule.month, schedule.lessons_data)
+            for schedule in schedules
+        ]
+        return hashlib.sha256(
+            json.dumps(data, sort_keys=True, default=str).encode()
+        ).hexdigest()[:32]
+
+    async def refresh(
+        self, staff_id: int, reference: tuple[dict, dict] | None = None
+    ) -> IcalFeed:
+        """
+        Обновляет календарь преподавателя.
+
+        Parameters
+        ----------
+            staff_id: int
+                id преподавателя
+            reference: tuple[dict, dict] | None
+                справочники дисциплин и подгрупп (get_reference_data)
+
+        Returns
+        -------
+            IcalFeed
+                календарь преподавателя
+        """
+        reference = reference or await self.get_reference_data()
+        schedules = await self._get_schedules(staff_id, reference)
+        etag = self._etag(schedules)
+        now = time.monotonic()
+        with self._lock:
+            feed = self._feeds.get(staff_id)
+            if feed is not None and feed.etag == etag:
+                feed.updated = now
+                return feed
+        content = schedule_ical_calendar(schedules).to_ical()
+        with self._lock:
+            feed = IcalFeed(
+                content=content,
+                etag=etag,
+                updated=now,
+                last_access=feed.last_access if feed is not None else now,
+            )
+            self._feeds[staff_id] = feed
+            while len(self._feeds) > self.max_feeds:
+                del self._feeds[
+                    min(self._feeds, key=lambda key: self._feeds[key].last_access)
+                ]
+        logging.debug(f"Обновлен календарь подписки преподавателя id {staff_id}")
+        return feed
+
+    async def _is_staff(self, staff_id: int) -> bool:
+        """
+        Проверяет наличие сотрудника в справочнике 'state_staff'
+        (справочник обновляется не чаще одного раза за интервал обновления).
+        """
+        now = time.monotonic()
+        if (
+            self._staff_ids_updated is None
+            or now - self._staff_ids_updated >= self.refresh_interval
+        ):
+            try:
+                self._staff_ids = frozenset(await get_state_staff())
+                self._staff_ids_updated = now
+            except Exception as error:
+                if self._staff_ids_updated is None:
+                    raise
+                logging.error(f"Ошибка обновления списка сотрудников: {error}")
+        return staff_id in self._staff_ids
+
+    async def _refresh_once(self, staff_id: int, check_staff: bool) -> IcalFeed | None:
+        """
+        Обновляет календарь преподавателя. Одновременные запросы одного
+        календаря (в том числе из разных потоков) ожидают одно обновление.
+        """
+        with self._lock:
+            pending = self._pending.get(staff_id)
+            owner = pending is None
+            if owner:
+                pending = self._pending[staff_id] = Future()
+        if not owner:
+            return await asyncio.wrap_future(pending)
+        try:
+            if check_staff and not await self._is_staff(staff_id):
+                feed = None
+            else:
+                feed = await self.refresh(staff_id)
+        except Exception as error:
+            pending.set_exception(error)
+            raise
+        else:
+            pending.set_result(feed)
+            return feed
+        finally:
+            with self._lock:
+                del self._pending[staff_id]
+
+    async def get_feed(self, staff_id: int) -> IcalFeed | None:
+        """
+        Возвращает календарь преподавателя (формирует при первом запросе).
+
+        Parameters
+        ----------
+            staff_id: int
+                id преподавателя
+
+        Returns
+        -------
+            IcalFeed | None
+                календарь или None, если сотрудник не найден
+        """
+        with self._lock:
+            feed = self._feeds.get(staff_id)
+        if feed is None:
+            feed = await self._refresh_once(staff_id, check_staff=True)
+            if feed is None:
+                return None
+        elif time.monotonic() - feed.updated >= 2 * self.refresh_interval:
+            try:
+                feed = await self._refresh_once(staff_id, check_staff=False)
+            except Exception as error:
+                # Календарь клиента остается прежним до следующего обновления
+                logging.error(
+                    f"Ошибка обновления календаря подписки преподавателя "
+                    f"id {staff_id}: {error}"
+                )
+        feed.last_access = time.monotonic()
+        return feed
+
+    async def refresh_all(self) -> None:
+        """
+        Обновляет календари, которые запрашивались в течение 'idle_ttl'
+        секунд (остальные удаляются). При ошибке обновления сохраняется
+        прежняя версия календаря.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for staff_id in [
+                staff_id
+                for staff_id, feed in self._feeds.items()
+                if now - feed.last_access >= self.idle_ttl
+            ]:
+                del self._feeds[staff_id]
+            staff_ids = list(self._feeds)
+        if not staff_ids:
+            return
+        reference = await self.get_reference_data()
+        for staff_id in staff_ids:
+            try:
+                await self.refresh(staff_id, reference)
+            except Exception as error:
+                logging.error(
+                    f"Ошибка обновления календаря подписки преподавателя "
+                    f"id {staff_id}: {error}"
+                )
+
+
+schedule_ical_feed_service = ScheduleIcalFeedService()
+
+
+def get_schedule_ical_feed_service() -> ScheduleIcalFeedService:
+    return schedule_ical_feed_service
+
+
+def start_ical_feed_refresh(
+    service: ScheduleIcalFeedService = schedule_ical_feed_service,
+) -> threading.Thread:
+    """
+    Запускает фоновое обновление календарей подписки с интервалом
+    'service.refresh_interval' секунд (календари хранятся в памяти,
+    поэтому обновление выполняется в каждом рабочем процессе).
+    """
+
+    def refresh_loop():
+        while True:
+            time.sleep(service.refresh_interval)
+            try:
+                asyncio.run(service.refresh_all())
+            except Exception as error:
+                logging.error(f"Ошибка обновления календарей подписки: {error}")
+
+    thread = threading.Thread(
+        target=refresh_loop, name="schedule-ical-feed-refresh", daemon=True
+    )
+    thread.start()
+    logging.info("Запущено фоновое обновление календарей подписки")
+    return thread
@@ -29,19 +29,24 @@ from ..core.classes.PlanMatrixProcessor import (
 from ..core.forms import ChoosePlan
 from ..core.func.app_core import allowed_file
 from ..core.func.education_plan import (
-    discipline_competency_add,
     get_education_plans,
     get_plan_education_specialties,
-    plan_competency_add,
-)
-from ..core.func.work_program import (
-    work_program_competency_data_add,
-    work_program_competency_level_add,
-    work_program_competency_level_edit,
-    work_programs_competencies_level_del,
 )
+from ..core.func.work_program import work_programs_competencies_level_del
 from ..core.reports.plans_comp_matrix import generate_plans_comp_matrix
 from ..core.reports.plans_indicators_file import generate_indicators_file
+from ..core.services.apeks_db_mm_competency_levels_service import (
+    get_apeks_db_mm_competency_levels_service,
+)
+from ..core.services.apeks_db_mm_work_programs_competencies_data_service import (
+    get_apeks_db_mm_work_programs_competencies_data_service,
+)
+from ..core.services.apeks_db_plan_competencies_service import (
+    get_apeks_db_plan_competencies_service,
+)
+from ..core.services.apeks_db_plan_curriculum_discipline_competencies_service import (
+    get_apeks_db_plan_curriculum_discipline_competencies_service,
+)
 
 
 class PlanChoosePlanView(View):
@@ -157,18 +162,29 @@ async def competencies_load(plan_id):
                 )
         # Загрузка компетенций
         if request.form.get("file_load"):
-            left_node, right_node = 1, 2
-            for comp in comps:
-                code = comp[0]
-                description = comp[1]
-                await plan_competency_add(
-                    plan_id, code, description, left_node, right_node
-                )
-                left_node += 2
-                right_node += 2
+            plan_competencies_service = get_apeks_db_plan_competencies_service()
+            result = await plan_competencies_service.bulk_create(
+                [
+                    {
+                        "education_plan_id": plan_id,
+                        "code": comp[0],
+                        "description": comp[1],
+                        "level": 1,
+                        "left_node": 2 * index + 1,
+                        "right_node": 2 * index + 2,
+                    }
+                    for index, comp in enumerate(comps)
+                ]
+            )
             os.remove(file)
             logging.info(f"{current_user} произвел загрузку компетенций")
-            flash("Данные успешно загружены", category="success")
+            if result.errors:
+                flash(
+                    f"Не загружено компетенций - {len(result.errors)}",
+                    category="danger",
+                )
+            else:
+                flash("Данные успешно загружены", category="success")
             return redirect(url_for("plans.competencies_load", plan_id=plan_id))
     return render_template(
         "plans/competencies_load.html",
@@ -231,17 +247,26 @@ async def matrix_simple_load(plan_id):
                     )
         # Загрузка связей
         if request.form.get("file_load"):
-            for disc in match_data:
-                if match_data[disc].get("comps"):
-                    for comp in match_data[disc].get("comps"):
-                        await discipline_competency_add(
-                            match_data[disc].get("id"), match_data[disc]["comps"][comp]
-                        )
+            disc_comp_service = (
+                get_apeks_db_plan_curriculum_discipline_competencies_service()
+            )
+            result = await disc_comp_service.bulk_create(
+                [
+                    {
+                        "curriculum_discipline_id": match_data[disc].get("id"),
+                        "competency_id": match_data[disc]["comps"][comp],
+                    }
+                    for disc in match_data
+                    for comp in match_data[disc].get("comps") or {}
+                ]
+            )
             os.remove(file)
-            logging.info(
-                f"{current_user} произвел загрузку связей дисциплин и компетенций"
+            message = (
+                f"Добавлены связи дисциплин и компетенций - {result.count}"
+                + result.errors_message()
             )
-            flash("Данные успешно загружены", category="success")
+            logging.info(f"{current_user} - {message}")
+            flash(message, category="danger" if result.errors else "success")
             return redirect(url_for("plans.matrix_simple_load", plan_id=plan_id))
     return render_template(
         "plans/matrix_simple_load.html",
@@ -329,19 +354,22 @@ async def matrix_indicator_load(plan_id):
         if request.form.get("file_load"):
             # Загрузка связей
             if request.form.get("switch_relations"):
-                comp_relations_counter = 0
-                for disc in match_data:
-                    if match_data[disc].get("comps"):
-                        for comp in match_data[disc].get("comps"):
-                            resp = await discipline_competency_add(
-                                match_data[disc].get("id"),
-                                match_data[disc]["comps"][comp].get("id"),
-                            )
-                            if resp.get("data"):
-                                comp_relations_counter += int(resp.get("data"))
+                disc_comp_service = (
+                    get_apeks_db_plan_curriculum_discipline_competencies_service()
+                )
+                result = await disc_comp_service.bulk_create(
+                    [
+                        {
+                            "curriculum_discipline_id": match_data[disc].get("id"),
+                            "competency_id": match_data[disc]["comps"][comp].get("id"),
+                        }
+                        for disc in match_data
+                        for comp in match_data[disc].get("comps") or {}
+                    ]
+                )
                 message = (
-                    f"Добавлены связи дисциплин и компетенций - "
-                    f"{comp_relations_counter}"
+                    f"Добавлены связи дисциплин и компетенций - {result.count}"
+                    + result.errors_message()
                 )
                 logging.info(f"{current_user} - {message}")
                 flash(message, category="success")
@@ -358,7 +386,6 @@ async def matrix_indicator_load(plan_id):
                 logging.info(f"{current_user} - {message}")
                 flash(message, category="success")
 
-                comp_add_counter = 0
                 # Очищаем ранее загруженные в программу данные
                 await plan_competencies_data_cleanup(
                     plan_id,
@@ -367,39 +394,39 @@ async def matrix_indicator_load(plan_id):
                     relations=False,
                     work_program=True,
                 )
-                for comp_data in program_competency_add:
-                    resp = await work_program_competency_data_add(comp_data)
-                    if resp.get("data"):
-                        comp_add_counter += int(resp.get("data"))
+                comp_data_service = (
+                    get_apeks_db_mm_work_programs_competencies_data_service()
+                )
+                result = await comp_data_service.bulk_create(program_competency_add)
                 message = (
                     "Добавлена информация об индикаторах компетенций "
-                    f"в рабочие программы - {comp_add_counter}"
+                    f"в рабочие программы - {result.count}"
+                    + result.errors_message()
                 )
                 logging.info(f"{current_user} - {message}")
                 flash(message, category="success")
 
-                level_add_counter = 0
-                for level_add in program_comp_level_add:
-                    resp = await work_program_competency_level_add(level_add)
-                    if resp.get("data"):
-                        level_add_counter += int(resp.get("data"))
+                comp_levels_service = get_apeks_db_mm_competency_levels_service()
+                result = await comp_levels_service.bulk_create(program_comp_level_add)
                 message = (
                     "Добавлены отсутствовавшие уровни формирования "
-                    f"компетенций - {level_add_counter}"
+                    f"компетенций - {result.count}" + result.errors_message()
                 )
                 logging.info(f"{current_user} - {message}")
                 flash(message, category="success")
 
-                level_edit_counter = 0
-                for wp in program_comp_level_edit:
-                    resp = await work_program_competency_level_edit(
-                        work_program_id=wp, fields=program_comp_level_edit[wp]
-                    )
-                    if resp.get("data"):
-                        level_edit_counter += int(resp.get("data"))
+                result = await comp_levels_service.bulk_update(
+                    [
+                        (
+                            {"work_program_id": wp, "level": Apeks.BASE_COMP_LEVEL},
+                            program_comp_level_edit[wp],
+                        )
+                        for wp in program_comp_level_edit
+                    ]
+                )
                 message = (
                     "Отредактированы уровни формирования "
-                    f"компетенций - {level_edit_counter}"
+                    f"компетенций - {result.count}" + result.errors_message()
                 )
                 logging.info(f"{current_user} - {message}")
                 flash(message, category="success")
@@ -1,13 +1,14 @@
 from flask_wtf import FlaskForm
-from wtforms import SelectField, SubmitField
+from wtforms import SelectField, SelectMultipleField, SubmitField
 from wtforms.fields.datetime import DateField
-from wtforms.validators import DataRequired
+from wtforms.validators import DataRequired, InputRequired
 
 from config import ApeksConfig as Apeks
 
 
 class LoadReportForm(FlaskForm):
-    department = SelectField("Кафедра:", coerce=int, validators=[DataRequired()])
+    # 0 - отчет о нагрузке всех кафедр
+    department = SelectField("Кафедра:", coerce=int, validators=[InputRequired()])
     year = SelectField(
         "Год",
         coerce=int,
@@ -60,6 +61,23 @@ class HolidaysReportForm(FlaskForm):
     holidays_report = SubmitField("Cформировать")
 
 
+class HolidaysAnalyticsForm(FlaskForm):
+    """Форма для формирования отчета о работе в выходные дни за несколько лет."""
+
+    year_start = SelectField(
+        "Первый учебный год",
+        coerce=int,
+        validators=[DataRequired()],
+    )
+    year_end = SelectField(
+        "Последний учебный год",
+        coerce=int,
+        validators=[DataRequired()],
+    )
+    departments = SelectMultipleField("Кафедры (все, если не выбраны)", coerce=int)
+    holidays_analytics = SubmitField("Cформировать")
+
+
 class ProductionCalendarForm(FlaskForm):
     """Форма для заполнения производственного календаря."""
 
@@ -0,0 +1,273 @@
+import asyncio
+from calendar import monthrange
+from datetime import date, timedelta
+
+from config import ApeksConfig
+from ..core.classes.EducationStaff import EducationStaff
+from ..core.classes.InstituteLoadReportProcessor import InstituteLoadReportProcessor
+from ..core.classes.LoadReportProcessor import LoadReportProcessor
+from ..core.classes.MonthlyLoadReport import MonthlyLoadReport
+from ..core.func.api_get import api_get_db_table, check_api_db_response
+from ..core.func.organization import get_departments
+from ..core.func.staff import get_state_staff
+from ..core.services.apeks_db_schedule_day_schedule_lessons_service import (
+    get_db_apeks_schedule_day_schedule_lessons_service,
+)
+from ..core.services.db_load_aggregates_service import (
+    get_load_monthly_aggregates_service,
+)
+
+
+async def get_db_table_data(table_name: str, **kwargs) -> list:
+    """Возвращает данные таблицы базы данных Апекс-ВУЗ по ее названию."""
+    return await check_api_db_response(
+        await api_get_db_table(ApeksConfig.TABLES.get(table_name), **kwargs)
+    )
+
+
+async def get_period_lessons_data(year: int, month_start: int, month_end: int) -> list:
+    """
+    Возвращает занятия за период (с первого дня начального месяца
+    по последний день конечного месяца). Период запрашивается частями,
+    см. 'ApeksConfig.LESSONS_WINDOW'.
+    """
+    lessons_service = get_db_apeks_schedule_day_schedule_lessons_service()
+    return await lessons_service.get_lessons(
+        date(year, month_start, 1),
+        date(year, month_end, monthrange(year, month_end)[1]),
+    )
+
+
+async def get_education_staff(
+    year: int, month_start: int, month_end: int, **history_filter
+) -> EducationStaff:
+    """
+    Возвращает сведения о преподавательском составе кафедр за период
+    (экземпляр класса "EducationStaff").
+
+    Parameters
+    ----------
+        year: int
+            год (число 20xx)
+        month_start: int
+            начальный месяц (число 1-12)
+        month_end: int
+            конечный месяц (число 1-12)
+        **history_filter
+            фильтр таблицы 'state_staff_history' (например, department_id)
+    """
+    state_staff, staff_history, staff_positions, departments = await asyncio.gather(
+        get_state_staff(),
+        get_db_table_data("state_staff_history", **history_filter),
+        get_db_table_data("state_staff_positions"),
+        get_departments(department_filter="kafedra"),
+    )
+    return EducationStaff(
+        year,
+        month_start,
+        month_end,
+        state_staff=state_staff,
+        state_staff_history=staff_history,
+        state_staff_positions=staff_positions,
+        departments=departments,
+    )
+
+
+def is_month_closed(year: int, month: int) -> bool:
+    """
+    Проверяет, закрыт ли месяц (прошло не менее
+    'ApeksConfig.LOAD_MONTH_CLOSE_DAYS' дней после его окончания).
+    """
+    month_end = date(year, month, monthrange(year, month)[1])
+    return date.today() - month_end >= timedelta(days=ApeksConfig.LOAD_MONTH_CLOSE_DAYS)
+
+
+async def get_load_report_processor(
+    year: int, month_start: int, month_end: int, department_id: int
+) -> LoadReportProcessor:
+    """
+    Получает данные для отчета о нагрузке кафедры и возвращает
+    экземпляр класса "LoadReportProcessor".
+
+    Независимые запросы к API Апекс-ВУЗ выполняются одновременно
+    (в пределах ограничения количества одновременных запросов клиента API).
+    Сведения о преподавателях занятий запрашиваются после получения
+    состава кафедры, не дожидаясь остальных данных.
+
+    Parameters
+    ----------
+        year: int
+            год (число 20xx)
+        month_start: int
+            начальный месяц (число 1-12)
+        month_end: int
+            конечный месяц (число 1-12)
+        department_id: int
+            id кафедры
+    """
+
+    async def get_department_staff() -> tuple[EducationStaff, dict, list]:
+        staff = await get_education_staff(
+            year, month_start, month_end, department_id=department_id
+        )
+        department_staff = staff.department_staff(department_id)
+        lessons_staff = await get_db_table_data(
+            "schedule_day_schedule_lessons_staff", staff_id=[*department_staff]
+        )
+        return staff, department_staff, lessons_staff
+
+    (
+        (staff, department_staff, lessons_staff),
+        schedule_lessons,
+        load_groups,
+        load_subgroups,
+        plan_education_plans,
+        plan_education_plans_education_forms,
+    ) = await asyncio.gather(
+        get_department_staff(),
+        get_period_lessons_data(year, month_start, month_end),
+        get_db_table_data("load_groups"),
+        get_db_table_data("load_subgroups"),
+        get_db_table_data("plan_education_plans"),
+        get_db_table_data("plan_education_plans_education_forms"),
+    )
+    return LoadReportProcessor(
+        year=year,
+        month_start=month_start,
+        month_end=month_end,
+        department_id=department_id,
+        departments=staff.departments,
+        department_staff=department_staff,
+        schedule_lessons=schedule_lessons,
+        schedule_lessons_staff=lessons_staff,
+        load_groups=load_groups,
+        load_subgroups=load_subgroups,
+        plan_education_plans=plan_education_plans,
+        plan_education_plans_education_forms=plan_education_plans_education_forms,
+        staff_history_data=staff.staff_history_index(),
+    )
+
+
+async def get_institute_load_report_processor(
+    year: int, month_start: int, month_end: int
+) -> InstituteLoadReportProcessor:
+    """
+    Получает данные для отчета о нагрузке всех кафедр и возвращает
+    экземпляр класса "InstituteLoadReportProcessor".
+
+    Занятия и справочные таблицы запрашиваются один раз для всех кафедр,
+    запросы к API Апекс-ВУЗ выполняются одновременно.
+
+    Parameters
+    ----------
+        year: int
+            год (число 20xx)
+        month_start: int
+            начальный месяц (число 1-12)
+        month_end: int
+            конечный месяц (число 1-12)
+    """
+
+    async def get_departments_staff() -> tuple[EducationStaff, dict, list]:
+        staff = await get_education_staff(year, month_start, month_end)
+        departments_staff = {
+            department_id: staff.department_staff(department_id)
+            for department_id in staff.departments
+        }
+        staff_ids = {
+            staff_id
+            for department_staff in departments_staff.values()
+            for staff_id in department_staff
+        }
+        lessons_staff = await get_db_table_data(
+            "schedule_day_schedule_lessons_staff", staff_id=sorted(staff_ids)
+        )
+        return staff, departments_staff, lessons_staff
+
+    (
+        (staff, departments_staff, lessons_staff),
+        schedule_lessons,
+        load_groups,
+        load_subgroups,
+        plan_education_plans,
+        plan_education_plans_education_forms,
+    ) = await asyncio.gather(
+        get_departments_staff(),
+        get_period_lessons_data(year, month_start, month_end),
+        get_db_table_data("load_groups"),
+        get_db_table_data("load_subgroups"),
+        get_db_table_data("plan_education_plans"),
+        get_db_table_data("plan_education_plans_education_forms"),
+    )
+    return InstituteLoadReportProcessor(
+        year=year,
+        month_start=month_start,
+        month_end=month_end,
+        departments=staff.departments,
+        departments_staff=departments_staff,
+        schedule_lessons=schedule_lessons,
+        schedule_lessons_staff=lessons_staff,
+        load_groups=load_groups,
+        load_subgroups=load_subgroups,
+        plan_education_plans=plan_education_plans,
+        plan_education_plans_education_forms=plan_education_plans_education_forms,
+        staff_history_data=staff.staff_history_index(),
+    )
+
+
+async def get_load_report(
+    year: int, month_start: int, month_end: int, department_id: int
+) -> LoadReportProcessor | MonthlyLoadReport:
+    """
+    Возвращает данные для отчета о нагрузке кафедры.
+
+    Если включено сохранение помесячной нагрузки
+    ('ApeksConfig.LOAD_AGGREGATES'), нагрузка рассчитывается отдельно
+    за каждый месяц периода и суммируется. Нагрузка за закрытые месяцы
+    сохраняется в локальной базе данных и при повторных запросах
+    не пересчитывается, рассчитываются только открытые (текущий)
+    и не сохраненные ранее месяцы.
+
+    Parameters
+    ----------
+        year: int
+            год (число 20xx)
+        month_start: int
+            начальный месяц (число 1-12)
+        month_end: int
+            конечный месяц (число 1-12)
+        department_id: int
+            id кафедры
+    """
+    if not ApeksConfig.LOAD_AGGREGATES:
+        return await get_load_report_processor(
+            year, month_start, month_end, department_id
+        )
+    aggregates_service = get_load_monthly_aggregates_service()
+
+    async def get_month_load(month: int) -> dict:
+        closed = is_month_closed(year, month)
+        if closed:
+            load_data = aggregates_service.get_month_load(year, month, department_id)
+            if load_data is not None:
+                return load_data
+        load = await get_load_report_processor(year, month, month, department_id)
+        if closed:
+            aggregates_service.save_month_load(
+                year, month, department_id, load.load_data
+            )
+        return load.load_data
+
+    staff, *monthly_load = await asyncio.gather(
+        get_education_staff(year, month_start, month_end, department_id=department_id),
+        *(get_month_load(month) for month in range(month_start, month_end + 1)),
+    )
+    return MonthlyLoadReport(
+        year=year,
+        month_start=month_start,
+        month_end=month_end,
+        department_id=department_id,
+        departments=staff.departments,
+        department_staff=staff.department_staff(department_id),
+        monthly_load=monthly_load,
+    )
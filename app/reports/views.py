@@ -7,26 +7,30 @@ from flask.views import View
 from flask_login import login_required
 from werkzeug.utils import redirect
 
-from config import ApeksConfig, PermissionsConfig
+from config import PermissionsConfig
 from . import bp
-from .forms import LoadReportForm, HolidaysReportForm, ProductionCalendarForm
-from ..auth.func import permission_required
-from ..core.classes.EducationStaff import EducationStaff
-from ..core.classes.LoadReportProcessor import LoadReportProcessor
-from ..core.db.database import db
-from ..core.db.reports_models import (
-    ProductionCalendarHolidays,
-    ProductionCalendarWorkingDays,
+from .forms import (
+    HolidaysAnalyticsForm,
+    HolidaysReportForm,
+    LoadReportForm,
+    ProductionCalendarForm,
 )
+from .func import get_institute_load_report_processor, get_load_report
+from ..auth.func import permission_required
+from ..core.classes.HolidaysAnalytics import MAX_ACADEMIC_YEARS
 from ..core.forms import ObjectDeleteForm
-from ..core.func.api_get import check_api_db_response, api_get_db_table, get_lessons
-from ..core.func.organization import get_departments
-from ..core.func.staff import get_state_staff
+from ..core.reports.holidays_analytics_report import (
+    generate_holidays_analytics_report,
+)
 from ..core.reports.holidays_report import generate_holidays_report
-from ..core.reports.load_report import generate_load_report
+from ..core.reports.load_report import (
+    generate_institute_load_report,
+    generate_load_report,
+)
 from ..core.repository.sqlalchemy_repository import DbRepository
 from ..core.services.apeks_db_state_departments_service import get_db_apeks_state_departments_service
 from ..core.services.db_production_calendar_services import (
+    get_production_calendar_service,
     get_productions_calendar_holidays_service,
     get_productions_calendar_working_days_service,
 )
@@ -40,7 +44,9 @@ async def load_report():
     year = date.today().year
     month = date.today().month
     form = LoadReportForm()
-    form.department.choices = [(k, v.get("full")) for k, v in departments.items()]
+    form.department.choices = [(0, "Все кафедры")] + [
+        (k, v.get("full")) for k, v in departments.items()
+    ]
     form.year.choices = [year - 1, year, year + 1]
     form.year.data = year
     form.month.data = f"{month}-{month}"
@@ -55,6 +61,15 @@ async def load_report():
             f"year={year}, month_start={month_start}, "
             f"month_end={month_end}, department={department}"
         )
+        if int(department) == 0:
+            return redirect(
+                url_for(
+                    "reports.institute_load_report_export",
+                    year=year,
+                    month_start=month_start,
+                    month_end=month_end,
+                )
+            )
         return redirect(
             url_for(
                 "reports.load_report_export",
@@ -73,60 +88,22 @@ async def load_report():
 )
 @login_required
 async def load_report_export(year, month_start, month_end, department_id):
-    departments_service = get_db_apeks_state_departments_service()
-    staff = EducationStaff(
-        year,
-        month_start,
-        month_end,
-        state_staff=await get_state_staff(),
-        state_staff_history=await check_api_db_response(
-            await api_get_db_table(
-                ApeksConfig.TABLES.get("state_staff_history"),
-                department_id=department_id,
-            )
-        ),
-        state_staff_positions=await check_api_db_response(
-            await api_get_db_table(ApeksConfig.TABLES.get("state_staff_positions"))
-        ),
-        departments=await get_departments(department_filter="kafedra"),
-    )
-    department_staff = staff.department_staff(department_id)
-    load = LoadReportProcessor(
-        year=year,
-        month_start=month_start,
-        month_end=month_end,
-        department_id=department_id,
-        departments=staff.departments,
-        department_staff=department_staff,
-        schedule_lessons=await check_api_db_response(
-            await get_lessons(year, month_start, month_end)
-        ),
-        schedule_lessons_staff=await check_api_db_response(
-            await api_get_db_table(
-                ApeksConfig.TABLES.get("schedule_day_schedule_lessons_staff"),
-                staff_id=[*department_staff],
-            )
-        ),
-        load_groups=await check_api_db_response(
-            await api_get_db_table(ApeksConfig.TABLES.get("load_groups"))
-        ),
-        load_subgroups=await check_api_db_response(
-            await api_get_db_table(ApeksConfig.TABLES.get("load_subgroups"))
-        ),
-        plan_education_plans=await check_api_db_response(
-            await api_get_db_table(ApeksConfig.TABLES.get("plan_education_plans"))
-        ),
-        plan_education_plans_education_forms=await check_api_db_response(
-            await api_get_db_table(
-                ApeksConfig.TABLES.get("plan_education_plans_education_forms"),
-            )
-        ),
-        staff_history_data=staff.staff_history(),
-    )
+    load = await get_load_report(year, month_start, month_end, department_id)
     filename = generate_load_report(load)
     return redirect(url_for("main.get_file", filename=filename))
 
 
+@bp.route(
+    "/load_report/<int:year>/<int:month_start>/<int:month_end>/all",
+    methods=["GET", "POST"],
+)
+@login_required
+async def institute_load_report_export(year, month_start, month_end):
+    load = await get_institute_load_report_processor(year, month_start, month_end)
+    filename = generate_institute_load_report(load)
+    return redirect(url_for("main.get_file", filename=filename))
+
+
 @bp.route("/holidays_report", methods=["GET", "POST"])
 @permission_required(PermissionsConfig.REPORT_HOLIDAYS_PERMISSION)
 @login_required
@@ -170,18 +147,71 @@ async def holidays_report():
 @permission_required(PermissionsConfig.REPORT_HOLIDAYS_PERMISSION)
 @login_required
 async def holiday_report_export(year, month_start, month_end):
-    non_working = [
-        d.date
-        for d in DbRepository(ProductionCalendarHolidays, db_session=db.session).list()
-    ]
-    working_sat = [
-        d.date
-        for d in DbRepository(
-            ProductionCalendarWorkingDays, db_session=db.session
-        ).list()
-    ]
     filename = await generate_holidays_report(
-        year, month_start, month_end, working_sat, non_working
+        year,
+        month_start,
+        month_end,
+        get_production_calendar_service().get_calendar(),
+    )
+    return redirect(url_for("main.get_file", filename=filename))
+
+
+@bp.route("/holidays_analytics", methods=["GET", "POST"])
+@permission_required(PermissionsConfig.REPORT_HOLIDAYS_PERMISSION)
+@login_required
+async def holidays_analytics():
+    departments_service = get_db_apeks_state_departments_service()
+    departments = await departments_service.get_departments(department_filter="kafedra")
+    today = date.today()
+    # Текущий учебный год (начинается в сентябре)
+    year = today.year if today.month >= 9 else today.year - 1
+    form = HolidaysAnalyticsForm()
+    form.year_start.choices = form.year_end.choices = [
+        (y, f"{y}/{y + 1}") for y in range(year - MAX_ACADEMIC_YEARS + 1, year + 1)
+    ]
+    form.departments.choices = [(k, v.get("full")) for k, v in departments.items()]
+    if request.method == "POST" and form.validate_on_submit():
+        year_start = min(form.year_start.data, form.year_end.data)
+        year_end = max(form.year_start.data, form.year_end.data)
+        logging.info(
+            f"view функция reports.holidays_analytics передала "
+            f"year_start={year_start}, year_end={year_end}, "
+            f"departments={form.departments.data}"
+        )
+        return redirect(
+            url_for(
+                "reports.holidays_analytics_export",
+                year_start=year_start,
+                year_end=year_end,
+                department=form.departments.data,
+            )
+        )
+    form.year_start.data = year - 1
+    form.year_end.data = year
+    return render_template(
+        "reports/holidays_analytics.html", active="reports", form=form
+    )
+
+
+@bp.route(
+    "/holidays_analytics/<int:year_start>/<int:year_end>",
+    methods=["GET", "POST"],
+)
+@permission_required(PermissionsConfig.REPORT_HOLIDAYS_PERMISSION)
+@login_required
+async def holidays_analytics_export(year_start, year_end):
+    if not 0 <= year_end - year_start < MAX_ACADEMIC_YEARS:
+        flash(
+            f"Отчет формируется не более чем за {MAX_ACADEMIC_YEARS} учебных лет",
+            category="danger",
+        )
+        return redirect(url_for("reports.holidays_analytics"))
+    department_ids = request.args.getlist("department", type=int)
+    filename = await generate_holidays_analytics_report(
+        year_start,
+        year_end,
+        get_production_calendar_service().get_calendar(),
+        department_ids or None,
     )
     return redirect(url_for("main.get_file", filename=filename))
 
@@ -249,6 +279,7 @@ class ProductionCalendarAddView(View):
             self.service.create(
                 date=date.fromisoformat(request.form.get("date")),
             )
+            get_production_calendar_service().invalidate()
             flash(
                 f"Запись {request.form.get('date')} успешно добавлена",
                 category="success",
@@ -305,6 +336,7 @@ class ProductionCalendarEditView(View):
                 id_,
                 date=date.fromisoformat(request.form.get("date")),
             )
+            get_production_calendar_service().invalidate()
             flash(
                 f"Запись {request.form.get('date')} успешно обновлена",
                 category="success",
@@ -359,6 +391,7 @@ class ProductionCalendarDeleteView(View):
         current_date = str(obj.date)
         if request.method == "POST" and form.validate_on_submit():
             self.service.delete(obj.id)
+            get_production_calendar_service().invalidate()
             flash(
                 f"Запись {current_date} успешно удалена",
                 category="success",
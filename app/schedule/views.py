@@ -1,7 +1,15 @@
 from datetime import date
 import logging
 
-from flask import flash, redirect, render_template, request, url_for
+from flask import (
+    abort,
+    flash,
+    make_response,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
 
 from config import ApeksConfig as Apeks
 from . import bp
@@ -20,6 +28,7 @@ from ..core.func.staff import get_state_staff
 from ..core.reports.schedule_ical import generate_schedule_ical
 from ..core.reports.schedule_xlsx import generate_schedule_xlsx
 from ..core.services.apeks_db_state_departments_service import get_db_apeks_state_departments_service
+from ..core.services.schedule_ical_feed_service import get_schedule_ical_feed_service
 
 
 @bp.route("/schedule", methods=["GET", "POST"])
@@ -103,3 +112,21 @@ async def schedule():
             department=department,
         )
     return render_template("schedule/schedule.html", active="schedule", form=form)
+
+
+@bp.route("/schedule/ical/<int:staff_id>.ics")
+async def schedule_ical_feed(staff_id):
+    """
+    Календарь подписки на расписание преподавателя (iCal). Поддерживаются
+    условные запросы (If-None-Match - ответ 304).
+    """
+    feed_service = get_schedule_ical_feed_service()
+    feed = await feed_service.get_feed(staff_id)
+    if feed is None:
+        abort(404)
+    response = make_response(feed.content)
+    response.content_type = "text/calendar; charset=utf-8"
+    response.set_etag(feed.etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = feed_service.refresh_interval
+    return response.make_conditional(request)
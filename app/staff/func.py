@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import logging
 from typing import Any
@@ -427,6 +428,7 @@ async def lesson_skips_processor(
         "add": 0,
         "edit": 0,
         "delete": 0,
+        "errors": 0,
     }
     busy_data = {busy.slug: busy.match for busy in busy_types}
 
@@ -439,41 +441,54 @@ async def lesson_skips_processor(
         for student in document.absence_illness[illness]:
             students_skips[student] = str(ApeksConfig.ILLNESS_SKIP_ID)
 
+    marks_datetime = datetime.datetime.now()
+    marks_delete = []
+    marks_edit = []
     for mark in lesson_marks:
         student_id = mark.get("student_id")
         skip_reason_id = mark.get("skip_reason_id")
         user_id = mark.get("user_id")
         if user_id == str(ApeksConfig.BASE_USER_ID) and student_id in group_students:
+            filters = {
+                "journal_lesson_id": journal_lesson_id,
+                "student_id": student_id,
+                "user_id": user_id,
+            }
             if student_id not in students_skips:
-                delete_count = await student_marks_service.delete(
-                    journal_lesson_id=journal_lesson_id,
-                    student_id=student_id,
-                    user_id=user_id,
-                )
-                lesson_actions["delete"] += delete_count
+                marks_delete.append(filters)
             elif students_skips[student_id] != skip_reason_id:
-                filters = {
-                    "journal_lesson_id": journal_lesson_id,
-                    "student_id": student_id,
-                    "user_id": user_id,
-                }
                 fields = {
                     "skip_reason_id": students_skips[student_id],
-                    "datetime": datetime.datetime.now(),
+                    "datetime": marks_datetime,
                 }
-                edit_count = await student_marks_service.update(filters, fields)
-                lesson_actions["edit"] += edit_count
+                marks_edit.append((filters, fields))
         if student_id in students_skips:
             del students_skips[student_id]
 
-    for student_id, skip_reason_id in students_skips.items():
-        add_count = await student_marks_service.create(
-            journal_lesson_id=journal_lesson_id,
-            mark_type_id="1",
-            student_id=student_id,
-            skip_reason_id=skip_reason_id,
-            user_id=ApeksConfig.BASE_USER_ID,
-            datetime=datetime.datetime.now(),
-        )
-        lesson_actions["add"] += add_count
+    marks_add = [
+        {
+            "journal_lesson_id": journal_lesson_id,
+            "mark_type_id": "1",
+            "student_id": student_id,
+            "skip_reason_id": skip_reason_id,
+            "user_id": ApeksConfig.BASE_USER_ID,
+            "datetime": marks_datetime,
+        }
+        for student_id, skip_reason_id in students_skips.items()
+    ]
+    delete_result, edit_result, add_result = await asyncio.gather(
+        student_marks_service.bulk_delete(marks_delete),
+        student_marks_service.bulk_update(marks_edit),
+        student_marks_service.bulk_create(marks_add),
+    )
+    lesson_actions["delete"] = delete_result.count
+    lesson_actions["edit"] = edit_result.count
+    lesson_actions["add"] = add_result.count
+    for result in (delete_result, edit_result, add_result):
+        lesson_actions["errors"] += len(result.errors)
+        for error in set(result.errors.values()):
+            logging.error(
+                f"Ошибка внесения сведений в электронный журнал "
+                f"(занятие {journal_lesson_id}): {error}"
+            )
     return lesson_actions
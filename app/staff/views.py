@@ -947,8 +947,13 @@ async def staff_various_edit(daytime, group_id, course):
                                 f"{lesson_actions.get('edit')}, Удалено: "
                                 f"{lesson_actions.get('delete')}."
                             )
+                            if lesson_actions.get("errors"):
+                                message += f" Ошибок: {lesson_actions.get('errors')}."
                             logging.info(message, lesson_actions)
-                            flash(message, category="success")
+                            category = (
+                                "danger" if lesson_actions.get("errors") else "success"
+                            )
+                            flash(message, category=category)
 
             except PyMongoError as error:
                 message = f"Произошла ошибка записи данных: {error}"
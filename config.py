@@ -28,6 +28,23 @@ class FlaskConfig(object):
     ALLOWED_EXTENSIONS = {"xlsx", "csv"}
     USER_LOGIN_DURATION = timedelta(hours=8)
 
+    # Время хранения данных производственного календаря (секунды)
+    PRODUCTION_CALENDAR_CACHE_TTL = int(
+        os.getenv("PRODUCTION_CALENDAR_CACHE_TTL", 3600)
+    )
+
+    # Календари подписки на расписание преподавателей (iCal):
+    # количество месяцев (текущий и следующие)
+    SCHEDULE_ICAL_FEED_MONTHS = int(os.getenv("SCHEDULE_ICAL_FEED_MONTHS", 2))
+    # интервал фонового обновления (секунды)
+    SCHEDULE_ICAL_FEED_REFRESH_INTERVAL = int(
+        os.getenv("SCHEDULE_ICAL_FEED_REFRESH_INTERVAL", 900)
+    )
+    # время хранения календаря, который не запрашивается (секунды)
+    SCHEDULE_ICAL_FEED_IDLE_TTL = int(os.getenv("SCHEDULE_ICAL_FEED_IDLE_TTL", 604800))
+    # максимальное количество календарей в памяти рабочего процесса
+    SCHEDULE_ICAL_FEED_MAX_FEEDS = int(os.getenv("SCHEDULE_ICAL_FEED_MAX_FEEDS", 1000))
+
     # Pagination
     ITEMS_PER_PAGE = 15
     AVAILABLE_PAGES = 3
@@ -38,6 +55,12 @@ class FlaskConfig(object):
     AD_SERVER = os.getenv("AD_SERVER")
     AD_SEARCH_TREE = os.getenv("AD_SEARCH_TREE")
 
+    # Токен доступа к метрикам /metrics (если не задан - доступ запрещен)
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    # Доступ к метрикам без токена (только для закрытой сети, метрики
+    # содержат имена таблиц и нагрузку на API АпексВУЗ)
+    METRICS_PUBLIC = os.getenv("METRICS_PUBLIC") in ("True", "true", "1")
+
     ORGANIZATION_NAME: str = os.getenv("ORGANIZATION_NAME", "Образовательная организация")
 
 
@@ -163,6 +186,139 @@ class ApeksConfig(object):
     STUDENT_SCHEDULE_ENDPOINT = f"{URL}/api/call/schedule-schedule/student"
     STAFF_SCHEDULE_ENDPOINT = f"{URL}/api/call/schedule-schedule/staff"
 
+    # Настройки пула HTTP соединений к API АпексВУЗ
+    # Максимальное количество соединений
+    HTTP_MAX_CONNECTIONS = int(os.getenv("APEKS_HTTP_MAX_CONNECTIONS", 20))
+    # Количество поддерживаемых (keep-alive) соединений
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = int(
+        os.getenv("APEKS_HTTP_MAX_KEEPALIVE_CONNECTIONS", 10)
+    )
+    # Время жизни неиспользуемого соединения (секунды)
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv("APEKS_HTTP_KEEPALIVE_EXPIRY", 30))
+    # Таймаут запроса (секунды)
+    HTTP_TIMEOUT = float(os.getenv("APEKS_HTTP_TIMEOUT", 5))
+    # Количество повторных попыток установки соединения
+    HTTP_RETRIES = int(os.getenv("APEKS_HTTP_RETRIES", 3))
+    # Использовать HTTP/2 (требуется пакет 'h2')
+    HTTP2 = os.getenv("APEKS_HTTP2", "true") in ("True", "true", "1")
+    # Максимальное количество одновременно выполняемых запросов
+    HTTP_MAX_CONCURRENCY = int(os.getenv("APEKS_HTTP_MAX_CONCURRENCY", 8))
+    # Ограничение частоты запросов к каждой точке доступа (запросов в секунду)
+    RATE_LIMIT = float(os.getenv("APEKS_RATE_LIMIT", 10))
+    # Количество запросов, которые можно выполнить без ожидания
+    RATE_LIMIT_BURST = int(os.getenv("APEKS_RATE_LIMIT_BURST", 10))
+    # Минимальная частота запросов при замедлении или ошибках сервера
+    RATE_LIMIT_MIN = float(os.getenv("APEKS_RATE_LIMIT_MIN", 1))
+    # Время ответа (секунды), при превышении которого частота запросов снижается
+    RATE_LIMIT_LATENCY = float(os.getenv("APEKS_RATE_LIMIT_LATENCY", 10))
+
+    # Автоматический выключатель запросов при недоступности API
+    # Количество ошибок подряд, после которого запросы приостанавливаются
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("APEKS_CIRCUIT_FAILURE_THRESHOLD", 5))
+    # Время (секунды) до пробного запроса после приостановки
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv("APEKS_CIRCUIT_RESET_TIMEOUT", 30))
+    # Таблицы, последние ответы для которых сохраняются и выдаются
+    # при недоступности API (справочники и данные форм учета личного состава)
+    STALE_TABLES = frozenset(
+        {
+            "load_groups",
+            "load_subgroups",
+            "plan_disciplines",
+            "plan_education_plans",
+            "plan_education_plans_education_forms",
+            "state_departments",
+            "state_staff",
+            "state_staff_history",
+            "state_staff_positions",
+            "state_vacancies",
+        }
+    )
+    # Максимальный общий размер сохраняемых ответов (байт, в формате JSON)
+    STALE_MAX_BYTES = int(os.getenv("APEKS_STALE_MAX_BYTES", 16 * 1024 * 1024))
+    # Интервал (секунды) фонового обновления выдаваемого сохраненного ответа
+    STALE_REFRESH_INTERVAL = float(os.getenv("APEKS_STALE_REFRESH_INTERVAL", 30))
+
+    # Границы интервалов гистограммы времени выполнения запросов (секунды)
+    METRICS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    # Максимальное количество значений фильтра-списка в одном запросе
+    # (большие списки разделяются на несколько запросов)
+    FILTER_CHUNK_SIZE = int(os.getenv("APEKS_FILTER_CHUNK_SIZE", 200))
+
+    # Количество одновременно выполняемых запросов групповых операций
+    # (bulk_create, bulk_update, bulk_delete)
+    BULK_CONCURRENCY = int(os.getenv("APEKS_BULK_CONCURRENCY", 8))
+
+    # Запрос занятий за период частями (окнами): 'month' - по месяцам,
+    # 'week' - по неделям, 'period' - весь период одним запросом
+    LESSONS_WINDOW = os.getenv("APEKS_LESSONS_WINDOW", "month")
+    # Количество одновременно запрашиваемых частей периода
+    LESSONS_WINDOW_CONCURRENCY = int(os.getenv("APEKS_LESSONS_WINDOW_CONCURRENCY", 4))
+
+    # Кэширование ответов API для редко изменяемых таблиц
+    # Время хранения данных таблиц в кэше (секунды)
+    CACHE_TABLES_TTL = {
+        "load_groups": 600,
+        "load_subgroups": 600,
+        "plan_disciplines": 3600,
+        "plan_education_plans": 3600,
+        "plan_education_plans_education_forms": 3600,
+        "state_departments": 3600,
+        "state_staff_positions": 3600,
+    }
+    # Максимальное количество записей в кэше
+    CACHE_MAXSIZE = int(os.getenv("APEKS_CACHE_MAXSIZE", 256))
+
+    # Локальная копия (зеркало) таблиц АпексВУЗ в SQLite
+    # Использовать зеркало для чтения данных и запускать фоновую синхронизацию
+    MIRROR_ENABLED = os.getenv("APEKS_MIRROR_ENABLED", "false") in ("True", "true", "1")
+    # Путь к файлу базы данных зеркала
+    MIRROR_DB_PATH = os.getenv(
+        "APEKS_MIRROR_DB_PATH", os.path.join(BASEDIR, "apeks_mirror.db")
+    )
+    # Интервал инкрементальной синхронизации (секунды)
+    MIRROR_SYNC_INTERVAL = int(os.getenv("APEKS_MIRROR_SYNC_INTERVAL", 300))
+    # Интервал полной синхронизации (секунды)
+    MIRROR_FULL_SYNC_INTERVAL = int(os.getenv("APEKS_MIRROR_FULL_SYNC_INTERVAL", 86400))
+    # Время с последней синхронизации (секунды), после которого данные
+    # зеркала не используются и запросы выполняются к API
+    MIRROR_MAX_AGE = int(os.getenv("APEKS_MIRROR_MAX_AGE", 1800))
+    # Период хранения занятий: дней до и после текущей даты
+    MIRROR_LESSONS_DAYS_BACK = int(os.getenv("APEKS_MIRROR_LESSONS_DAYS_BACK", 730))
+    MIRROR_LESSONS_DAYS_FORWARD = int(
+        os.getenv("APEKS_MIRROR_LESSONS_DAYS_FORWARD", 180)
+    )
+    # Период обновления занятий при инкрементальной синхронизации
+    # (дней до текущей даты)
+    MIRROR_LESSONS_RECENT_DAYS = int(os.getenv("APEKS_MIRROR_LESSONS_RECENT_DAYS", 45))
+    # Таблицы зеркала и способ их синхронизации:
+    # 'full' - полная загрузка таблицы,
+    # 'timestamp' - загрузка записей, измененных после последней синхронизации
+    # (по полю 'timestamp'),
+    # 'date' - загрузка записей за период (по полю 'date'),
+    # 'lessons' - загрузка записей для занятий, обновленных в зеркале.
+    # 'indexes' - индексируемые поля, 'key' - поля ключа записи.
+    # В зеркало включаются только таблицы, которые читаются через
+    # ApeksApiDbService (чтение через api_get_db_table зеркало не использует)
+    MIRROR_TABLES = {
+        "schedule_day_schedule_lessons": {
+            "sync": "date",
+            "indexes": ("date", "group_id", "discipline_id"),
+        },
+        "schedule_day_schedule_lessons_staff": {
+            "sync": "lessons",
+            "indexes": ("lesson_id", "staff_id"),
+        },
+        "state_staff_history": {
+            "sync": "timestamp",
+            "indexes": ("staff_id", "department_id"),
+        },
+        "state_staff": {"sync": "full"},
+        "state_departments": {"sync": "full"},
+        "load_groups": {"sync": "full", "indexes": ("education_plan_id",)},
+        "load_subgroups": {"sync": "full", "indexes": ("group_id",)},
+    }
+
     # Типы подразделений (для поля type таблицы "state_departments")
     TYPE_DEPARTM = "0"
     TYPE_KAFEDRA = "1"
@@ -175,6 +331,8 @@ class ApeksConfig(object):
 
     # Таблицы базы данных Апекс-ВУЗ, используемые в приложении
     LOAD_GROUPS_TABLE = "load_groups"
+    SCHEDULE_DAY_SCHEDULE_LESSONS_TABLE = "schedule_day_schedule_lessons"
+    SCHEDULE_DAY_SCHEDULE_LESSONS_STAFF_TABLE = "schedule_day_schedule_lessons_staff"
     STATE_DEPARTMENTS_TABLE = "state_departments"
     STATE_SPECIAL_RANKS = "state_special_ranks"
     STATE_STAFF_FIELD_DATA = "state_staff_field_data"
@@ -546,6 +704,19 @@ class ApeksConfig(object):
     # Типы обучающихся в отчете о нагрузке
     LOAD_STUDENT_TYPES = ("och", "zo_high", "zo_mid", "adj", "prof_pod", "dpo")
 
+    # Способ расчета нагрузки: 'python' - последовательная обработка занятий,
+    # 'numpy' - векторизованный расчет (результаты совпадают)
+    LOAD_ENGINE = os.getenv("APEKS_LOAD_ENGINE", "python")
+
+    # Сохранение нагрузки кафедр за закрытые месяцы в локальной базе данных
+    # (отчеты за несколько месяцев суммируют сохраненную помесячную нагрузку).
+    # При изменении коэффициентов (*_KF) или LOAD_ENGINE нагрузка
+    # пересчитывается, удаление сохраненной - tools/purge_load_aggregates.py
+    LOAD_AGGREGATES = os.getenv("APEKS_LOAD_AGGREGATES", "true") in ("True", "true", "1")
+    # Через сколько дней после окончания месяц считается закрытым
+    # (расписание за закрытый месяц не пересчитывается)
+    LOAD_MONTH_CLOSE_DAYS = int(os.getenv("APEKS_LOAD_MONTH_CLOSE_DAYS", 10))
+
     # Часовой пояс для правильного отображения времени занятий
     TIMEZONE = pytz.timezone("Europe/Moscow")
 
@@ -0,0 +1,231 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from flask import Flask, g
+from pytest_httpx import HTTPXMock
+
+from app.core.exceptions import ApeksApiException, ApeksApiUnavailableException
+from app.core.repository.apeks_api_cache import ApeksApiStaleCache
+from app.core.repository.apeks_api_client import ApeksApiClient
+from app.core.repository.apeks_api_metrics import ApeksApiMetrics
+from app.core.repository.apeks_api_repository import ApeksApiRepository
+from app.core.repository.apeks_circuit_breaker import (
+    ApeksCircuitBreaker,
+    CircuitState,
+)
+from app.core.repository.apeks_rate_limiter import ApeksRateLimiter
+
+URL = "http://apeks.test/api/call/system-database/get"
+
+
+@pytest.fixture()
+def api_client():
+    client = ApeksApiClient(http2=False)
+    yield client
+    client.close()
+
+
+def test_repository_reuses_client_between_event_loops(
+    httpx_mock: HTTPXMock, api_client: ApeksApiClient
+):
+    httpx_mock.add_response(json={"status": 1, "data": [{"id": "1"}]})
+    httpx_mock.add_response(json={"status": 1, "data": [{"id": "2"}]})
+    repository = ApeksApiRepository(client=api_client)
+
+    first = asyncio.run(repository.get(URL, {"token": "x", "table": "t"}))
+    pool = api_client._client
+    second = asyncio.run(repository.get(URL, {"token": "x", "table": "t"}))
+
+    assert first == [{"id": "1"}] and second == [{"id": "2"}]
+    assert api_client._client is pool, "Check that connection pool is reused"
+
+
+def test_client_close_and_reopen(api_client: ApeksApiClient):
+    api_client.open()
+    assert api_client.is_open
+    api_client.close()
+    assert not api_client.is_open
+
+
+def test_identical_concurrent_requests_are_coalesced(
+    httpx_mock: HTTPXMock, api_client: ApeksApiClient
+):
+    async def slow_response(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"status": 1, "data": [{"id": "1"}]})
+
+    httpx_mock.add_callback(slow_response)
+    repository = ApeksApiRepository(client=api_client)
+
+    async def fetch_all():
+        return await asyncio.gather(
+            repository.get(URL, {"token": "x", "filter[id][]": ["1", "2"]}),
+            repository.get(URL, {"filter[id][]": ["2", "1"], "token": "x"}),
+        )
+
+    first, second = asyncio.run(fetch_all())
+    assert first == second == [{"id": "1"}]
+    assert len(httpx_mock.get_requests()) == 1, "Check that requests are coalesced"
+
+
+def test_concurrency_cap(httpx_mock: HTTPXMock):
+    api_client = ApeksApiClient(http2=False, max_concurrency=2)
+    active = []
+
+    async def slow_response(request):
+        active.append(api_client.in_flight)
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json={"status": 1, "data": []})
+
+    for _ in range(5):
+        httpx_mock.add_callback(slow_response)
+    repository = ApeksApiRepository(client=api_client)
+
+    async def fetch_all():
+        return await asyncio.gather(
+            *(repository.get(URL, {"token": "x", "id": str(i)}) for i in range(5))
+        )
+
+    asyncio.run(fetch_all())
+    api_client.close()
+    assert max(active) == 2, "Check that concurrency is limited"
+    assert api_client.get_load()["queued"] == 0
+
+
+def test_rate_limiter_backoff():
+    limiter = ApeksRateLimiter(rate=10, burst=1, min_rate=1, latency_threshold=5)
+    limiter.feedback(0.1, 503)
+    assert limiter.rate == 5
+    limiter.feedback(6, 200)
+    assert limiter.rate == 2.5
+    limiter.feedback(0.1, 200)
+    assert limiter.rate == 3.5
+
+
+def test_repository_stream(httpx_mock: HTTPXMock, api_client: ApeksApiClient):
+    httpx_mock.add_response(json={"status": 1, "data": [{"id": "1"}, {"id": "2"}]})
+    repository = ApeksApiRepository(client=api_client)
+
+    async def fetch():
+        return [row async for row in repository.stream(URL, {"token": "x"})]
+
+    assert asyncio.run(fetch()) == [{"id": "1"}, {"id": "2"}]
+
+
+def test_repository_stream_wrong_status(
+    httpx_mock: HTTPXMock, api_client: ApeksApiClient
+):
+    httpx_mock.add_response(json={"status": 0, "message": "error"})
+    repository = ApeksApiRepository(client=api_client)
+
+    async def fetch():
+        return [row async for row in repository.stream(URL, {"token": "x"})]
+
+    with pytest.raises(ApeksApiException):
+        asyncio.run(fetch())
+
+
+def test_circuit_breaker_fails_fast_and_serves_stale_data(
+    httpx_mock: HTTPXMock, api_client: ApeksApiClient
+):
+    httpx_mock.add_response(json={"status": 1, "data": [{"id": "1"}]})
+    httpx_mock.add_response(status_code=503)
+    httpx_mock.add_response(status_code=503)
+    repository = ApeksApiRepository(
+        client=api_client,
+        breaker=ApeksCircuitBreaker(failure_threshold=2, reset_timeout=60),
+        stale_cache=ApeksApiStaleCache(tables=frozenset({"t"})),
+    )
+    params = {"token": "x", "table": "t"}
+
+    assert asyncio.run(repository.get(URL, dict(params))) == [{"id": "1"}]
+    with pytest.raises(ApeksApiUnavailableException):
+        asyncio.run(repository.get(URL, {"token": "x", "table": "other"}))
+    app = Flask(__name__)
+    with app.app_context():
+        assert asyncio.run(repository.get(URL, dict(params))) == [{"id": "1"}]
+        assert g.apeks_data_as_of is not None, "Check that stale data is marked"
+    assert repository.breaker.state == CircuitState.OPEN
+
+    with pytest.raises(ApeksApiUnavailableException):
+        asyncio.run(repository.get(URL, {"token": "x", "table": "other"}))
+    assert len(httpx_mock.get_requests()) == 3, "Check that open breaker fails fast"
+
+
+def test_stale_data_refreshed_while_breaker_open(
+    httpx_mock: HTTPXMock, api_client: ApeksApiClient
+):
+    httpx_mock.add_response(json={"status": 1, "data": [{"id": "1"}]})
+    httpx_mock.add_response(status_code=503)
+    httpx_mock.add_response(json={"status": 1, "data": [{"id": "2"}]})
+    stale_cache = ApeksApiStaleCache(tables=frozenset({"t"}), refresh_interval=0)
+    repository = ApeksApiRepository(
+        client=api_client,
+        breaker=ApeksCircuitBreaker(failure_threshold=1, reset_timeout=60),
+        stale_cache=stale_cache,
+    )
+    params = {"token": "x", "table": "t"}
+    key = api_client.request_key("GET", URL, params)
+
+    asyncio.run(repository.get(URL, dict(params)))
+    assert asyncio.run(repository.get(URL, dict(params))) == [{"id": "1"}]
+    assert repository.breaker.state == CircuitState.OPEN
+    assert asyncio.run(repository.get(URL, dict(params))) == [{"id": "1"}]
+    deadline = time.monotonic() + 5
+    while stale_cache.get(key)[1] != [{"id": "2"}] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stale_cache.get(key)[1] == [{"id": "2"}], "Check background refresh"
+    assert len(httpx_mock.get_requests()) == 3
+
+
+def test_stale_cache_limits():
+    stale_cache = ApeksApiStaleCache(tables=frozenset({"t"}), max_bytes=30)
+    stale_cache.set(("a",), "other", [{"id": "1"}])
+    assert stale_cache.get(("a",)) is None, "Check that only listed tables are saved"
+
+    stale_cache.set(("a",), "t", [{"id": "1"}])
+    stale_cache.set(("b",), "t", [{"id": "2"}])
+    assert stale_cache.size == 24
+    stale_cache.get(("a",))[1].append({"id": "3"})
+    assert stale_cache.get(("a",))[1] == [{"id": "1"}], "Check copy on read"
+
+    stale_cache.set(("c",), "t", [{"id": "3"}])
+    assert stale_cache.get(("b",)) is None, "Check LRU eviction by size"
+    assert stale_cache.get(("a",)) is not None
+    stale_cache.set(("d",), "t", [{"id": "4"}] * 10)
+    assert stale_cache.get(("d",)) is None, "Check that large responses are skipped"
+
+
+def test_circuit_breaker_probe_after_reset_timeout():
+    breaker = ApeksCircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_repository_records_metrics(httpx_mock: HTTPXMock, api_client: ApeksApiClient):
+    httpx_mock.add_response(json={"status": 1, "data": [{"id": "1"}, {"id": "2"}]})
+    httpx_mock.add_response(json={"status": 0})
+    repository = ApeksApiRepository(
+        client=api_client,
+        breaker=ApeksCircuitBreaker(),
+        metrics=ApeksApiMetrics(buckets=(1, 60)),
+    )
+
+    asyncio.run(repository.get(URL, {"token": "x", "table": "t"}))
+    with pytest.raises(ApeksApiException):
+        asyncio.run(repository.post(URL, {"token": "x"}, {"table": "t"}))
+
+    text = repository.metrics.render({"apeks_api_queued": ("Очередь", {(): 0})})
+    labels = 'endpoint="/api/call/system-database/get",table="t"'
+    get, post = f'method="GET",{labels}', f'method="POST",{labels}'
+    assert f'apeks_api_requests_total{{{get},status="ok"}} 1' in text
+    assert f'apeks_api_requests_total{{{post},status="error"}} 1' in text
+    assert f"apeks_api_rows_total{{{get}}} 2" in text
+    assert f'apeks_api_request_duration_seconds_bucket{{{get},le="+Inf"}} 1' in text
+    assert "apeks_api_queued 0" in text
@@ -0,0 +1,36 @@
+import json
+from json import JSONDecodeError
+
+import pytest
+
+from app.core.repository.apeks_json_stream import ApeksJsonStreamParser
+
+RESPONSE = {
+    "status": 1,
+    "data": [{"id": "1", "name": "Лекция"}, {"id": "2", "value": 12.5}],
+    "message": None,
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_parser_returns_rows_incrementally(chunk_size):
+    body = json.dumps(RESPONSE, ensure_ascii=False).encode()
+    parser = ApeksJsonStreamParser()
+    rows = []
+    for index in range(0, len(body), chunk_size):
+        rows.extend(parser.feed(body[index : index + chunk_size]))
+    rows.extend(parser.feed(b"", final=True))
+    assert rows == RESPONSE["data"]
+    assert parser.fields == {"status": 1, "message": None}
+
+
+def test_parser_incomplete_response():
+    parser = ApeksJsonStreamParser()
+    parser.feed(b'{"status": 1, "data": [{"id": "1"}')
+    with pytest.raises(JSONDecodeError):
+        parser.feed(b"", final=True)
+
+
+def test_parser_invalid_response():
+    with pytest.raises(JSONDecodeError):
+        ApeksJsonStreamParser().feed(b"<html>Forbidden (#403)</html>", final=True)
@@ -0,0 +1,130 @@
+from datetime import date
+
+from app.core.db import apeks_mirror
+from app.core.db.apeks_mirror import ApeksMirror
+from app.core.services.apeks_mirror_sync_service import ApeksMirrorSyncService
+from app.core.services.base_apeks_api_service import ApeksApiDbService
+
+TABLES = {
+    "state_staff_history": {"sync": "timestamp", "indexes": ("staff_id",)},
+    "schedule_day_schedule_lessons": {"sync": "date", "indexes": ("date",)},
+    "schedule_day_schedule_lessons_staff": {
+        "sync": "lessons",
+        "indexes": ("lesson_id", "staff_id"),
+    },
+}
+
+
+class FakeRepository:
+    def __init__(self, tables):
+        self.tables = tables
+        self.calls = []
+
+    async def get(self, endpoint, params):
+        self.calls.append(params)
+        return []
+
+    async def post(self, endpoint, params, data):
+        self.calls.append(data)
+        return 1
+
+    async def stream(self, endpoint, params):
+        self.calls.append(params)
+        rows = self.tables[params["table"]]
+        if "filter[lesson_id][]" in params:
+            rows = [
+                row for row in rows if row["lesson_id"] in params["filter[lesson_id][]"]
+            ]
+        for row in rows:
+            yield row
+
+
+def make_sync_service(tmp_path, tables):
+    mirror = ApeksMirror(path=str(tmp_path / "mirror.db"), tables=TABLES, max_age=60)
+    return ApeksMirrorSyncService(
+        mirror=mirror, repository=FakeRepository(tables), token="x"
+    )
+
+
+async def test_mirror_sync_and_incremental_update(tmp_path):
+    today = date.today().isoformat()
+    tables = {
+        "state_staff_history": [
+            {"id": "1", "staff_id": "10", "timestamp": "2024-01-01 10:00:00"},
+            {"id": "2", "staff_id": "11", "timestamp": "2024-01-02 10:00:00"},
+        ],
+        "schedule_day_schedule_lessons": [{"id": "5", "date": today}],
+        "schedule_day_schedule_lessons_staff": [
+            {"id": "7", "lesson_id": "5", "staff_id": "10"}
+        ],
+    }
+    service = make_sync_service(tmp_path, tables)
+    result = await service.sync()
+    assert result == {
+        "state_staff_history": 2,
+        "schedule_day_schedule_lessons": 1,
+        "schedule_day_schedule_lessons_staff": 1,
+    }
+    mirror = service.mirror
+    assert mirror.get("state_staff_history", staff_id=[10]) == [
+        tables["state_staff_history"][0]
+    ]
+    assert mirror.get("schedule_day_schedule_lessons_staff", id="7")
+    assert mirror.is_ready("schedule_day_schedule_lessons", date.today(), date.today())
+    assert not mirror.is_ready(
+        "schedule_day_schedule_lessons", date(1990, 1, 1), date.today()
+    )
+
+    tables["state_staff_history"] = [
+        {"id": "2", "staff_id": "12", "timestamp": "2024-01-03 10:00:00"}
+    ]
+    await service.sync_table("state_staff_history", full=False)
+    assert service.repository.calls[-1]["filter"] == (
+        "timestamp >= '2024-01-02 10:00:00'"
+    )
+    assert len(mirror.get("state_staff_history")) == 2
+    assert mirror.get("state_staff_history", staff_id="12")[0]["id"] == "2"
+
+
+async def test_service_reads_from_mirror_when_ready(tmp_path):
+    tables = {
+        "state_staff_history": [
+            {"id": "1", "staff_id": "10", "timestamp": "2024-01-01 10:00:00"}
+        ]
+    }
+    sync_service = make_sync_service(tmp_path, tables)
+    repository = FakeRepository(tables)
+    service = ApeksApiDbService(
+        table="state_staff_history",
+        repository=repository,
+        token="x",
+        mirror=sync_service.mirror,
+        use_mirror=True,
+    )
+    await service.get(staff_id=10)
+    assert len(repository.calls) == 1, "Check that not synced mirror is not used"
+
+    await sync_service.sync_table("state_staff_history")
+    assert await service.get(staff_id=10) == tables["state_staff_history"]
+    assert len(repository.calls) == 1, "Check that synced mirror is used"
+
+    await service.update({"id": 1}, {"staff_id": 11})
+    await service.get(staff_id=10)
+    assert len(repository.calls) == 3, "Check that update invalidates mirror"
+
+
+def test_mirror_get_splits_large_filters(tmp_path, monkeypatch):
+    monkeypatch.setattr(apeks_mirror, "FILTER_CHUNK_SIZE", 2)
+    mirror = ApeksMirror(path=str(tmp_path / "mirror.db"), tables=TABLES, max_age=60)
+    rows = [
+        {"id": str(row_id), "lesson_id": str(row_id % 3), "staff_id": str(row_id)}
+        for row_id in range(7)
+    ]
+    with mirror.transaction() as connection:
+        mirror.upsert(connection, "schedule_day_schedule_lessons_staff", rows)
+    result = mirror.get(
+        "schedule_day_schedule_lessons_staff",
+        lesson_id=[0, 1, 2, 2],
+        staff_id=range(1, 7),
+    )
+    assert sorted(row["id"] for row in result) == ["1", "2", "3", "4", "5", "6"]
@@ -0,0 +1,61 @@
+import pytest
+from pytest_httpx import HTTPXMock
+
+from app.core.extensions import apeks_api_client
+from app.core.func.api_get import api_get_db_table, check_api_db_response
+
+
+@pytest.fixture(autouse=True)
+def close_api_client():
+    yield
+    apeks_api_client.close()
+
+
+async def test_api_get_db_table_uses_shared_client(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(json={"status": 1, "data": [{"id": "1"}]})
+    response = await api_get_db_table("state_staff", id=[1, 2])
+    assert await check_api_db_response(response) == [{"id": "1"}]
+    assert apeks_api_client.is_open, "Check that legacy helpers use shared client"
+    request = httpx_mock.get_request()
+    assert request.url.params.get_list("filter[id][]") == ["1", "2"]
+
+
+async def test_legacy_helpers_use_repository(httpx_mock: HTTPXMock, monkeypatch):
+    from app.core.func import api_get
+    from app.core.func.api_post import api_add_to_db_table
+    from app.core.repository.apeks_api_metrics import ApeksApiMetrics
+
+    metrics = ApeksApiMetrics(buckets=(1, 60))
+    monkeypatch.setattr(api_get.apeks_api_repository, "metrics", metrics)
+    httpx_mock.add_response(json={"status": 0, "message": "Ошибка"})
+
+    response = await api_add_to_db_table("state_staff", name="Имя")
+    assert response["status"] == 0
+
+    text = metrics.render()
+    assert (
+        'apeks_api_requests_total{method="POST",'
+        'endpoint="/api/call/system-database/add",table="state_staff",'
+        'status="error"} 1'
+    ) in text
+
+
+async def test_api_get_db_table_uses_reference_cache(httpx_mock: HTTPXMock):
+    from app.core.extensions import apeks_api_cache
+    from app.core.func.api_post import api_edit_db_table
+
+    apeks_api_cache.clear()
+    httpx_mock.add_response(json={"status": 1, "data": [{"id": "1"}]})
+    httpx_mock.add_response(json={"status": 1, "data": 1})
+    httpx_mock.add_response(json={"status": 1, "data": [{"id": "2"}]})
+
+    first = await check_api_db_response(await api_get_db_table("load_groups"))
+    first[0]["id"] = "changed"
+    cached = await check_api_db_response(await api_get_db_table("load_groups"))
+    assert cached == [{"id": "1"}]
+    assert len(httpx_mock.get_requests()) == 1
+
+    await api_edit_db_table("load_groups", {"id": 1}, {"name": "Группа"})
+    updated = await check_api_db_response(await api_get_db_table("load_groups"))
+    assert updated == [{"id": "2"}]
+    apeks_api_cache.clear()
@@ -0,0 +1,142 @@
+from app.core.repository.apeks_api_cache import ApeksApiCache
+from app.core.services.base_apeks_api_service import (
+    ApeksApiDbService,
+    group_filters,
+    split_filters,
+)
+from config import ApeksConfig
+
+
+class FakeRepository:
+    def __init__(self):
+        self.calls = []
+
+    async def get(self, endpoint, params):
+        self.calls.append(("get", params))
+        return [{"id": "1", "name": "group"}]
+
+    async def post(self, endpoint, params, data):
+        self.calls.append(("post", data))
+        return 1
+
+    async def delete(self, endpoint, params):
+        self.calls.append(("delete", params))
+        return 1
+
+
+def test_cache_key_ignores_filters_order():
+    first = ApeksApiCache.make_key("t", {"a": [2, 1], "b": "x"})
+    second = ApeksApiCache.make_key("t", {"b": "x", "a": ["1", "2"]})
+    assert first == second
+
+
+def test_cache_lru_eviction():
+    cache = ApeksApiCache(ttl={"t": 60}, maxsize=2)
+    for value in range(3):
+        cache.set("t", {"id": value}, [{"id": value}])
+    assert cache.get("t", {"id": 0}) is None
+    assert cache.get("t", {"id": 2}) == [{"id": 2}]
+
+
+def test_cache_expired_entry():
+    cache = ApeksApiCache(ttl={"t": -1})
+    cache.set("t", {}, [{"id": 1}])
+    assert cache.get("t", {}) is None
+
+
+async def test_service_get_is_cached_and_invalidated():
+    repository = FakeRepository()
+    service = ApeksApiDbService(
+        table="load_groups",
+        repository=repository,
+        token="x",
+        cache=ApeksApiCache(ttl={"load_groups": 60}),
+    )
+    data = await service.get(id=[1])
+    data[0]["name"] = "changed"
+    assert await service.get(id=["1"]) == [{"id": "1", "name": "group"}]
+    assert len(repository.calls) == 1, "Check that second request is cached"
+    await service.update({"id": 1}, {"name": "new"})
+    await service.get(id=[1])
+    assert len(repository.calls) == 3, "Check that update invalidates cache"
+
+
+def test_split_filters_into_chunks():
+    chunks = split_filters({"staff_id": list(range(5)) + [0], "active": 1}, 2)
+    assert chunks == [
+        {"staff_id": ["0", "1"], "active": 1},
+        {"staff_id": ["2", "3"], "active": 1},
+        {"staff_id": ["4"], "active": 1},
+    ]
+    assert split_filters({"id": [1, 2]}, 2) == [{"id": [1, 2]}]
+    assert split_filters({"id": (val for val in range(3))}, 2) == [
+        {"id": ["0", "1"]},
+        {"id": ["2"]},
+    ]
+
+
+async def test_service_get_merges_chunks():
+    repository = FakeRepository()
+    service = ApeksApiDbService(
+        table="state_staff", repository=repository, token="x", cache=ApeksApiCache()
+    )
+    filters = {"id": list(range(ApeksConfig.FILTER_CHUNK_SIZE * 2 + 1))}
+    assert await service.get(**filters) == [{"id": "1", "name": "group"}]
+    assert len(repository.calls) == 3
+
+
+def test_group_filters_merges_single_varying_field():
+    grouped = group_filters(
+        [
+            (0, {"lesson_id": "1", "student_id": "10"}),
+            (1, {"lesson_id": "1", "student_id": "11"}),
+            (2, {"lesson_id": "1", "student_id": "12"}),
+            (3, {"lesson_id": "2", "student_id": "10"}),
+            (4, {"id": ["5", "6"]}),
+        ]
+    )
+    assert ([0, 1, 2], {"lesson_id": "1", "student_id": ["10", "11", "12"]}) in grouped
+    assert ([3], {"lesson_id": "2", "student_id": "10"}) in grouped
+    assert ([4], {"id": ["5", "6"]}) in grouped
+    assert len(grouped) == 3
+
+
+async def test_service_bulk_operations():
+    repository = FakeRepository()
+    service = ApeksApiDbService(
+        table="student_marks", repository=repository, token="x", cache=ApeksApiCache()
+    )
+    result = await service.bulk_update(
+        [
+            ({"student_id": 1, "lesson_id": 5}, {"skip_reason_id": 2}),
+            ({"student_id": 2, "lesson_id": 5}, {"skip_reason_id": 2}),
+            ({"student_id": 3, "lesson_id": 5}, {"skip_reason_id": 3}),
+        ]
+    )
+    assert result.requests == 2, "Check that updates with same fields are grouped"
+    assert result.count == 2 and not result.errors
+    merged = next(
+        data for _, data in repository.calls if data["fields[skip_reason_id]"] == "2"
+    )
+    assert merged["filter[student_id][]"] == ["1", "2"]
+
+    result = await service.bulk_delete([{"id": 1}, {"id": ""}])
+    assert result.results[0] == 1 and 0 not in result.errors
+    assert 1 in result.errors, "Check that empty filter is reported as item error"
+
+    result = await service.bulk_create([{"name": "a"}, {"name": "b"}])
+    assert result.count == 2 and result.requests == 2
+
+
+async def test_service_get_accepts_iterator_filters():
+    repository = FakeRepository()
+    service = ApeksApiDbService(
+        table="load_groups",
+        repository=repository,
+        token="x",
+        cache=ApeksApiCache(ttl={"load_groups": 60}),
+    )
+    await service.get(id=(val for val in [1, 2]))
+    assert repository.calls == [
+        ("get", {"token": "x", "table": "load_groups", "filter[id][]": ["1", "2"]})
+    ]
@@ -0,0 +1,116 @@
+import time
+from datetime import date
+
+from app.core.classes.HolidaysAnalytics import (
+    NO_DEPARTMENT_ID,
+    HolidaysAnalytics,
+    academic_years_months,
+)
+from app.core.classes.ProductionCalendar import ProductionCalendar
+from app.core.classes.StaffHistoryIndex import StaffHistoryIndex
+from app.core.reports import holidays_analytics_report
+
+
+def get_analytics(department_ids=None):
+    return HolidaysAnalytics(
+        years=[2023, 2024],
+        production_calendar=ProductionCalendar(
+            holidays=[date(2024, 3, 8)], working_days=[]
+        ),
+        staff_history_index=StaffHistoryIndex(
+            {
+                10: [
+                    {"department_id": "1", "start_date": "2020-01-01", "end_date": None}
+                ],
+                20: [
+                    {
+                        "department_id": "2",
+                        "start_date": "2020-01-01",
+                        "end_date": "2024-08-31",
+                    }
+                ],
+            }
+        ),
+        department_ids=department_ids,
+    )
+
+
+def test_academic_years_months():
+    months = academic_years_months(2023, 2024)
+    assert len(months) == 24
+    assert months[0] == (date(2023, 9, 1), date(2023, 9, 30))
+    assert months[5] == (date(2024, 2, 1), date(2024, 2, 29))
+    assert months[-1] == (date(2025, 8, 1), date(2025, 8, 31))
+
+
+def test_holidays_analytics_counters():
+    analytics = get_analytics()
+    analytics.add_lessons(
+        {
+            10: [date(2024, 3, 8), date(2024, 3, 8), date(2024, 3, 11)],
+            20: [date(2024, 3, 9)],
+        }
+    )
+    analytics.add_lessons(
+        {10: [date(2024, 9, 7), date(2024, 9, 9)], 20: [date(2024, 9, 7)]}
+    )
+    assert analytics.counters[(1, 10)].tolist() == [[3, 2, 1], [2, 1, 1]]
+    assert analytics.counters[(2, 20)].tolist() == [[1, 1, 1], [0, 0, 0]]
+    assert analytics.counters[(NO_DEPARTMENT_ID, 20)].tolist() == [
+        [0, 0, 0],
+        [1, 1, 1],
+    ]
+    assert analytics.busy_holidays == [
+        {date(2024, 3, 8), date(2024, 3, 9)},
+        {date(2024, 9, 7)},
+    ]
+    total, busy_staff = analytics.department_totals()[1]
+    assert total.tolist() == [[3, 2, 1], [2, 1, 1]]
+    assert busy_staff.tolist() == [1, 1]
+
+
+def test_holidays_analytics_department_filter():
+    analytics = get_analytics(department_ids=[2])
+    analytics.add_lessons({10: [date(2024, 3, 8)], 20: [date(2024, 9, 7)]})
+    assert list(analytics.counters) == []
+    analytics.add_lessons({20: [date(2024, 3, 9), date(2022, 3, 9)]})
+    assert list(analytics.counters) == [(2, 20)]
+
+
+async def test_collect_holidays_analytics_requests_each_month(monkeypatch):
+    requested = []
+
+    async def get_staff_lesson_dates(date_start, date_end):
+        requested.append(date_start)
+        return {10: [date_start]}
+
+    monkeypatch.setattr(
+        holidays_analytics_report, "get_staff_lesson_dates", get_staff_lesson_dates
+    )
+    analytics = get_analytics()
+    await holidays_analytics_report.collect_holidays_analytics(analytics, 2023, 2024)
+    assert requested == [
+        month_start for month_start, _ in academic_years_months(2023, 2024)
+    ]
+    assert analytics.counters[(1, 10)][:, 0].tolist() == [12, 12]
+
+
+async def test_collect_holidays_analytics_prefetches_next_month(monkeypatch):
+    requested, requested_after_add = [], []
+
+    async def get_staff_lesson_dates(date_start, date_end):
+        requested.append(date_start)
+        return {}
+
+    def add_lessons(staff_lesson_dates):
+        time.sleep(0.01)
+        requested_after_add.append(len(requested))
+
+    monkeypatch.setattr(
+        holidays_analytics_report, "get_staff_lesson_dates", get_staff_lesson_dates
+    )
+    analytics = get_analytics()
+    monkeypatch.setattr(analytics, "add_lessons", add_lessons)
+    await holidays_analytics_report.collect_holidays_analytics(analytics, 2024, 2024)
+    # Занятия следующего месяца запрошены во время обработки текущего
+    assert requested_after_add == [*range(2, 13), 12]
@@ -0,0 +1,50 @@
+from datetime import date
+
+from app.core.reports import holidays_report
+
+
+class FakeLessonsService:
+    async def iter_lessons(self, date_start, date_end):
+        for lesson_id, lesson_date in (
+            (1, "2024-03-08"),
+            (2, "2024-03-08"),
+            (3, "2024-03-11"),
+        ):
+            yield {"id": str(lesson_id), "date": lesson_date}
+
+
+class FakeLessonsStaffService:
+    def __init__(self):
+        self.filters = []
+
+    async def get(self, **filters):
+        self.filters.append(filters)
+        return [
+            {"lesson_id": "1", "staff_id": "10"},
+            {"lesson_id": "2", "staff_id": "10"},
+            {"lesson_id": "3", "staff_id": "20"},
+            {"lesson_id": "3", "staff_id": "10"},
+        ]
+
+
+async def test_staff_lesson_dates_requests_period_lessons_only(monkeypatch):
+    lessons_staff_service = FakeLessonsStaffService()
+    monkeypatch.setattr(
+        holidays_report,
+        "get_db_apeks_schedule_day_schedule_lessons_service",
+        FakeLessonsService,
+    )
+    monkeypatch.setattr(
+        holidays_report,
+        "get_db_apeks_schedule_day_schedule_lessons_staff_service",
+        lambda: lessons_staff_service,
+    )
+    staff_dates = await holidays_report.get_staff_lesson_dates(
+        date(2024, 3, 1), date(2024, 3, 31)
+    )
+    assert lessons_staff_service.filters == [{"lesson_id": [1, 2, 3]}]
+    assert staff_dates == {
+        10: [date(2024, 3, 8), date(2024, 3, 8), date(2024, 3, 11)],
+        20: [date(2024, 3, 11)],
+    }
+    assert staff_dates[10][0] is staff_dates[10][1]
@@ -0,0 +1,172 @@
+from datetime import date
+
+from app.core.classes.LessonsData import LessonsData
+from app.core.classes.LoadReportProcessor import LoadReportProcessor
+from app.core.classes.NumpyLoadEngine import NumpyLoadEngine
+from app.core.classes.StaffHistoryIndex import StaffHistoryIndex
+from config import ApeksConfig
+from tools.apeks_stub_server import generate_dataset
+
+EXAM = ApeksConfig.CONTROL_TYPE_ID["exam"]
+ZACHET = ApeksConfig.CONTROL_TYPE_ID["zachet"]
+LECTURE = ApeksConfig.CLASS_TYPE_ID["lecture"]
+
+
+def make_lesson(lesson_id, lesson_time_id, class_type_id=None, control_type_id=None):
+    class_type_id = str(class_type_id) if class_type_id else None
+    control_type_id = str(control_type_id) if control_type_id else None
+    return {
+        "id": str(lesson_id),
+        "date": "2024-01-15",
+        "lesson_time_id": str(lesson_time_id),
+        "group_id": "1",
+        "subgroup_id": None,
+        "discipline_id": "10",
+        "class_type_id": class_type_id,
+        "control_type_id": control_type_id,
+    }
+
+
+def test_control_lessons_are_merged():
+    lessons = LessonsData(
+        schedule_lessons=[
+            make_lesson(1, 1, control_type_id=EXAM),
+            make_lesson(2, 2, control_type_id=EXAM),
+            make_lesson(3, 3, control_type_id=ZACHET),
+            make_lesson(4, 4, class_type_id=LECTURE),
+            make_lesson(5, 5, control_type_id=EXAM),
+        ],
+        schedule_lessons_staff=[
+            {"lesson_id": "1", "staff_id": "1"},
+            {"lesson_id": "1", "staff_id": "2"},
+            {"lesson_id": "2", "staff_id": "1"},
+            {"lesson_id": "3", "staff_id": "1"},
+            {"lesson_id": "4", "staff_id": "1"},
+            {"lesson_id": "5", "staff_id": "1"},
+        ],
+        load_groups=[{"id": "1", "education_plan_id": "1", "people_count": "20"}],
+        load_subgroups=[],
+        plan_education_plans=[{"id": "1", "education_level_id": "3"}],
+        plan_education_plans_education_forms=[
+            {"education_plan_id": "1", "education_form_id": "1"}
+        ],
+        staff_history_data={
+            staff_id: [
+                {"department_id": "5", "start_date": "2020-01-01", "end_date": None}
+            ]
+            for staff_id in (1, 2)
+        },
+    )
+    merged = [
+        (
+            less.staff_id,
+            less.control_type_id,
+            less.hours,
+            less.lesson_time_id,
+        )
+        for less in lessons.control_lessons
+    ]
+    assert merged == [
+        (1, EXAM, 6, "1, 2, 5"),
+        (2, EXAM, 2, "1"),
+        (1, ZACHET, 2, "3"),
+    ]
+
+
+def test_staff_history_index():
+    index = StaffHistoryIndex(
+        {
+            1: [
+                {
+                    "department_id": "5",
+                    "start_date": "2020-01-01",
+                    "end_date": "2022-08-31",
+                },
+                {"department_id": "6", "start_date": "2022-09-01", "end_date": None},
+                {
+                    "department_id": "7",
+                    "start_date": "2023-01-01",
+                    "end_date": "2023-06-30",
+                },
+            ]
+        }
+    )
+    assert index.department_id(1, date(2019, 12, 31)) is None
+    assert index.department_id(1, date(2022, 8, 31)) == 5
+    assert index.department_id(1, date(2022, 9, 1)) == 6
+    assert index.departments(1, date(2023, 3, 1)) == [6, 7]
+    assert index.departments(1, date(2030, 1, 1)) == [6]
+    assert index.departments(2, date(2023, 3, 1)) == []
+
+
+def test_lesson_records():
+    final_att = ApeksConfig.CONTROL_TYPE_ID["final_att"]
+    lessons = LessonsData(
+        schedule_lessons=[make_lesson(1, 1, control_type_id=final_att)],
+        schedule_lessons_staff=[{"lesson_id": "1", "staff_id": "1"}],
+        load_groups=[{"id": "1", "education_plan_id": "1", "people_count": "5"}],
+        load_subgroups=[],
+        plan_education_plans=[{"id": "1", "education_level_id": "7"}],
+        plan_education_plans_education_forms=[
+            {"education_plan_id": "1", "education_form_id": "1"}
+        ],
+        staff_history_data={
+            1: [{"department_id": "5", "start_date": "2020-01-01", "end_date": None}]
+        },
+    )
+    (record,) = lessons.control_lessons
+    assert record.date == date(2024, 1, 15)
+    assert record.education_plan_id == 1
+    assert (record.staff_id, record.department_id) == (1, 5)
+    assert lessons.get_lesson_type(record) == "final_att"
+    assert lessons.get_student_type(record) == "adj"
+    assert lessons.get_control_hours(record) == 5 * ApeksConfig.ADJ_KF
+    assert lessons.department_lessons("5") == lessons.structured_lessons
+
+
+def test_numpy_load_engine():
+    data = generate_dataset(
+        lessons=2000, staff=60, date_start=date(2024, 9, 1), date_end=date(2024, 12, 31)
+    )
+    staff_history = {}
+    for record in data["state_staff_history"]:
+        staff_history.setdefault(int(record["staff_id"]), []).append(record)
+    department_id = int(data["state_staff_history"][0]["department_id"])
+    department_staff = {
+        int(record["staff_id"]): record["staff_id"]
+        for record in data["state_staff_history"]
+        if int(record["department_id"]) == department_id
+    }
+    processor = LoadReportProcessor(
+        year=2024,
+        month_start=9,
+        month_end=12,
+        department_id=department_id,
+        departments={},
+        department_staff=department_staff,
+        schedule_lessons=data["schedule_day_schedule_lessons"],
+        schedule_lessons_staff=data["schedule_day_schedule_lessons_staff"],
+        load_groups=data["load_groups"],
+        load_subgroups=data["load_subgroups"],
+        plan_education_plans=data["plan_education_plans"],
+        plan_education_plans_education_forms=data[
+            "plan_education_plans_education_forms"
+        ],
+        staff_history_data=staff_history,
+    )
+    load_data = NumpyLoadEngine(processor).load_data(department_id, department_staff)
+    assert load_data == processor.load_data
+    departments_staff = {}
+    for record in data["state_staff_history"]:
+        departments_staff.setdefault(int(record["department_id"]), {})[
+            int(record["staff_id"])
+        ] = record["staff_id"]
+    assert NumpyLoadEngine(processor).departments_load(
+        departments_staff
+    ) == processor.departments_load(departments_staff)
+    assert any(
+        value
+        for staff_load in load_data.values()
+        for l_type in ApeksConfig.LOAD_CONTROL_TYPES
+        for value in staff_load[l_type].values()
+    )
@@ -0,0 +1,99 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.core.services.apeks_db_schedule_day_schedule_lessons_service import (
+    ApeksDbScheduleDayScheduleLessonsService,
+    date_windows,
+)
+
+
+class WindowRepository:
+    """Возвращает по одному занятию на каждый день окна (в обратном порядке)."""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.periods = []
+        self.finished = []
+
+    async def stream(self, endpoint, params):
+        start, end = (
+            date.fromisoformat(value.strip("'"))
+            for value in params["filter"][len("date between ") :].split(" and ")
+        )
+        self.periods.append((start, end))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            # Более ранние окна выполняются дольше
+            await asyncio.sleep(0.01 * (12 - start.month))
+            for day in range(end.toordinal(), start.toordinal() - 1, -1):
+                yield {"id": str(day), "date": date.fromordinal(day).isoformat()}
+                await asyncio.sleep(0)
+            self.finished.append(start)
+        finally:
+            self.running -= 1
+
+
+def lessons_service(repository, window="month", concurrency=4):
+    return ApeksDbScheduleDayScheduleLessonsService(
+        table="schedule_day_schedule_lessons",
+        repository=repository,
+        token="x",
+        use_mirror=False,
+        window=window,
+        window_concurrency=concurrency,
+    )
+
+
+def test_date_windows():
+    assert date_windows(date(2024, 1, 15), date(2024, 3, 10), "month") == [
+        (date(2024, 1, 15), date(2024, 1, 31)),
+        (date(2024, 2, 1), date(2024, 2, 29)),
+        (date(2024, 3, 1), date(2024, 3, 10)),
+    ]
+    assert date_windows(date(2024, 1, 3), date(2024, 1, 16), "week") == [
+        (date(2024, 1, 3), date(2024, 1, 7)),
+        (date(2024, 1, 8), date(2024, 1, 14)),
+        (date(2024, 1, 15), date(2024, 1, 16)),
+    ]
+    assert date_windows(date(2024, 1, 3), date(2024, 5, 1), "period") == [
+        (date(2024, 1, 3), date(2024, 5, 1))
+    ]
+    with pytest.raises(ValueError):
+        date_windows(date(2024, 1, 1), date(2024, 1, 2), "day")
+
+
+async def test_iter_lessons_windows_in_date_order():
+    repository = WindowRepository()
+    service = lessons_service(repository, concurrency=3)
+    lessons = await service.get_lessons(date(2024, 1, 1), date(2024, 6, 30))
+    months = [lesson["date"][:7] for lesson in lessons]
+    assert (
+        months == sorted(months) and len(set(lesson["id"] for lesson in lessons)) == 182
+    )
+    assert len(repository.periods) == 6
+    assert repository.max_running == 3
+
+
+async def test_iter_lessons_early_stop_cancels_requests():
+    repository = WindowRepository()
+    service = lessons_service(repository, window="week", concurrency=2)
+    lessons = service.iter_lessons(date(2024, 1, 1), date(2024, 12, 31))
+    first = await anext(lessons)
+    await lessons.aclose()
+    await asyncio.sleep(0.2)
+    assert first["date"] == "2024-01-07"
+    assert len(repository.periods) <= 3 and repository.running == 0
+
+
+async def test_iter_lessons_streams_current_window():
+    repository = WindowRepository()
+    service = lessons_service(repository, concurrency=3)
+    lessons = service.iter_lessons(date(2024, 1, 1), date(2024, 3, 31))
+    first = await anext(lessons)
+    assert first["date"] == "2024-01-31"
+    assert date(2024, 1, 1) not in repository.finished, "Check streaming"
+    assert len([lesson async for lesson in lessons]) == 90
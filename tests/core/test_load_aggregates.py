@@ -0,0 +1,121 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.classes.LoadReportProcessor import LoadReportProcessor
+from app.core.classes.MonthlyLoadReport import MonthlyLoadReport
+from app.core.db.database import db
+from app.core.db.reports_models import (
+    LoadMonthlyAggregates,
+    LoadMonthlyAggregatesStatus,
+)
+from app.core.services import db_load_aggregates_service
+from app.core.services.db_load_aggregates_service import LoadMonthlyAggregatesService
+from tools.apeks_stub_server import generate_dataset
+
+
+@pytest.fixture
+def aggregates_service():
+    engine = create_engine("sqlite://")
+    db.metadata.create_all(
+        engine,
+        tables=[LoadMonthlyAggregates.__table__, LoadMonthlyAggregatesStatus.__table__],
+    )
+    with Session(engine) as session:
+        yield LoadMonthlyAggregatesService(LoadMonthlyAggregates, session)
+
+
+def department_load(data, department_id, month_start, month_end):
+    staff_history = {}
+    for record in data["state_staff_history"]:
+        staff_history.setdefault(int(record["staff_id"]), []).append(record)
+    return LoadReportProcessor(
+        year=2024,
+        month_start=month_start,
+        month_end=month_end,
+        department_id=department_id,
+        departments={},
+        department_staff={
+            int(record["staff_id"]): record["staff_id"]
+            for record in data["state_staff_history"]
+            if int(record["department_id"]) == department_id
+        },
+        schedule_lessons=[
+            lesson
+            for lesson in data["schedule_day_schedule_lessons"]
+            if month_start <= date.fromisoformat(lesson["date"]).month <= month_end
+        ],
+        schedule_lessons_staff=data["schedule_day_schedule_lessons_staff"],
+        load_groups=data["load_groups"],
+        load_subgroups=data["load_subgroups"],
+        plan_education_plans=data["plan_education_plans"],
+        plan_education_plans_education_forms=data[
+            "plan_education_plans_education_forms"
+        ],
+        staff_history_data=staff_history,
+    )
+
+
+def test_monthly_load_aggregates(aggregates_service):
+    data = generate_dataset(
+        lessons=2000, staff=60, date_start=date(2024, 9, 1), date_end=date(2024, 12, 31)
+    )
+    department_id = int(data["state_staff_history"][0]["department_id"])
+    assert aggregates_service.get_month_load(2024, 9, department_id) is None
+    monthly_load = []
+    for month in range(9, 13):
+        load = department_load(data, department_id, month, month)
+        aggregates_service.save_month_load(2024, month, department_id, load.load_data)
+        monthly_load.append(
+            aggregates_service.get_month_load(2024, month, department_id)
+        )
+    # Повторное сохранение заменяет значения
+    aggregates_service.save_month_load(2024, 12, department_id, {})
+    assert aggregates_service.get_month_load(2024, 12, department_id) == {}
+
+    semester = department_load(data, department_id, 9, 12)
+    report = MonthlyLoadReport(
+        year=2024,
+        month_start=9,
+        month_end=12,
+        department_id=department_id,
+        departments={},
+        department_staff=semester.staff_list,
+        monthly_load=monthly_load,
+    )
+    assert report.file_period == semester.file_period
+    assert report.load_data.keys() == semester.load_data.keys()
+    for staff_id, staff_load in semester.load_data.items():
+        for l_type, values in staff_load.items():
+            assert report.load_data[staff_id][l_type] == pytest.approx(values)
+
+
+def test_load_aggregates_fingerprint_and_purge(aggregates_service):
+    load_data = {1: {"lecture": {"och": 2}}}
+    aggregates_service.save_month_load(2024, 9, 10, load_data)
+    aggregates_service.save_month_load(2024, 10, 10, load_data)
+    aggregates_service.save_month_load(2024, 10, 20, load_data)
+    assert aggregates_service.get_month_load(2024, 9, 10) == load_data
+
+    changed = LoadMonthlyAggregatesService(
+        LoadMonthlyAggregates, aggregates_service.db_session, fingerprint="other"
+    )
+    assert changed.get_month_load(2024, 9, 10) is None, "Check recompute on change"
+
+    assert aggregates_service.purge(year=2024, month=10) == 2
+    assert aggregates_service.get_month_load(2024, 10, 20) is None
+    assert aggregates_service.get_month_load(2024, 9, 10) == load_data
+    assert aggregates_service.purge() == 1
+    assert aggregates_service.list() == []
+
+
+def test_load_aggregates_concurrent_save(aggregates_service, monkeypatch):
+    aggregates_service.save_month_load(2024, 9, 10, {1: {"lecture": {"och": 2}}})
+    # Удаление выполнено до сохранения нагрузки другим запросом
+    monkeypatch.setattr(db_load_aggregates_service, "delete", select)
+    aggregates_service.save_month_load(2024, 9, 10, {1: {"lecture": {"och": 4}}})
+    assert aggregates_service.get_month_load(2024, 9, 10) == {
+        1: {"lecture": {"och": 2}}
+    }
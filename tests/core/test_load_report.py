@@ -0,0 +1,63 @@
+import os
+
+from openpyxl import load_workbook
+
+from app.core.reports.load_report import LoadReportWriter
+from config import ApeksConfig as Apeks, FlaskConfig
+
+
+def staff_load(value):
+    return {
+        l_type: dict.fromkeys(Apeks.LOAD_STUDENT_TYPES, value)
+        for l_type in Apeks.LOAD_LESSON_TYPES + Apeks.LOAD_CONTROL_TYPES
+    }
+
+
+def test_load_report_writer_layout(tmp_path, monkeypatch):
+    monkeypatch.setattr(FlaskConfig, "EXPORT_FILE_DIR", str(tmp_path))
+    writer = LoadReportWriter()
+    writer.add_sheet(
+        "Сводный",
+        "Учебная нагрузка кафедр",
+        "отчет о нагрузке",
+        [("ОРД", staff_load(2)), ("УП", staff_load(0.5))],
+        name_header="Кафедра",
+    )
+    writer.add_sheet(
+        "ОРД",
+        "Кафедра ОРД",
+        "отчет о нагрузке",
+        [("Иванов И.И.", staff_load(1)), ("Иванов И.И.", staff_load(3))],
+    )
+    writer.save("report.xlsx")
+
+    wb = load_workbook(os.path.join(tmp_path, "report.xlsx"))
+    template = load_workbook(
+        os.path.join(FlaskConfig.TEMPLATE_FILE_DIR, "load_report_temp.xlsx")
+    ).active
+    ws, department = wb.worksheets
+    assert ws.title == "Сводный" and department.title == "ОРД"
+    assert ws["A1"].value == "Учебная нагрузка кафедр"
+    assert ws["A5"].value == "Кафедра" and department["A5"].value == "ФИО"
+    assert ws["B5"].value == template["B5"].value
+    assert ws["B6"].alignment.textRotation == template["B6"].alignment.textRotation
+    assert set(map(str, ws.merged_cells.ranges)) == set(
+        map(str, template.merged_cells.ranges)
+    )
+    assert ws.column_dimensions["A"].width == template.column_dimensions["A"].width
+    assert ws.row_dimensions[5].height == template.row_dimensions[5].height
+
+    # Лекции (B-G), групповые консультации без ДПО (X-AB) и зачеты с AC
+    assert [cell.value for cell in ws[8][1:7]] == [2] * 6
+    assert [cell.value for cell in ws[8][23:29]] == [2] * 6
+    assert ws["T8"].value is None and ws["BT8"].value == "=SUM(B8:BS8)"
+    assert ws["B9"].number_format == "0.00" and ws["B8"].number_format == "General"
+    assert ws["A10"].value == "Итого" and ws["A10"].font.b
+    assert ws["B10"].value == '=IF(SUM(B8:B9)>0,SUM(B8:B9),"")'
+    # Однофамильцы с одинаковыми инициалами - отдельные строки
+    assert [department[f"A{row}"].value for row in range(8, 11)] == [
+        "Иванов И.И.",
+        "Иванов И.И.",
+        "Итого",
+    ]
+    assert department["B8"].value == 1 and department["B9"].value == 3
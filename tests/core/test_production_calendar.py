@@ -0,0 +1,57 @@
+from datetime import date
+
+from app.core.classes.ProductionCalendar import ProductionCalendar
+from app.core.services.db_production_calendar_services import (
+    ProductionCalendarService,
+)
+
+
+class FakeCalendarRecord:
+    def __init__(self, record_date):
+        self.date = record_date
+
+
+class FakeCalendarRecords:
+    def __init__(self, *dates):
+        self.dates = list(dates)
+        self.calls = 0
+
+    def list(self):
+        self.calls += 1
+        return [FakeCalendarRecord(record_date) for record_date in self.dates]
+
+
+def test_production_calendar_queries():
+    calendar = ProductionCalendar(
+        holidays=[date(2024, 1, 1), date(2024, 3, 8)],
+        working_days=[date(2024, 4, 27)],
+    )
+    assert calendar.is_holiday(date(2024, 1, 1))
+    assert calendar.is_holiday(date(2024, 3, 9))
+    assert not calendar.is_holiday(date(2024, 4, 27))
+    assert not calendar.is_holiday(date(2024, 12, 31))
+    assert calendar.holidays_mask(
+        [date(2024, 3, 8), date(2025, 1, 4), date(2024, 3, 11)]
+    ).tolist() == [True, True, False]
+    assert calendar.non_working_days(date(2024, 3, 7), date(2024, 3, 11)) == [
+        date(2024, 3, 8),
+        date(2024, 3, 9),
+        date(2024, 3, 10),
+    ]
+    # Период из двух лет: 29-31 декабря 2024 и 1-3 января 2025
+    assert calendar.working_days_count(date(2024, 12, 29), date(2025, 1, 3)) == 5
+    assert calendar.working_days_count(date(2024, 4, 22), date(2024, 4, 28)) == 6
+    assert calendar.working_days_count(date(2024, 5, 2), date(2024, 5, 1)) == 0
+
+
+def test_production_calendar_service_cache():
+    holidays = FakeCalendarRecords(date(2024, 3, 8))
+    working_days = FakeCalendarRecords()
+    service = ProductionCalendarService(holidays, working_days, ttl=3600)
+    assert service.get_calendar() is service.get_calendar()
+    assert holidays.calls == 1
+    holidays.dates.append(date(2024, 3, 11))
+    assert not service.get_calendar().is_holiday(date(2024, 3, 11))
+    service.invalidate()
+    assert service.get_calendar().is_holiday(date(2024, 3, 11))
+    assert holidays.calls == 2
@@ -0,0 +1,112 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.core.services import schedule_ical_feed_service
+from app.core.services.schedule_ical_feed_service import (
+    ScheduleIcalFeedService,
+    feed_months,
+)
+
+LESSON = {
+    "id": "1",
+    "journal_lesson_id": "2",
+    "date": "01.03.2024",
+    "lessonTime": "09:00 - 10:30",
+    "class_type_name": "Лекция",
+    "topic_code": "1.1",
+    "topic_name": "Тема",
+    "discipline_id": "5",
+    "groupName": "Группа",
+    "classroom": "101",
+    "group_id": "3",
+    "subgroup_id": None,
+}
+
+
+class FakeStaffLessons:
+    def __init__(self):
+        self.lessons = [LESSON]
+        self.calls = 0
+        self.error = False
+
+    async def get(self, staff_id, month, year):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.error:
+            return None
+        return {"data": {"lessons": list(self.lessons)}}
+
+
+@pytest.fixture
+def staff_lessons(monkeypatch):
+    staff_lessons = FakeStaffLessons()
+
+    async def check_response(response):
+        if response is None:
+            raise TypeError("Нет связи с сервером")
+        return response["data"]["lessons"]
+
+    async def get_reference_data():
+        return {5: {"full": "Дисциплина", "short": "Дисц"}}, {}
+
+    async def get_state_staff():
+        return {staff_id: {} for staff_id in (10, 11, 12)}
+
+    monkeypatch.setattr(
+        schedule_ical_feed_service, "api_get_staff_lessons", staff_lessons.get
+    )
+    monkeypatch.setattr(
+        schedule_ical_feed_service, "check_api_staff_lessons_response", check_response
+    )
+    monkeypatch.setattr(
+        ScheduleIcalFeedService, "get_reference_data", staticmethod(get_reference_data)
+    )
+    monkeypatch.setattr(schedule_ical_feed_service, "get_state_staff", get_state_staff)
+    return staff_lessons
+
+
+def test_feed_months():
+    assert feed_months(3, date(2024, 11, 15)) == [(2024, 11), (2024, 12), (2025, 1)]
+
+
+async def test_feed_is_cached_and_versioned_by_lessons(staff_lessons):
+    service = ScheduleIcalFeedService(months=1, refresh_interval=900)
+    feed = await service.get_feed(10)
+    assert b"BEGIN:VEVENT" in feed.content
+    assert await service.get_feed(10) is feed
+    assert staff_lessons.calls == 1
+
+    # Данные занятий не изменились - версия календаря прежняя
+    assert await service.refresh(10) is feed
+    staff_lessons.lessons = [LESSON, dict(LESSON, id="3", topic_code="1.2")]
+    updated = await service.refresh(10)
+    assert updated.etag != feed.etag
+    assert updated.content.count(b"BEGIN:VEVENT") == 2
+
+
+async def test_refresh_all_keeps_feed_on_error_and_drops_idle(staff_lessons):
+    service = ScheduleIcalFeedService(months=1, refresh_interval=0, idle_ttl=3600)
+    feed = await service.get_feed(10)
+    staff_lessons.error = True
+    await service.refresh_all()
+    assert await service.get_feed(10) is feed
+
+    service.idle_ttl = 0
+    await service.refresh_all()
+    assert service._feeds == {}
+
+
+async def test_feed_requires_known_staff_and_is_limited(staff_lessons):
+    service = ScheduleIcalFeedService(months=1, refresh_interval=900, max_feeds=2)
+    assert await service.get_feed(99) is None
+    assert staff_lessons.calls == 0
+
+    feeds = await asyncio.gather(service.get_feed(10), service.get_feed(10))
+    assert feeds[0] is feeds[1]
+    assert staff_lessons.calls == 1, "Check that concurrent requests are coalesced"
+
+    await service.get_feed(11)
+    await service.get_feed(12)
+    assert list(service._feeds) == [11, 12]
@@ -0,0 +1,79 @@
+from datetime import date
+
+import pytest
+
+from tools.apeks_stub_server import create_stub_app, generate_dataset
+
+GET_URL = "/api/call/system-database/get"
+
+
+@pytest.fixture(scope="module")
+def stub_client():
+    data = generate_dataset(
+        lessons=500, staff=50, date_start=date(2024, 9, 1), date_end=date(2024, 12, 31)
+    )
+    return create_stub_app(data, token="x").test_client()
+
+
+def test_stub_get_with_filters(stub_client):
+    response = stub_client.get(
+        GET_URL,
+        query_string={
+            "token": "x",
+            "table": "schedule_day_schedule_lessons",
+            "filter": "date between '2024-10-01' and '2024-10-31'",
+            "filter[lesson_time_id][]": ["1", "2"],
+        },
+    ).get_json()
+    assert response["status"] == 1 and response["data"]
+    for lesson in response["data"]:
+        assert "2024-10-01" <= lesson["date"] <= "2024-10-31"
+        assert lesson["lesson_time_id"] in ("1", "2")
+
+    forbidden = stub_client.get(GET_URL, query_string={"table": "state_staff"})
+    assert b"Forbidden (#403)" in forbidden.data
+
+
+def test_stub_write_endpoints(stub_client):
+    fields = {"table": "student_marks", "fields[student_id]": "3"}
+    new_id = stub_client.post(
+        "/api/call/system-database/add?token=x", data=fields
+    ).get_json()["data"]
+    edited = stub_client.post(
+        "/api/call/system-database/edit?token=x",
+        data={
+            "table": "student_marks",
+            "filter[id][]": str(new_id),
+            "fields[skip_reason_id]": "2",
+        },
+    ).get_json()["data"]
+    marks = stub_client.get(
+        GET_URL,
+        query_string={"token": "x", "table": "student_marks", "filter[id]": new_id},
+    ).get_json()["data"]
+    deleted = stub_client.delete(
+        "/api/call/system-database/delete",
+        query_string={"token": "x", "table": "student_marks", "filter[id][]": new_id},
+    ).get_json()["data"]
+    assert edited == deleted == 1
+    assert marks[0]["skip_reason_id"] == "2"
+
+
+def test_stub_staff_schedule(stub_client):
+    lessons_staff = stub_client.get(
+        GET_URL,
+        query_string={
+            "token": "x",
+            "table": "schedule_day_schedule_lessons_staff",
+            "filter[staff_id]": "1",
+        },
+    ).get_json()["data"]
+    response = stub_client.get(
+        "/api/call/schedule-schedule/staff",
+        query_string={"token": "x", "staff_id": "1", "month": "11", "year": "2024"},
+    ).get_json()
+    lessons = response["data"]["lessons"]
+    assert {lesson["id"] for lesson in lessons} <= {
+        row["lesson_id"] for row in lessons_staff
+    }
+    assert all(lesson["date"].endswith(".11.2024") for lesson in lessons)
@@ -0,0 +1,754 @@
+"""
+Локальный заменитель API АпексВУЗ для нагрузочного тестирования.
+
+Обслуживает точки доступа 'system-database/get|add|edit|delete'
+и 'schedule-schedule/staff|student' по набору данных, сгенерированному
+с заданным масштабом или записанному с рабочего сервера АпексВУЗ,
+с настраиваемой задержкой ответов.
+
+Примеры запуска:
+
+    # Сгенерировать набор данных (50 тыс. занятий, 2 тыс. сотрудников)
+    python tools/apeks_stub_server.py generate stub.json --lessons 50000 --staff 2000
+
+    # Записать набор данных с сервера АпексВУЗ (APEKS_URL, APEKS_TOKEN)
+    python tools/apeks_stub_server.py record stub.json \\
+        --date-start 2024-09-01 --date-end 2025-06-30
+
+    # Запустить сервер с задержкой 50 мс (+ до 20 мс случайно)
+    # и 5 мс на каждую 1000 записей ответа
+    python tools/apeks_stub_server.py serve stub.json --port 5050 \\
+        --latency 0.05 --jitter 0.02 --row-latency 0.005
+
+Приложение подключается к заменителю через переменную окружения
+APEKS_URL=http://127.0.0.1:5050.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+from calendar import monthrange
+from datetime import date, timedelta
+from typing import Any, Iterable
+
+from flask import Flask, Response, jsonify, request
+
+sys.path.append(".")
+
+from config import ApeksConfig
+
+IDENTIFIER_REGEX = re.compile(r"^[a-z_][a-z0-9_]*$")
+FILTER_REGEX = re.compile(r"^filter\[([a-z_][a-z0-9_]*)\](\[\])?$")
+FIELD_REGEX = re.compile(r"^fields\[([a-z_][a-z0-9_]*)\]$")
+
+# Поля таблиц набора данных (для создания пустых таблиц)
+TABLE_FIELDS = {
+    "state_departments": (
+        "id", "parent_id", "name", "name_short", "type", "contains_staff",
+        "branch_id",
+    ),
+    "state_staff": ("id", "family_name", "name", "surname", "user_id"),
+    "state_staff_positions": ("id", "name", "sort"),
+    "state_staff_history": (
+        "id", "staff_id", "department_id", "position_id", "start_date",
+        "end_date", "timestamp",
+    ),
+    "plan_education_plans": ("id", "name", "education_level_id", "status"),
+    "plan_education_plans_education_forms": (
+        "id", "education_plan_id", "education_form_id",
+    ),
+    "plan_disciplines": ("id", "name", "name_short", "level"),
+    "load_groups": (
+        "id", "name", "education_plan_id", "department_id", "course",
+        "people_count",
+    ),
+    "load_subgroups": ("id", "group_id", "name", "people_count"),
+    "schedule_day_schedule_lessons": (
+        "id", "date", "lesson_time_id", "group_id", "subgroup_id",
+        "discipline_id", "class_type_id", "control_type_id", "topic_code",
+        "topic_name", "classroom",
+    ),
+    "schedule_day_schedule_lessons_staff": ("id", "lesson_id", "staff_id"),
+    "student_students": ("id", "family_name", "name", "surname", "user_id"),
+    "student_students_groups": ("id", "student_id", "group_id"),
+    "student_student_history": ("id", "student_id", "group_id", "type"),
+    "student_marks": (
+        "id", "journal_lesson_id", "mark_type_id", "student_id",
+        "skip_reason_id", "user_id", "datetime",
+    ),
+}  # fmt: skip
+
+# Таблицы, записываемые с сервера АпексВУЗ целиком
+RECORD_TABLES = (
+    "state_departments",
+    "state_staff",
+    "state_staff_positions",
+    "state_staff_history",
+    "plan_education_plans",
+    "plan_education_plans_education_forms",
+    "plan_disciplines",
+    "load_groups",
+    "load_subgroups",
+    "student_students",
+    "student_students_groups",
+    "student_student_history",
+)
+
+LESSON_TIMES = {
+    1: "09:00 - 10:30",
+    2: "10:40 - 12:10",
+    3: "12:20 - 13:50",
+    4: "14:30 - 16:00",
+    5: "16:10 - 17:40",
+    6: "17:50 - 19:20",
+    7: "19:30 - 21:00",
+}
+CLASS_TYPE_NAMES = {
+    ApeksConfig.CLASS_TYPE_ID["lecture"]: "Лекция",
+    ApeksConfig.CLASS_TYPE_ID["seminar"]: "Семинар",
+    ApeksConfig.CLASS_TYPE_ID["prakt"]: "Практическое занятие",
+}
+FAMILY_NAMES = ("Иванов", "Петров", "Сидоров", "Кузнецов", "Смирнов", "Попов")
+FIRST_NAMES = ("Алексей", "Борис", "Владимир", "Григорий", "Дмитрий", "Евгений")
+SURNAMES = ("Андреевич", "Борисович", "Викторович", "Олегович", "Петрович")
+
+
+def _str(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+def generate_dataset(
+    lessons: int = 50000,
+    staff: int = 2000,
+    date_start: date | None = None,
+    date_end: date | None = None,
+    seed: int = 0,
+) -> dict[str, list[dict[str, str | None]]]:
+    """
+    Генерирует набор данных АпексВУЗ заданного масштаба.
+
+    Parameters
+    ----------
+        lessons: int
+            количество занятий
+        staff: int
+            количество сотрудников (преподавателей)
+        date_start: date
+            начало периода занятий (по умолчанию - начало учебного года)
+        date_end: date
+            окончание периода занятий (по умолчанию - окончание учебного года)
+        seed: int
+            начальное значение генератора случайных чисел
+
+    Returns
+    -------
+        dict
+            {название таблицы: [записи в формате ответа API]}
+    """
+    rnd = random.Random(seed)
+    today = date.today()
+    year = today.year if today.month >= 9 else today.year - 1
+    date_start = date_start or date(year, 9, 1)
+    date_end = date_end or date(year + 1, 6, 30)
+    period_days = (date_end - date_start).days + 1
+    branch_id = ApeksConfig.BRANCH_ID
+    data = {table: [] for table in TABLE_FIELDS}
+
+    # Подразделения: группа 'Кафедры' и кафедры в ней
+    departments_count = max(10, staff // 40)
+    data["state_departments"].append(
+        {
+            "id": "1",
+            "parent_id": None,
+            "name": "Кафедры",
+            "name_short": "Кафедры",
+            "type": ApeksConfig.TYPE_KAFEDRA,
+            "contains_staff": "0",
+            "branch_id": branch_id,
+        }
+    )
+    department_ids = list(range(2, departments_count + 2))
+    for dept_id in department_ids:
+        data["state_departments"].append(
+            {
+                "id": str(dept_id),
+                "parent_id": "1",
+                "name": f"Кафедра № {dept_id - 1}",
+                "name_short": f"К{dept_id - 1}",
+                "type": None,
+                "contains_staff": "1",
+                "branch_id": branch_id,
+            }
+        )
+
+    # Должности и сотрудники с историей работы в подразделениях
+    positions = [pos for pos in range(1, 16) if pos not in ApeksConfig.EXCLUDE_LIST]
+    for pos in range(1, 16):
+        data["state_staff_positions"].append(
+            {"id": str(pos), "name": f"Должность {pos}", "sort": str(100 - pos)}
+        )
+    history_start = date_start - timedelta(days=5 * 365)
+    for staff_id in range(1, staff + 1):
+        data["state_staff"].append(
+            {
+                "id": str(staff_id),
+                "family_name": f"{rnd.choice(FAMILY_NAMES)}-{staff_id}",
+                "name": rnd.choice(FIRST_NAMES),
+                "surname": rnd.choice(SURNAMES),
+                "user_id": str(staff_id),
+            }
+        )
+        records = [[rnd.choice(department_ids), history_start, None]]
+        # Часть сотрудников переходит на другую кафедру в течение периода
+        if rnd.random() < 0.1:
+            moved_at = date_start + timedelta(days=rnd.randrange(period_days))
+            records[0][2] = moved_at
+            records.append([rnd.choice(department_ids), moved_at + timedelta(1), None])
+        for dept_id, start_date, end_date in records:
+            data["state_staff_history"].append(
+                {
+                    "id": str(len(data["state_staff_history"]) + 1),
+                    "staff_id": str(staff_id),
+                    "department_id": str(dept_id),
+                    "position_id": str(rnd.choice(positions)),
+                    "start_date": start_date.isoformat(),
+                    "end_date": _str(end_date and end_date.isoformat()),
+                    "timestamp": f"{start_date.isoformat()} 00:00:00",
+                }
+            )
+
+    # Учебные планы по формам и уровням обучения
+    forms, levels = ApeksConfig.EDUCATION_FORM_ID, ApeksConfig.EDUCATION_LEVEL_ID
+    plan_types = (
+        (forms["ochno"], levels["bak"]),
+        (forms["ochno"], levels["spec"]),
+        (forms["zaochno"], levels["bak"]),
+        (forms["zaochno"], levels["spec"]),
+        (forms["zaochno"], levels["spo"]),
+        (forms["ochno"], levels["adj"]),
+        (forms["dpo"], levels["spo"]),
+        (forms["prof_pod"], levels["spo"]),
+    )
+    for plan_id, (form_id, level_id) in enumerate(plan_types, start=1):
+        data["plan_education_plans"].append(
+            {
+                "id": str(plan_id),
+                "name": f"Учебный план {plan_id}",
+                "education_level_id": str(level_id),
+                "status": "1",
+            }
+        )
+        data["plan_education_plans_education_forms"].append(
+            {
+                "id": str(plan_id),
+                "education_plan_id": str(plan_id),
+                "education_form_id": str(form_id),
+            }
+        )
+    for disc_id in range(1, 301):
+        data["plan_disciplines"].append(
+            {
+                "id": str(disc_id),
+                "name": f"Дисциплина {disc_id}",
+                "name_short": f"Дисц. {disc_id}",
+                "level": str(ApeksConfig.DISC_LEVEL),
+            }
+        )
+
+    # Учебные группы, подгруппы и обучающиеся
+    groups_count = max(20, lessons // 500)
+    for group_id in range(1, groups_count + 1):
+        people_count = rnd.randint(10, 30)
+        data["load_groups"].append(
+            {
+                "id": str(group_id),
+                "name": f"Группа {group_id}",
+                "education_plan_id": str(rnd.randint(1, len(plan_types))),
+                "department_id": str(rnd.choice(department_ids)),
+                "course": str(rnd.randint(1, 5)),
+                "people_count": str(people_count),
+            }
+        )
+        if group_id % 2:
+            for part in (1, 2):
+                data["load_subgroups"].append(
+                    {
+                        "id": str(len(data["load_subgroups"]) + 1),
+                        "group_id": str(group_id),
+                        "name": f"Группа {group_id} ({part})",
+                        "people_count": str(people_count // 2),
+                    }
+                )
+        for _ in range(people_count):
+            student_id = len(data["student_students"]) + 1
+            data["student_students"].append(
+                {
+                    "id": str(student_id),
+                    "family_name": f"{rnd.choice(FAMILY_NAMES)}-{student_id}",
+                    "name": rnd.choice(FIRST_NAMES),
+                    "surname": rnd.choice(SURNAMES),
+                    "user_id": str(staff + student_id),
+                }
+            )
+            data["student_students_groups"].append(
+                {
+                    "id": str(student_id),
+                    "student_id": str(student_id),
+                    "group_id": str(group_id),
+                }
+            )
+
+    # Занятия и преподаватели занятий
+    control_types = (
+        ApeksConfig.CONTROL_TYPE_ID["exam"],
+        ApeksConfig.CONTROL_TYPE_ID["zachet"],
+        ApeksConfig.CONTROL_TYPE_ID["zachet_mark"],
+        ApeksConfig.CONTROL_TYPE_ID["group_cons"],
+        ApeksConfig.CONTROL_TYPE_ID["final_att"],
+    )
+    subgroups = data["load_subgroups"]
+    lesson_id = 0
+    while lesson_id < lessons:
+        lesson_date = date_start + timedelta(days=rnd.randrange(period_days))
+        lesson_time_id = rnd.randint(1, len(LESSON_TIMES))
+        if rnd.random() < 0.15:
+            subgroup = rnd.choice(subgroups)
+            group_id, subgroup_id = None, subgroup["id"]
+        else:
+            group_id, subgroup_id = str(rnd.randint(1, groups_count)), None
+        discipline_id = str(rnd.randint(1, 300))
+        staff_ids = rnd.sample(range(1, staff + 1), 2 if rnd.random() < 0.1 else 1)
+        if rnd.random() < 0.1:
+            # Формы контроля проводятся несколькими парами подряд
+            class_type_id, control_type_id = None, rnd.choice(control_types)
+            repeat = min(rnd.randint(1, 3), len(LESSON_TIMES) - lesson_time_id + 1)
+        else:
+            class_type_id = rnd.choice(tuple(CLASS_TYPE_NAMES))
+            control_type_id, repeat = None, 1
+        for time_id in range(lesson_time_id, lesson_time_id + repeat):
+            lesson_id += 1
+            data["schedule_day_schedule_lessons"].append(
+                {
+                    "id": str(lesson_id),
+                    "date": lesson_date.isoformat(),
+                    "lesson_time_id": str(time_id),
+                    "group_id": group_id,
+                    "subgroup_id": subgroup_id,
+                    "discipline_id": discipline_id,
+                    "class_type_id": _str(class_type_id),
+                    "control_type_id": _str(control_type_id),
+                    "topic_code": f"{rnd.randint(1, 12)}.{rnd.randint(1, 4)}",
+                    "topic_name": f"Тема {rnd.randint(1, 12)}",
+                    "classroom": f"Ауд. {rnd.randint(100, 450)}",
+                }
+            )
+            for staff_id in staff_ids:
+                data["schedule_day_schedule_lessons_staff"].append(
+                    {
+                        "id": str(len(data["schedule_day_schedule_lessons_staff"]) + 1),
+                        "lesson_id": str(lesson_id),
+                        "staff_id": str(staff_id),
+                    }
+                )
+    return data
+
+
+async def record_dataset(
+    date_start: date, date_end: date, tables: Iterable[str] = RECORD_TABLES
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Записывает набор данных с сервера АпексВУЗ (ApeksConfig.URL): таблицы
+    целиком, занятия и преподавателей занятий за указанный период.
+    """
+    from app.core.repository.apeks_api_repository import (
+        ApeksApiEndpoints,
+        ApeksApiRepository,
+    )
+    from app.core.services.base_apeks_api_service import split_filters
+
+    repository = ApeksApiRepository()
+    endpoint = ApeksApiEndpoints.DB_GET_ENDPOINT
+
+    async def fetch(table: str, **params) -> list[dict[str, Any]]:
+        params = {"token": ApeksConfig.TOKEN, "table": table, **params}
+        rows = [row async for row in repository.stream(endpoint, params)]
+        logging.info(f"Записана таблица {table}: {len(rows)}")
+        return rows
+
+    data = dict(zip(tables, await asyncio.gather(*(fetch(table) for table in tables))))
+    lessons_table = ApeksConfig.SCHEDULE_DAY_SCHEDULE_LESSONS_TABLE
+    data[lessons_table] = await fetch(
+        lessons_table,
+        filter=(
+            f"date between '{date_start.isoformat()}' " f"and '{date_end.isoformat()}'"
+        ),
+    )
+    lessons_staff_table = ApeksConfig.SCHEDULE_DAY_SCHEDULE_LESSONS_STAFF_TABLE
+    chunks = split_filters(
+        {"lesson_id": [lesson["id"] for lesson in data[lessons_table]]}
+    )
+    data[lessons_staff_table] = [
+        row
+        for rows in await asyncio.gather(
+            *(
+                fetch(
+                    lessons_staff_table, **{"filter[lesson_id][]": chunk["lesson_id"]}
+                )
+                for chunk in chunks
+                if chunk["lesson_id"]
+            )
+        )
+        for row in rows
+    ]
+    return data
+
+
+class ApeksStubDatabase:
+    """
+    Таблицы набора данных в SQLite (в памяти) для выполнения запросов
+    заменителя API АпексВУЗ.
+
+    Фильтры-выражения (параметр 'filter') API АпексВУЗ записываются
+    на SQL и выполняются без преобразования.
+    """
+
+    def __init__(self, data: dict[str, list[dict[str, Any]]]):
+        self._connection = sqlite3.connect(":memory:", check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._columns: dict[str, list[str]] = {}
+        for table in {*TABLE_FIELDS, *data}:
+            rows = data.get(table, [])
+            columns = dict.fromkeys(TABLE_FIELDS.get(table, ()))
+            for row in rows:
+                columns.update(dict.fromkeys(row))
+            self._create_table(table, list(columns) or ["id"])
+            self._insert_rows(table, rows)
+
+    def _create_table(self, table: str, columns: list[str]) -> None:
+        self._check_identifiers(table, *columns)
+        self._columns[table] = columns
+        self._connection.execute(
+            f"CREATE TABLE {table} ({', '.join(f'{col} TEXT' for col in columns)})"
+        )
+        for column in columns:
+            if column in ("id", "date") or column.endswith("_id"):
+                self._connection.execute(
+                    f"CREATE INDEX {table}_{column} ON {table} ({column})"
+                )
+
+    def _insert_rows(self, table: str, rows: list[dict[str, Any]]) -> None:
+        columns = self._columns[table]
+        self._connection.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})",
+            ([_str(row.get(col)) for col in columns] for row in rows),
+        )
+
+    @staticmethod
+    def _check_identifiers(*names: str) -> None:
+        for name in names:
+            if not IDENTIFIER_REGEX.match(name):
+                raise ValueError(f"Недопустимое имя: {name}")
+
+    def _check_table(self, table: str) -> None:
+        if table not in self._columns:
+            raise ValueError(f"Таблица не найдена: {table}")
+
+    def _where(
+        self, filters: dict[str, list[str]], expression: str | None = None
+    ) -> tuple[str, list[str]]:
+        conditions, values = [], []
+        for field, field_values in filters.items():
+            self._check_identifiers(field)
+            conditions.append(f"{field} IN ({', '.join('?' * len(field_values))})")
+            values.extend(field_values)
+        if expression:
+            if ";" in expression:
+                raise ValueError(f"Недопустимый фильтр: {expression}")
+            conditions.append(f"({expression})")
+        return (f" WHERE {' AND '.join(conditions)}" if conditions else ""), values
+
+    def select(
+        self, table: str, filters: dict[str, list[str]], expression: str | None = None
+    ) -> list[dict[str, str | None]]:
+        """Возвращает записи таблицы по фильтрам."""
+        self._check_table(table)
+        where, values = self._where(filters, expression)
+        with self._lock:
+            cursor = self._connection.execute(
+                f"SELECT * FROM {table}{where} ORDER BY rowid", values
+            )
+            return [dict(row) for row in cursor]
+
+    def insert(self, table: str, fields: dict[str, str]) -> int:
+        """Добавляет запись в таблицу и возвращает ее id."""
+        self._check_table(table)
+        with self._lock:
+            for field in fields:
+                if field not in self._columns[table]:
+                    self._check_identifiers(field)
+                    self._connection.execute(
+                        f"ALTER TABLE {table} ADD COLUMN {field} TEXT"
+                    )
+                    self._columns[table].append(field)
+            new_id = self._connection.execute(
+                f"SELECT COALESCE(MAX(CAST(id AS INTEGER)), 0) + 1 FROM {table}"
+            ).fetchone()[0]
+            self._insert_rows(table, [{**fields, "id": new_id}])
+        return new_id
+
+    def update(
+        self, table: str, filters: dict[str, list[str]], fields: dict[str, str]
+    ) -> int:
+        """Изменяет записи таблицы и возвращает их количество."""
+        self._check_table(table)
+        self._check_identifiers(*fields)
+        where, values = self._where(filters)
+        assignments = ", ".join(f"{field} = ?" for field in fields)
+        with self._lock:
+            return self._connection.execute(
+                f"UPDATE {table} SET {assignments}{where}",
+                [*fields.values(), *values],
+            ).rowcount
+
+    def delete(self, table: str, filters: dict[str, list[str]]) -> int:
+        """Удаляет записи таблицы и возвращает их количество."""
+        self._check_table(table)
+        where, values = self._where(filters)
+        with self._lock:
+            return self._connection.execute(
+                f"DELETE FROM {table}{where}", values
+            ).rowcount
+
+    def schedule(
+        self,
+        month: int,
+        year: int,
+        staff_id: str | None = None,
+        group_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Возвращает занятия преподавателя или учебной группы за месяц
+        в формате ответа точек доступа 'schedule-schedule/staff|student'.
+        """
+        period = (
+            date(year, month, 1).isoformat(),
+            date(year, month, monthrange(year, month)[1]).isoformat(),
+        )
+        if staff_id is not None:
+            condition = (
+                "l.id IN (SELECT lesson_id FROM schedule_day_schedule_lessons_staff "
+                "WHERE staff_id = ?)"
+            )
+        else:
+            condition = (
+                "(l.group_id = ? OR l.subgroup_id IN "
+                "(SELECT id FROM load_subgroups WHERE group_id = ?))"
+            )
+        params = [staff_id] if staff_id is not None else [group_id, group_id]
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT l.*, COALESCE(g.name, sg.name) AS group_name, "
+                "COALESCE(l.group_id, sg.group_id) AS lesson_group_id, "
+                "d.name AS discipline_name "
+                "FROM schedule_day_schedule_lessons l "
+                "LEFT JOIN load_subgroups sg ON sg.id = l.subgroup_id "
+                "LEFT JOIN load_groups g ON g.id = l.group_id "
+                "LEFT JOIN plan_disciplines d ON d.id = l.discipline_id "
+                f"WHERE l.date BETWEEN ? AND ? AND {condition} "
+                "ORDER BY l.date, CAST(l.lesson_time_id AS INTEGER)",
+                [*period, *params],
+            ).fetchall()
+        lessons = []
+        for row in rows:
+            lesson_time_id = int(row["lesson_time_id"])
+            class_type_id = row["class_type_id"]
+            lessons.append(
+                {
+                    "id": row["id"],
+                    "journal_lesson_id": row["id"],
+                    "date": date.fromisoformat(row["date"]).strftime("%d.%m.%Y"),
+                    "lesson_time_id": lesson_time_id,
+                    "lessonTime": LESSON_TIMES.get(lesson_time_id, "09:00 - 10:30"),
+                    "class_type_id": class_type_id,
+                    "class_type_name": CLASS_TYPE_NAMES.get(
+                        int(class_type_id) if class_type_id else None, "Контроль"
+                    ),
+                    "control_type_id": row["control_type_id"],
+                    "discipline_id": row["discipline_id"],
+                    "discipline": row["discipline_name"],
+                    "topic_code": row["topic_code"],
+                    "topic_name": row["topic_name"],
+                    "classroom": row["classroom"],
+                    "group_id": row["lesson_group_id"],
+                    "subgroup_id": row["subgroup_id"],
+                    "groupName": row["group_name"],
+                }
+            )
+        return lessons
+
+
+def _request_filters(values) -> tuple[dict[str, list[str]], str | None]:
+    filters = {}
+    for key in values:
+        match = FILTER_REGEX.match(key)
+        if match:
+            filters[match.group(1)] = values.getlist(key)
+    return filters, values.get("filter")
+
+
+def create_stub_app(
+    data: dict[str, list[dict[str, Any]]],
+    latency: float = 0,
+    jitter: float = 0,
+    row_latency: float = 0,
+    token: str | None = None,
+) -> Flask:
+    """
+    Создает приложение Flask, заменяющее API АпексВУЗ.
+
+    Parameters
+    ----------
+        data: dict
+            набор данных {название таблицы: [записи]}
+        latency: float
+            задержка каждого ответа (секунды)
+        jitter: float
+            дополнительная случайная задержка ответа (от 0 до jitter секунд)
+        row_latency: float
+            дополнительная задержка на каждую 1000 записей ответа (секунды)
+        token: str | None
+            токен доступа (если не задан - запросы принимаются с любым токеном)
+    """
+    app = Flask(__name__)
+    database = ApeksStubDatabase(data)
+
+    def respond(payload: Any, rows: int = 0) -> Response:
+        delay = latency + random.uniform(0, jitter) + row_latency * rows / 1000
+        if delay > 0:
+            time.sleep(delay)
+        return jsonify({"status": 1, "data": payload})
+
+    @app.before_request
+    def check_token():
+        if token and request.args.get("token") != token:
+            return Response("Forbidden (#403)", status=403)
+
+    @app.errorhandler(ValueError)
+    @app.errorhandler(sqlite3.Error)
+    def handle_error(error):
+        logging.warning(f"Ошибка запроса {request.full_path}: {error}")
+        return jsonify({"status": 0, "message": str(error)})
+
+    @app.get("/api/call/system-database/get")
+    def db_get():
+        filters, expression = _request_filters(request.args)
+        rows = database.select(request.args.get("table", ""), filters, expression)
+        return respond(rows, len(rows))
+
+    @app.post("/api/call/system-database/add")
+    def db_add():
+        fields = {
+            match.group(1): value
+            for key, value in request.form.items()
+            if (match := FIELD_REGEX.match(key))
+        }
+        return respond(database.insert(request.form.get("table", ""), fields))
+
+    @app.post("/api/call/system-database/edit")
+    def db_edit():
+        filters, _ = _request_filters(request.form)
+        if not filters:
+            raise ValueError("Не переданы фильтры изменяемых записей")
+        fields = {
+            match.group(1): value
+            for key, value in request.form.items()
+            if (match := FIELD_REGEX.match(key))
+        }
+        return respond(database.update(request.form.get("table", ""), filters, fields))
+
+    @app.delete("/api/call/system-database/delete")
+    def db_delete():
+        filters, _ = _request_filters(request.args)
+        if not filters:
+            raise ValueError("Не переданы фильтры удаляемых записей")
+        return respond(database.delete(request.args.get("table", ""), filters))
+
+    @app.get("/api/call/schedule-schedule/staff")
+    def schedule_staff():
+        lessons = database.schedule(
+            int(request.args["month"]),
+            int(request.args["year"]),
+            staff_id=request.args["staff_id"],
+        )
+        return respond({"lessons": lessons}, len(lessons))
+
+    @app.get("/api/call/schedule-schedule/student")
+    def schedule_student():
+        lessons = database.schedule(
+            int(request.args["month"]),
+            int(request.args["year"]),
+            group_id=request.args["group_id"],
+        )
+        return respond({"lessons": lessons}, len(lessons))
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Заменитель API АпексВУЗ")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="сгенерировать набор данных")
+    generate.add_argument("path")
+    record = commands.add_parser("record", help="записать набор данных с сервера")
+    record.add_argument("path")
+    serve = commands.add_parser("serve", help="запустить сервер")
+    serve.add_argument("path", nargs="?", help="набор данных (JSON)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=5050)
+    serve.add_argument("--latency", type=float, default=0)
+    serve.add_argument("--jitter", type=float, default=0)
+    serve.add_argument("--row-latency", type=float, default=0)
+    serve.add_argument("--token", default=None)
+    for command in (generate, serve):
+        command.add_argument("--lessons", type=int, default=50000)
+        command.add_argument("--staff", type=int, default=2000)
+        command.add_argument("--seed", type=int, default=0)
+    for command in (generate, serve, record):
+        command.add_argument("--date-start", type=date.fromisoformat)
+        command.add_argument("--date-end", type=date.fromisoformat)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "record":
+        if not (args.date_start and args.date_end):
+            parser.error("для записи необходимо указать --date-start и --date-end")
+        data = asyncio.run(record_dataset(args.date_start, args.date_end))
+    elif args.command == "serve" and args.path:
+        with open(args.path, encoding="utf-8") as file:
+            data = json.load(file)
+    else:
+        data = generate_dataset(
+            args.lessons, args.staff, args.date_start, args.date_end, args.seed
+        )
+    if args.command in ("generate", "record"):
+        with open(args.path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        for table, rows in data.items():
+            print(f"{table}: {len(rows)}")
+        return
+    app = create_stub_app(data, args.latency, args.jitter, args.row_latency, args.token)
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import sys
+import time
+from datetime import date
+
+sys.path.append(".")
+
+from app.core.classes.LessonsData import LessonsData
+from config import ApeksConfig as Apeks
+from tools.apeks_stub_server import generate_dataset
+
+# Сравнение времени объединения занятий типа контроль
+# (LessonsData.get_control_lessons) с прежним алгоритмом попарного
+# сравнения занятий на синтетическом наборе данных.
+# Пример: python tools/benchmark_lessons_data.py --lessons 10000
+
+
+def legacy_control_lessons(structured_lessons: list) -> list:
+    """Прежний алгоритм: поиск аналогичного занятия перебором списка."""
+    lookup = ["staff_id", "discipline_id", "group_id", "control_type_id", "date"]
+    control_types = [
+        Apeks.CONTROL_TYPE_ID.get(c_type)
+        for c_type in ("exam", "zachet", "zachet_mark", "final_att", "kandidat_exam")
+    ]
+    control_less = []
+    for less in structured_lessons:
+        if less.control_type_id in control_types:
+            for c in control_less:
+                if [getattr(less, val) for val in lookup] == [
+                    getattr(c, val) for val in lookup
+                ]:
+                    c.hours += 2
+                    c.lesson_time_id = c.lesson_time_id + ", " + less.lesson_time_id
+                    break
+            else:
+                control_less.append(less.copy())
+    return control_less
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lessons", type=int, default=10000)
+    parser.add_argument("--staff", type=int, default=300)
+    parser.add_argument("--control-share", type=float, default=0.5)
+    args = parser.parse_args()
+
+    data = generate_dataset(lessons=args.lessons, staff=args.staff)
+    # Увеличиваем долю занятий типа контроль (экзамены в первую неделю месяца)
+    exam = str(Apeks.CONTROL_TYPE_ID["exam"])
+    lessons = data["schedule_day_schedule_lessons"]
+    for lesson in lessons[: int(len(lessons) * args.control_share)]:
+        lesson["class_type_id"], lesson["control_type_id"] = None, exam
+        lesson_date = date.fromisoformat(lesson["date"])
+        lesson["date"] = lesson_date.replace(day=1 + int(lesson["id"]) % 7).isoformat()
+    staff_history = {}
+    for record in data["state_staff_history"]:
+        staff_history.setdefault(int(record["staff_id"]), []).append(record)
+    lessons_data = LessonsData(
+        schedule_lessons=lessons,
+        schedule_lessons_staff=data["schedule_day_schedule_lessons_staff"],
+        load_groups=data["load_groups"],
+        load_subgroups=data["load_subgroups"],
+        plan_education_plans=data["plan_education_plans"],
+        plan_education_plans_education_forms=data[
+            "plan_education_plans_education_forms"
+        ],
+        staff_history_data=staff_history,
+    )
+    structured = lessons_data.structured_lessons
+    print(f"Занятий: {len(lessons)}, записей по преподавателям: {len(structured)}")
+
+    started = time.perf_counter()
+    legacy = legacy_control_lessons(structured)
+    legacy_time = time.perf_counter() - started
+    started = time.perf_counter()
+    current = lessons_data.get_control_lessons()
+    current_time = time.perf_counter() - started
+
+    assert current == legacy, "Результаты алгоритмов не совпадают"
+    print(f"Занятий типа контроль после объединения: {len(current)}")
+    print(f"Перебор списка: {legacy_time:.3f} с")
+    print(f"Объединение по ключу: {current_time:.3f} с")
+    print(f"Ускорение: {legacy_time / current_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
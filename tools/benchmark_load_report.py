@@ -0,0 +1,154 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(".")
+
+from openpyxl import load_workbook
+from openpyxl.styles import Font
+
+from app.core.reports.ExcelStyles import ExcelStyle
+from app.core.reports.load_report import (
+    LOAD_REPORT_COLUMNS,
+    LOAD_REPORT_TYPE_COLUMNS,
+    LoadReportWriter,
+)
+from config import ApeksConfig as Apeks, FlaskConfig
+
+# Сравнение времени и пикового объема памяти при формировании отчета
+# о нагрузке прежним способом (заполнение шаблона 'load_report_temp.xlsx'
+# через load_workbook) и потоковой записью (LoadReportWriter)
+# на синтетических данных. Содержимое ячеек отчетов сравнивается.
+# Пример: python tools/benchmark_load_report.py --staff 600 --sheets 1
+
+
+def legacy_load_report(filename: str, sheets: dict) -> None:
+    """Прежний способ: заполнение копий листа шаблона через ws.cell."""
+    wb = load_workbook(
+        os.path.join(FlaskConfig.TEMPLATE_FILE_DIR, "load_report_temp.xlsx")
+    )
+    template = wb.active
+    for number, (title, load_rows) in enumerate(sheets.items()):
+        ws = template if number == 0 else wb.copy_worksheet(template)
+        ws.title = title
+        ws.cell(1, 1).value = title
+        ws.cell(2, 1).value = "отчет о нагрузке"
+        row = 8
+        for name, row_load in load_rows.items():
+            for i in range(2, 73):
+                ws.cell(row, i).style = ExcelStyle.Number
+            ws.cell(row, 1).value = name
+            ws.cell(row, 1).style = ExcelStyle.Base
+            for l_type, values in row_load.items():
+                column = LOAD_REPORT_TYPE_COLUMNS[l_type]
+                if l_type == "group_cons":
+                    values = {k: v for k, v in values.items() if k != "dpo"}
+                for val in values.values():
+                    val = "" if val == 0 else val
+                    ws.cell(row, column).value = val
+                    if val and val % 1 > 0:
+                        ws.cell(row, column).number_format = "0.00"
+                    column += 1
+            ws.cell(row, 72).value = f"=SUM(B{str(row)}:BS{str(row)})"
+            row += 1
+        ws.cell(row, 1).value = "Итого"
+        ws.cell(row, 1).style = ExcelStyle.BaseBold
+        for col in range(2, 73):
+            ltr = ws.cell(row, col).column_letter
+            ws.cell(row, col).value = (
+                f"=IF(SUM({ltr}8:{ltr}{str(row - 1)})>0,"
+                f'SUM({ltr}8:{ltr}{str(row - 1)}),"")'
+            )
+            ws.cell(row, col).style = ExcelStyle.Number
+            ws.cell(row, col).font = Font(name="Times New Roman", size=10, bold=True)
+    wb.save(os.path.join(FlaskConfig.EXPORT_FILE_DIR, filename))
+
+
+def streaming_load_report(filename: str, sheets: dict) -> None:
+    """Потоковая запись (LoadReportWriter)."""
+    writer = LoadReportWriter()
+    for title, load_rows in sheets.items():
+        writer.add_sheet(title, title, "отчет о нагрузке", list(load_rows.items()))
+    writer.save(filename)
+
+
+def generate_sheets(sheets: int, staff: int, seed: int = 1) -> dict:
+    """Синтетическая нагрузка {'лист': {'преподаватель': {l_type: {s_type: value}}}}"""
+    rnd = random.Random(seed)
+    lesson_types = Apeks.LOAD_LESSON_TYPES + Apeks.LOAD_CONTROL_TYPES
+    return {
+        f"Кафедра {sheet}": {
+            f"Преподаватель {sheet}-{number}": {
+                l_type: {
+                    s_type: rnd.choice((0, 0, 2, 4, 10, 3.3, 12.75))
+                    for s_type in Apeks.LOAD_STUDENT_TYPES
+                }
+                for l_type in lesson_types
+            }
+            for number in range(staff // sheets)
+        }
+        for sheet in range(sheets)
+    }
+
+
+def measure(func, filename: str, sheets: dict) -> tuple[float, float]:
+    """Время (с) и пиковый объем памяти (МБ, отдельный запуск)."""
+    started = time.perf_counter()
+    func(filename, sheets)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    func(filename, sheets)
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def sheet_values(filename: str) -> list:
+    """Значения ячеек и форматы чисел всех листов отчета."""
+    wb = load_workbook(os.path.join(FlaskConfig.EXPORT_FILE_DIR, filename))
+    return [
+        [
+            (
+                cell.value if cell.value != "" else None,
+                cell.number_format,
+                cell.font.b,
+                cell.border.left.style,
+            )
+            for row in ws.iter_rows(max_col=LOAD_REPORT_COLUMNS)
+            for cell in row
+        ]
+        + sorted(str(cell_range) for cell_range in ws.merged_cells.ranges)
+        for ws in wb.worksheets
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--staff", type=int, default=600)
+    parser.add_argument("--sheets", type=int, default=1)
+    args = parser.parse_args()
+
+    sheets = generate_sheets(args.sheets, args.staff)
+    FlaskConfig.EXPORT_FILE_DIR = tempfile.mkdtemp()
+    print(f"Листов: {args.sheets}, строк преподавателей: {args.staff}")
+    legacy_time, legacy_peak = measure(legacy_load_report, "legacy.xlsx", sheets)
+    # Шаблон считывается один раз за время работы приложения
+    streaming_load_report("warmup.xlsx", generate_sheets(1, 1))
+    current_time, current_peak = measure(
+        streaming_load_report, "streaming.xlsx", sheets
+    )
+
+    assert sheet_values("legacy.xlsx") == sheet_values(
+        "streaming.xlsx"
+    ), "Содержимое отчетов не совпадает"
+    print(f"Заполнение шаблона: {legacy_time:.3f} с, {legacy_peak:.1f} МБ")
+    print(f"Потоковая запись: {current_time:.3f} с, {current_peak:.1f} МБ")
+    print(f"Ускорение: {legacy_time / current_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import argparse
+import logging
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(".")
+
+from app.core.db.reports_models import LoadMonthlyAggregates
+from app.core.services.db_load_aggregates_service import LoadMonthlyAggregatesService
+from config import FlaskConfig
+
+# Удаление сохраненной помесячной нагрузки кафедр (например, после
+# исправления расписания закрытого месяца), нагрузка будет рассчитана
+# заново при следующем запросе отчета. Без параметров удаляется вся нагрузка.
+# Пример: python tools/purge_load_aggregates.py --year 2024 --month 9
+
+logging.basicConfig(level=logging.INFO)
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--year", type=int)
+parser.add_argument("--month", type=int)
+parser.add_argument("--department", type=int)
+args = parser.parse_args()
+
+engine = create_engine(FlaskConfig.SQLALCHEMY_DATABASE_URI)
+session = sessionmaker(bind=engine)()
+service = LoadMonthlyAggregatesService(LoadMonthlyAggregates, session)
+service.purge(year=args.year, month=args.month, department_id=args.department)
@@ -0,0 +1,20 @@
+import asyncio
+import logging
+import sys
+
+sys.path.append(".")
+
+from app.core.services.apeks_mirror_sync_service import (
+    get_apeks_mirror_sync_service,
+)
+
+# Синхронизация зеркала таблиц АпексВУЗ (например, для запуска по cron).
+# Параметр 'full' - выполнить полную синхронизацию всех таблиц.
+
+logging.basicConfig(level=logging.INFO)
+
+full_sync = True if "full" in sys.argv[1:] else None
+sync_service = get_apeks_mirror_sync_service()
+result = asyncio.run(sync_service.sync(full=full_sync))
+for table, rows_count in result.items():
+    print(f"{table}: {'ошибка' if rows_count is None else rows_count}")